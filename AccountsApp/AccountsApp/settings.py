@@ -136,22 +136,191 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.CachedJWTAuthentication',
         # 'rest_framework.authentication.TokenAuthentication',  # <-- And here
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # orjson-backed JSON (accounts.renderers / accounts.parsers); both fall
+    # back to the stdlib json module when orjson is not installed.
+    'DEFAULT_RENDERER_CLASSES': [
+        'accounts.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'accounts.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend'
-    ]
+    ],
+    # Rates for accounts.throttling; '3/5m' means 3 requests per 5 minutes.
+    'DEFAULT_THROTTLE_RATES': {
+        'login': '10/m',  # per client IP and username
+        'register': '20/h',  # per client IP
+        'otp_request': '3/5m',  # per email and purpose
+        'check_otp': '5/10m',  # per email and purpose (4-digit codes)
+    },
 }
 
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=120),
     "REFRESH_TOKEN_LIFETIME": timedelta(minutes=180),
+    "TOKEN_REFRESH_SERIALIZER": "accounts.serializers.RevocableTokenRefreshSerializer",
+}
+
+# Short-lived cache of authenticated users (accounts.authentication).
+# SHARED_CACHE names an entry of CACHES shared by all processes (Redis,
+# Memcached): it holds the cached rows and the per-user stamps that every
+# process checks before trusting its in-memory copy, so deactivations and
+# password changes apply everywhere at once. Disabled when SHARED_CACHE is
+# None; a process-local backend fails the system checks.
+USER_CACHE = {
+    'TTL': 30,  # seconds
+    'MAX_SIZE': 10000,
+    'SHARED_CACHE': None,
+}
+
+# Serialized profile payloads (GET profile/) and their ETag versions, stored
+# in the CACHES entry named by CACHE. Disabled when CACHE is None; the entry
+# must be shared by all processes (Redis, Memcached) so every process sees
+# version changes, a process-local backend fails the system checks.
+PROFILE_CACHE = {
+    'CACHE': None,
+    'TTL': 300,  # seconds
+}
+
+# Downscaled copies of UserProfile.profile_picture (accounts.images), rendered
+# off the request thread after upload; FORMAT is 'WEBP' or 'JPEG'.
+PROFILE_PICTURE_RENDITIONS = {
+    'SIZES': [64, 256, 1024],  # px, longest side
+    'FORMAT': 'WEBP',
+    'QUALITY': 80,
+    'WORKERS': 2,
+}
+
+# Chunked, resumable profile picture uploads (accounts.uploads). Chunks are
+# written to TEMP_DIR (outside MEDIA_ROOT) until the upload completes.
+PROFILE_PICTURE_UPLOAD = {
+    'MAX_SIZE': 20 * 1024 * 1024,  # bytes, whole picture
+    'MAX_CHUNK': 5 * 1024 * 1024,  # bytes, per PUT
+    'TEMP_DIR': None,  # defaults to <FILE_UPLOAD_TEMP_DIR or tmp>/accounts-uploads
+}
+
+# Admin changelists of accounts models (accounts.admin). Unfiltered row counts
+# come from PostgreSQL catalog statistics above EXACT_COUNT_BELOW rows, or from
+# a COUNT(*) cached COUNT_CACHE_TTL seconds on other databases; filtered
+# counts stop at FILTERED_COUNT_LIMIT.
+ADMIN_CHANGELIST = {
+    'EXACT_COUNT_BELOW': 10000,
+    'COUNT_CACHE_TTL': 300,  # seconds
+    'FILTERED_COUNT_LIMIT': 10000,
+}
+
+# Staff bulk actions on accounts (accounts.bulk): set-based UPDATEs by
+# batches of BATCH_SIZE users; selections larger than BACKGROUND_ABOVE run in
+# a background thread and record their progress in BulkActionJob rows. A
+# pending or running job whose row has not been updated for STALE_AFTER
+# seconds (worker process stopped mid-job) is reported as failed.
+BULK_ACTIONS = {
+    'BATCH_SIZE': 1000,
+    'BACKGROUND_ABOVE': 1000,
+    'MAX_USERS': 100000,  # per API request
+    'WORKERS': 1,
+    'TTL': 24 * 3600,  # seconds a job status is kept
+    'STALE_AFTER': 600,  # seconds
+}
+
+# batch/ endpoint (accounts.batch): sub-requests per call, and threads used to
+# run consecutive GET/HEAD sub-requests concurrently when "parallel" is set.
+# Writes always run alone, in list order, between the reads around them.
+BATCH_REQUESTS = {
+    'MAX_REQUESTS': 20,
+    'WORKERS': 4,
+}
+
+# Already verified access tokens, kept until their own expiry.
+TOKEN_CACHE = {
+    'MAX_SIZE': 10000,
+}
+
+# Revoked tokens (logout): in-memory Bloom filter in front of the RevokedToken
+# table, kept up to date by one background thread per process. Revocation lag:
+# the process handling a logout rejects the token at once, every other process
+# keeps accepting it for up to SYNC_INTERVAL seconds (plus one sync). A Bloom
+# hit is always confirmed against the table. PRUNE_INTERVAL is how often
+# expired rows are deleted.
+TOKEN_REVOCATION = {
+    'BLOOM_CAPACITY': 1_000_000,
+    'BLOOM_ERROR_RATE': 0.001,
+    'SYNC_INTERVAL': 5,  # seconds
+    'SYNC_MARGIN': 60,  # seconds re-scanned by each sync (late commits, clock skew)
+    'PRUNE_INTERVAL': 3600,  # seconds
+}
+
+# OTP backend: 'accounts.otp.DatabaseOTPBackend' stores one OTPRequest row per
+# code; 'accounts.otp.HMACOTPBackend' derives codes from a stable per-user
+# secret and a time window of half the code validity (OPTIONS: {'step':
+# seconds} to force it), writes nothing on issue and only stores a consumed
+# counter per user and purpose.
+OTP = {
+    'BACKEND': 'accounts.otp.DatabaseOTPBackend',
+    'OPTIONS': {},
+}
+
+# Sliding-window rate limiter behind accounts.throttling. Counters must be
+# shared by every process, or each worker applies its own limit:
+# DatabaseBackend (RateLimitCounter rows) needs no extra service;
+# 'accounts.throttling.CacheBackend' (OPTIONS: {'cache': '<CACHES alias>'})
+# needs a shared cache with atomic incr (Redis, Memcached). MemoryBackend and
+# CacheBackend on a LocMem cache are per-process and fail the system checks.
+RATE_LIMIT = {
+    'BACKEND': 'accounts.throttling.DatabaseBackend',
+    'OPTIONS': {},
+}
+
+# Defaults for `manage.py purge_otps` (expired / consumed OTPRequest rows).
+OTP_PURGE = {
+    'BATCH_SIZE': 1000,
+    'SLEEP': 0.5,  # seconds between batches
+    'RETENTION_DAYS': 0,  # keep rows created within the last N days
+}
+
+# Transactional email outbox, drained by `manage.py run_outbox`. Failed sends
+# are retried after BACKOFF_BASE * 2**(attempt-1) seconds (capped at
+# BACKOFF_MAX) until MAX_ATTEMPTS; LEASE is how long a claimed batch stays
+# reserved for the worker that claimed it.
+EMAIL_OUTBOX = {
+    'WORKERS': 4,
+    'BATCH_SIZE': 50,
+    'LEASE': 60,  # seconds
+    'MAX_ATTEMPTS': 5,
+    'BACKOFF_BASE': 30,  # seconds
+    'BACKOFF_MAX': 3600,  # seconds
+    'POLL_INTERVAL': 1.0,  # seconds
+}
+
+# Persistent connections used by the outbox worker (accounts.mail): SIZE
+# connections kept open, BATCH_SIZE messages per send_messages() call, and a
+# connection idle for more than MAX_IDLE seconds is reopened before use.
+EMAIL_POOL = {
+    'SIZE': 4,
+    'BATCH_SIZE': 20,
+    'MAX_IDLE': 30,  # seconds
+}
+
+# Dedicated pool for password hashing (login, register, password change/reset).
+# Requests beyond MAX_WORKERS running + MAX_QUEUE waiting get a 503. Pool
+# metrics are logged (accounts.hashing, INFO) at most every LOG_INTERVAL
+# seconds (0 disables) and served to staff at GET stats/hashing-pool/.
+PASSWORD_HASHING_POOL = {
+    'MAX_WORKERS': 4,
+    'MAX_QUEUE': 64,
+    'LOG_INTERVAL': 60,  # seconds
 }
 
 SPECTACULAR_SETTINGS = {
@@ -1,18 +1,251 @@
-from django.contrib import admin
-from .models import UserProfile, Address, UserModel
+import re
+
+from django.conf import settings
+from django.contrib import admin, messages
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ORDER_VAR, ChangeList
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections, router
+from django.utils.functional import cached_property
+from django.shortcuts import redirect
+from django.urls import path, reverse
 from django.utils.html import format_html
-from django.contrib import admin
 
-# Register your models here.
+from . import bulk
+from .images import current_renditions, get_rendition_pipeline
+from .models import UserProfile, Address, UserModel
+
+# Paramètre de la page suivante : clé primaire de la dernière ligne affichée
+KEYSET_VAR = 'after'
+KEYSET_CURSOR = re.compile(r'[0-9]{1,18}')
+
+
+def changelist_settings():
+    config = getattr(settings, 'ADMIN_CHANGELIST', {})
+    return {
+        'EXACT_COUNT_BELOW': config.get('EXACT_COUNT_BELOW', 10000),
+        'COUNT_CACHE_TTL': config.get('COUNT_CACHE_TTL', 300),
+        'FILTERED_COUNT_LIMIT': config.get('FILTERED_COUNT_LIMIT', 10000),
+    }
+
+
+def estimated_count(model):
+    """
+    Nombre approximatif de lignes de la table du modèle.
+
+    Sous PostgreSQL, l'estimation des statistiques du catalogue
+    (``pg_class.reltuples``) est utilisée au-delà de ``EXACT_COUNT_BELOW``
+    lignes ; ailleurs, le ``COUNT(*)`` est mis en cache ``COUNT_CACHE_TTL``
+    secondes.
+    """
+    config = changelist_settings()
+    connection = connections[router.db_for_read(model)]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                [connection.ops.quote_name(model._meta.db_table)],
+            )
+            row = cursor.fetchone()
+        # -1 : table jamais analysée
+        if row is not None and row[0] >= config['EXACT_COUNT_BELOW']:
+            return row[0]
+        return model._default_manager.count()
+    return cache.get_or_set(
+        f'accounts:admin-count:{model._meta.db_table}',
+        model._default_manager.count,
+        config['COUNT_CACHE_TTL'],
+    )
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator sans ``COUNT(*)`` exact sur toute la table : estimation sans
+    filtre, comptage borné à ``FILTERED_COUNT_LIMIT`` avec filtre ou recherche.
+    """
+    estimated = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            self.estimated = True
+            return estimated_count(queryset.model)
+        limit = changelist_settings()['FILTERED_COUNT_LIMIT']
+        count = queryset.order_by()[:limit].count()
+        self.estimated = count >= limit
+        return count
+
+
+class KeysetChangeList(ChangeList):
+    """
+    Liste de l'admin paginée par clé primaire décroissante : la page suivante
+    est lue par ``pk < dernier pk affiché`` (``?after=``) au lieu d'un
+    OFFSET, en temps constant quelle que soit sa position. Un tri sur une
+    colonne revient à la pagination par numéro de page.
+
+    Un curseur qui n'est pas un entier positif (au plus 18 chiffres, dans
+    les bornes d'un ``bigint``) renvoie à la liste avec ``?e=1``.
+    """
+
+    def __init__(self, request, *args, **kwargs):
+        self.after = request.GET.get(KEYSET_VAR)
+        if self.after is not None:
+            if not KEYSET_CURSOR.fullmatch(self.after):
+                raise IncorrectLookupParameters
+            self.after = int(self.after)
+        self.keyset = False
+        self.next_cursor = None
+        super().__init__(request, *args, **kwargs)
+        # Les liens (tri, filtres, recherche) repartent de la première page
+        self.params.pop(KEYSET_VAR, None)
+        self.filter_params.pop(KEYSET_VAR, None)
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(KEYSET_VAR, None)
+        return lookup_params
+
+    def get_results(self, request):
+        self.keyset = ORDER_VAR not in self.params and tuple(self.model_admin.get_ordering(request)) == ('-pk',)
+        if not self.keyset:
+            return super().get_results(request)
+
+        queryset = self.queryset
+        if self.after is not None:
+            queryset = queryset.filter(pk__lt=self.after)
+        rows = list(queryset[:self.list_per_page + 1])
+
+        self.paginator = self.model_admin.get_paginator(request, self.queryset, self.list_per_page)
+        self.result_count = self.paginator.count
+        self.result_list = rows[:self.list_per_page]
+        if len(rows) > self.list_per_page:
+            self.next_cursor = self.result_list[-1].pk
+        self.show_full_result_count = False
+        self.full_result_count = None
+        self.show_admin_actions = True
+        self.can_show_all = False
+        self.multi_page = self.next_cursor is not None or self.after is not None
 
-admin.site.register(UserModel)
+    @property
+    def first_page_url(self):
+        return self.get_query_string()
 
-admin.site.register(Address)
+    @property
+    def next_page_url(self):
+        if self.next_cursor is None:
+            return None
+        return self.get_query_string({KEYSET_VAR: self.next_cursor})
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    Base des admins des tables volumineuses : pagination par clé primaire,
+    nombre de lignes estimé et pas de second ``COUNT(*)`` sur la table.
+    """
+    ordering = ('-pk',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    change_list_template = 'admin/accounts/change_list_keyset.html'
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
+
+
+class UserSearchMixin:
+    """
+    Recherche par index : un terme contenant ``@`` est cherché comme email
+    exact (index ``user_email_lower_uniq``), les autres comme début du nom
+    d'utilisateur (index unique de ``username``).
+    """
+    search_fields = ('username', 'email')
+    search_help_text = "Début du nom d'utilisateur, ou email exact."
+    user_path = ''
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        if '@' in term:
+            users = UserModel.objects.filter_by_emails([term]).values('pk')
+            return queryset.filter(**{f'{self.user_path}pk__in': users}), False
+        return queryset.filter(**{f'{self.user_path}username__startswith': term}), False
+
+
+@admin.register(UserModel)
+class UserModelAdmin(UserSearchMixin, LargeTableAdmin):
+    list_display = ('username', 'email', 'first_name', 'last_name', 'is_active', 'is_verify', 'user_registered_at')
+    list_filter = ('is_active', 'is_verify', 'is_staff')
+    actions = ['activate_users', 'deactivate_users', 'verify_users', 'resend_otp']
+
+    def get_urls(self):
+        urls = [
+            path('bulk/<slug:job_id>/', self.admin_site.admin_view(self.bulk_job_view),
+                 name='accounts_usermodel_bulk_job'),
+        ]
+        return urls + super().get_urls()
+
+    def run_bulk_action(self, request, queryset, action):
+        """
+        Applique une action de ``accounts.bulk`` à la sélection par UPDATE
+        ensemblistes, sans enregistrer chaque compte ni déclencher les
+        signaux ; les grandes sélections sont traitées en arrière-plan.
+        """
+        user_ids = list(queryset.order_by().values_list('pk', flat=True))
+        job, background = bulk.apply_action(action, user_ids, requested_by=request.user.pk)
+        if background:
+            url = reverse('admin:accounts_usermodel_bulk_job', args=[job['job_id']])
+            self.message_user(request, format_html(
+                "{} comptes en cours de traitement en arrière-plan : <a href=\"{}\">suivre l'avancement</a>.",
+                job['total'], url,
+            ))
+        else:
+            self.message_user(request, f"{job['changed']} compte(s) modifié(s) sur {job['total']}.", messages.SUCCESS)
+
+    def bulk_job_view(self, request, job_id):
+        """Affiche l'avancement d'une action en masse et revient à la liste."""
+        job = bulk.get_bulk_runner().status(job_id)
+        if job is None:
+            self.message_user(request, "Tâche introuvable ou expirée.", messages.WARNING)
+        else:
+            level = {'done': messages.SUCCESS, 'failed': messages.ERROR}.get(job['status'], messages.INFO)
+            self.message_user(request, format_html(
+                "{} : {} / {} compte(s) traité(s), {} modifié(s) ({}). <a href=\"{}\">Actualiser</a>",
+                bulk.ACTIONS[job['action']][0], job['done'], job['total'], job['changed'], job['status'],
+                request.path,
+            ), level)
+        return redirect('admin:accounts_usermodel_changelist')
+
+    @admin.action(description=bulk.ACTIONS['activate'][0])
+    def activate_users(self, request, queryset):
+        self.run_bulk_action(request, queryset, 'activate')
+
+    @admin.action(description=bulk.ACTIONS['deactivate'][0])
+    def deactivate_users(self, request, queryset):
+        self.run_bulk_action(request, queryset, 'deactivate')
+
+    @admin.action(description=bulk.ACTIONS['verify'][0])
+    def verify_users(self, request, queryset):
+        self.run_bulk_action(request, queryset, 'verify')
+
+    @admin.action(description=bulk.ACTIONS['resend_otp'][0])
+    def resend_otp(self, request, queryset):
+        self.run_bulk_action(request, queryset, 'resend_otp')
+
+
+@admin.register(Address)
+class AddressAdmin(LargeTableAdmin):
+    list_display = ('id', 'country', 'city', 'postal_code')
 
 
 @admin.register(UserProfile)
-class UserProfileAdmin(admin.ModelAdmin):
+class UserProfileAdmin(UserSearchMixin, LargeTableAdmin):
     list_display = ('name', 'city', 'image_preview')
+    list_select_related = ('user', 'address')
+    raw_id_fields = ('user', 'address')
+    search_fields = ('user__username', 'user__email')
+    user_path = 'user__'
 
     def name(self, obj):
         name = obj.user.username + " / "
@@ -21,14 +254,20 @@ class UserProfileAdmin(admin.ModelAdmin):
         return name
 
     def city(self, obj):
-        return obj.address.city
+        return obj.address.city if obj.address else ''
 
     def image_preview(self, obj):
-        """Affiche un aperçu de l'image dans l'admin Django"""
+        """Affiche un aperçu de l'image dans l'admin Django (plus petite déclinaison si disponible)"""
         if obj.profile_picture:
-            return format_html('<img src="{}" width="50" height="50"/>'.format(obj.profile_picture.url))
+            renditions = current_renditions(obj)
+            if renditions:
+                url = obj.profile_picture.storage.url(renditions[min(renditions, key=int)])
+            else:
+                url = obj.profile_picture.url
+            return format_html('<img src="{}" width="50" height="50"/>', url)
         return "Pas d'image"
 
-
-
-
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if 'profile_picture' in form.changed_data:
+            get_rendition_pipeline().schedule(obj)
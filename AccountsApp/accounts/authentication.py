@@ -0,0 +1,69 @@
+# accounts/authentication.py
+import hashlib
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .cache import get_token_cache, get_user_cache
+from .revocation import get_revocation_store
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    Authentification JWT qui résout l'utilisateur depuis ``UserCache``.
+
+    Seul un échec de cache déclenche la requête SQL sur ``UserModel`` ; les
+    entrées sont invalidées pour tous les processus par les signaux
+    ``post_save``/``post_delete`` (voir ``accounts.signals``).
+
+    Les tokens déjà vérifiés sont conservés dans un LRU indexé par l'empreinte
+    SHA-256 du token brut, jusqu'à leur ``exp`` : décodage et vérification
+    HMAC ne sont faits qu'une fois par token. Les contrôles de révocation
+    (``accounts.revocation``) restent faits à chaque requête, après le cache.
+    """
+
+    def get_validated_token(self, raw_token):
+        token_cache = get_token_cache()
+        key = hashlib.sha256(raw_token).digest()
+
+        validated_token = token_cache.get(key)
+        if validated_token is None:
+            validated_token = super().get_validated_token(raw_token)
+            token_cache.set(key, validated_token, expires_at=validated_token['exp'])
+
+        if get_revocation_store().is_revoked(validated_token):
+            token_cache.delete(key)
+            raise InvalidToken(_("Token is revoked"))
+
+        return validated_token
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user_cache = get_user_cache()
+        stamp, user = user_cache.lookup(user_id)
+        if user is None:
+            try:
+                user = self.user_model.objects.get(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            user_cache.store(user, stamp)
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
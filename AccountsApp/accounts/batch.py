@@ -0,0 +1,174 @@
+# accounts/batch.py
+import inspect
+import io
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connection
+from django.urls import Resolver404, resolve, reverse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Méthodes sans effet de bord, exécutables en parallèle
+READ_METHODS = {'GET', 'HEAD'}
+# En-têtes de la réponse d'une sous-requête recopiés dans le résultat
+RESPONSE_HEADERS = ('ETag', 'Cache-Control', 'Location', 'Retry-After')
+# En-têtes de la requête englobante qui ne concernent pas les sous-requêtes
+REQUEST_META_EXCLUDED = ('CONTENT_TYPE', 'CONTENT_LENGTH', 'HTTP_IF_NONE_MATCH', 'HTTP_IF_MATCH', 'HTTP_CONTENT_RANGE')
+# En-têtes d'identification, toujours ceux de la requête englobante
+IDENTITY_HEADERS = ('authorization', 'cookie')
+
+
+def batch_settings():
+    config = getattr(settings, 'BATCH_REQUESTS', {})
+    return {
+        'MAX_REQUESTS': config.get('MAX_REQUESTS', 20),
+        'WORKERS': config.get('WORKERS', 4),
+    }
+
+
+def dumps(data):
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data).encode()
+
+
+class BatchDispatcher:
+    """
+    Exécute les sous-requêtes d'un appel ``batch/`` dans le processus.
+
+    Chaque sous-requête est résolue dans ``accounts.urls`` et passée
+    directement à sa vue : les middlewares ne sont pas réexécutés. Elle porte
+    l'en-tête ``Authorization`` de la requête englobante et chaque vue
+    l'authentifie avec ses propres classes d'authentification : le token
+    déjà vérifié est servi par le cache de ``CachedJWTAuthentication``, les
+    contrôles de révocation et d'état du compte sont refaits pour chaque
+    sous-requête. Les permissions et limites de débit de chaque vue
+    s'appliquent normalement.
+
+    Les sous-requêtes sont exécutées dans l'ordre de la liste. Avec
+    ``parallel``, les lectures (GET/HEAD) consécutives sont exécutées en
+    même temps sur un pool de threads ; une écriture attend la fin des
+    lectures qui la précèdent et les lectures qui la suivent attendent sa
+    fin. Les écritures ne sont jamais exécutées en parallèle.
+    """
+
+    def __init__(self, workers=4):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='batch')
+
+    def dispatch(self, request, items, parallel=False):
+        prefix = reverse('batch').removesuffix('batch/')
+        results = [None] * len(items)
+        reads = []
+        for index, item in enumerate(items):
+            if parallel and item['method'] in READ_METHODS:
+                reads.append(index)
+                continue
+            self._run_concurrently(request, items, reads, results, prefix)
+            reads = []
+            results[index] = self.execute(request, item, prefix)
+        self._run_concurrently(request, items, reads, results, prefix)
+        return results
+
+    def _run_concurrently(self, request, items, indexes, results, prefix):
+        if len(indexes) == 1:
+            results[indexes[0]] = self.execute(request, items[indexes[0]], prefix)
+        elif indexes:
+            futures = {index: self.executor.submit(self.execute_in_thread, request, items[index], prefix)
+                       for index in indexes}
+            for index, future in futures.items():
+                results[index] = future.result()
+
+    def execute_in_thread(self, request, item, prefix):
+        try:
+            return self.execute(request, item, prefix)
+        finally:
+            connection.close()
+
+    def execute(self, request, item, prefix):
+        """Exécute une sous-requête ; renvoie ``{'status', 'headers', 'body'}``."""
+        url = urlsplit(item['path'])
+        path = url.path.removeprefix(prefix).lstrip('/')
+        try:
+            match = resolve('/' + path, urlconf='accounts.urls')
+        except Resolver404:
+            return {'status': 404, 'headers': {}, 'body': {'detail': "Route inconnue."}}
+        if match.url_name == 'batch':
+            return {'status': 400, 'headers': {}, 'body': {'detail': "Un batch ne peut pas contenir de batch."}}
+
+        sub_request = self.build_request(request, item, prefix + path, url.query)
+        try:
+            response = match.func(sub_request, *match.args, **match.kwargs)
+            if inspect.isawaitable(response):
+                response = async_to_sync(self._await)(response)
+        except Exception:
+            logger.exception("Échec de la sous-requête %s %s", item['method'], item['path'])
+            return {'status': 500, 'headers': {}, 'body': {'detail': "Erreur interne."}}
+
+        return {
+            'status': response.status_code,
+            'headers': {name: response[name] for name in RESPONSE_HEADERS if response.has_header(name)},
+            'body': getattr(response, 'data', None),
+        }
+
+    @staticmethod
+    async def _await(awaitable):
+        return await awaitable
+
+    def build_request(self, request, item, path, query):
+        """
+        Construit la requête Django d'une sous-requête à partir de la requête
+        englobante (hôte, adresse du client, session, en-tête
+        ``Authorization``).
+        """
+        django_request = request._request
+        environ = {key: value for key, value in django_request.META.items() if key not in REQUEST_META_EXCLUDED}
+        body = b''
+        if item.get('body') is not None:
+            body = dumps(item['body'])
+            environ['CONTENT_TYPE'] = 'application/json'
+        environ.update({
+            'REQUEST_METHOD': item['method'],
+            'PATH_INFO': path,
+            'QUERY_STRING': query,
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.input': io.BytesIO(body),
+        })
+        for name, value in (item.get('headers') or {}).items():
+            if name.lower() not in IDENTITY_HEADERS:
+                environ['HTTP_' + name.upper().replace('-', '_')] = value
+
+        sub_request = WSGIRequest(environ)
+        if hasattr(django_request, 'session'):
+            sub_request.session = django_request.session
+        # Les middlewares (dont CSRF) ont déjà traité la requête englobante
+        sub_request._dont_enforce_csrf_checks = True
+        return sub_request
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_batch_dispatcher():
+    """
+    Renvoie l'exécuteur des requêtes groupées du processus, configuré par
+    ``settings.BATCH_REQUESTS``.
+    """
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                _dispatcher = BatchDispatcher(workers=batch_settings()['WORKERS'])
+    return _dispatcher
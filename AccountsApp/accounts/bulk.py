@@ -0,0 +1,246 @@
+# accounts/bulk.py
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils.timezone import now
+
+from .cache import get_profile_cache, get_user_cache
+from .models import BulkActionJob, OutboxEmail, UserModel
+from .otp import get_otp_backend
+from .outbox import otp_email
+
+logger = logging.getLogger(__name__)
+
+
+def bulk_settings():
+    config = getattr(settings, 'BULK_ACTIONS', {})
+    return {
+        'BATCH_SIZE': config.get('BATCH_SIZE', 1000),
+        'BACKGROUND_ABOVE': config.get('BACKGROUND_ABOVE', 1000),
+        'MAX_USERS': config.get('MAX_USERS', 100000),
+        'WORKERS': config.get('WORKERS', 1),
+        'TTL': config.get('TTL', 24 * 3600),
+        'STALE_AFTER': config.get('STALE_AFTER', 600),
+    }
+
+
+def invalidate_users(user_ids):
+    """
+    Invalide les caches des utilisateurs modifiés par un UPDATE en masse,
+    qui ne déclenche pas les signaux ``post_save`` (``accounts.signals``).
+    """
+    get_user_cache().invalidate_many(user_ids)
+    get_profile_cache().invalidate_many(user_ids)
+
+
+def set_flags(user_ids, **values):
+    """Un UPDATE pour les seuls comptes dont la valeur change ; renvoie leur nombre."""
+    changed = UserModel.objects.filter(pk__in=user_ids).exclude(**values).update(**values)
+    if changed:
+        invalidate_users(user_ids)
+    return changed
+
+
+def resend_otp(user_ids):
+    """
+    Émet un nouveau code d'inscription aux comptes actifs non vérifiés :
+    codes en attente invalidés et nouveaux codes créés par lot
+    (``issue_many``), emails ajoutés à la file par un seul ``bulk_create``.
+    """
+    users = list(
+        UserModel.objects.filter(pk__in=user_ids, is_active=True, is_verify=False)
+        .only('pk', 'email', 'first_name', 'user_registered_at')
+    )
+    if not users:
+        return 0
+    otp_requests = get_otp_backend().issue_many(users, 'register', minutes=60)
+    OutboxEmail.objects.bulk_create([otp_email(otp_request) for otp_request in otp_requests])
+    return len(users)
+
+
+ACTIONS = {
+    'activate': ("Activer les comptes", lambda user_ids: set_flags(user_ids, is_active=True)),
+    'deactivate': ("Désactiver les comptes", lambda user_ids: set_flags(user_ids, is_active=False)),
+    'verify': ("Marquer les comptes comme vérifiés", lambda user_ids: set_flags(user_ids, is_verify=True)),
+    'resend_otp': ("Renvoyer un code de vérification", resend_otp),
+}
+
+
+def run_action(action, user_ids, progress=None):
+    """
+    Applique ``action`` aux utilisateurs par lots de ``BATCH_SIZE``, chacun
+    dans sa propre transaction. ``progress(traités, modifiés)`` est appelé
+    après chaque lot. Renvoie le nombre de comptes modifiés.
+    """
+    handler = ACTIONS[action][1]
+    batch_size = bulk_settings()['BATCH_SIZE']
+    done = changed = 0
+    for start in range(0, len(user_ids), batch_size):
+        batch = user_ids[start:start + batch_size]
+        with transaction.atomic():
+            changed += handler(batch)
+        done += len(batch)
+        if progress is not None:
+            progress(done, changed)
+    return changed
+
+
+class StaleJob(Exception):
+    """Tâche passée en échec (``BulkActionRunner.reap_stale``) pendant son exécution."""
+
+
+class BulkActionRunner:
+    """
+    Exécute les actions en masse sur de grandes sélections hors du thread de
+    la requête.
+
+    L'état de chaque tâche (``pending``, ``running``, ``done`` ou ``failed``,
+    nombre de comptes traités et modifiés) est enregistré en base
+    (``BulkActionJob``, un UPDATE par lot) : il est consultable depuis
+    n'importe quel processus. Les tâches de plus de ``ttl`` secondes sont
+    supprimées à la création d'une nouvelle tâche.
+
+    Chaque lot renouvelle ``updated_at`` de la tâche en cours et des tâches
+    en file du processus. Une tâche en attente ou en cours inchangée depuis
+    ``stale_after`` secondes (processus arrêté en cours de route) est passée
+    en échec à sa consultation ou à la création d'une nouvelle tâche ; si
+    elle reprend malgré tout, elle s'arrête au lot suivant.
+    """
+    STALE_ERROR = "Tâche interrompue : plus de nouvelles du processus qui l'exécutait."
+
+    def __init__(self, ttl=24 * 3600, workers=1, stale_after=600):
+        self.ttl = ttl
+        self.stale_after = stale_after
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bulk-actions')
+        # Tâches de ce processus en attente d'un thread
+        self.queued = set()
+        self.lock = threading.Lock()
+
+    def submit(self, action, user_ids, requested_by=None):
+        """Planifie la tâche à la validation de la transaction ; renvoie son état initial."""
+        BulkActionJob.objects.filter(created_at__lt=now() - timedelta(seconds=self.ttl)).delete()
+        self.reap_stale()
+        job = BulkActionJob.objects.create(action=action, total=len(user_ids), requested_by_id=requested_by)
+        user_ids = list(user_ids)
+
+        def enqueue():
+            with self.lock:
+                self.queued.add(job.pk)
+            self.executor.submit(self.run, job.pk, job.action, user_ids)
+
+        transaction.on_commit(enqueue)
+        return job_state(job)
+
+    def status(self, job_id):
+        try:
+            job_id = uuid.UUID(job_id)
+        except ValueError:
+            return None
+        job = BulkActionJob.objects.filter(pk=job_id, created_at__gte=now() - timedelta(seconds=self.ttl)).first()
+        if job is None:
+            return None
+        if job.status in (BulkActionJob.PENDING, BulkActionJob.RUNNING) and job.updated_at < self.stale_before():
+            # Sauf si la tâche a avancé entre-temps
+            if self.reap_stale(pk=job.pk, updated_at=job.updated_at):
+                job.status, job.error = BulkActionJob.FAILED, self.STALE_ERROR
+        return job_state(job)
+
+    def stale_before(self):
+        return now() - timedelta(seconds=self.stale_after)
+
+    def reap_stale(self, **filters):
+        """Passe en échec les tâches qui n'avancent plus ; renvoie leur nombre."""
+        return BulkActionJob.objects.filter(
+            status__in=[BulkActionJob.PENDING, BulkActionJob.RUNNING],
+            updated_at__lt=self.stale_before(), **filters,
+        ).update(status=BulkActionJob.FAILED, error=self.STALE_ERROR, updated_at=now())
+
+    def heartbeat(self):
+        """Renouvelle ``updated_at`` des tâches en file de ce processus."""
+        with self.lock:
+            queued = list(self.queued)
+        if queued:
+            BulkActionJob.objects.filter(pk__in=queued, status=BulkActionJob.PENDING).update(updated_at=now())
+
+    def run(self, job_id, action, user_ids):
+        with self.lock:
+            self.queued.discard(job_id)
+        jobs = BulkActionJob.objects.filter(pk=job_id, status=BulkActionJob.RUNNING)
+
+        def progress(done, changed):
+            if not jobs.update(done=done, changed=changed, updated_at=now()):
+                raise StaleJob
+            self.heartbeat()
+
+        try:
+            # Tâche passée en échec pendant son attente : abandonnée
+            if not BulkActionJob.objects.filter(pk=job_id, status=BulkActionJob.PENDING).update(
+                    status=BulkActionJob.RUNNING, updated_at=now()):
+                return
+            run_action(action, user_ids, progress)
+            jobs.update(status=BulkActionJob.DONE, updated_at=now())
+        except StaleJob:
+            logger.warning("Action en masse %s (%s) arrêtée : tâche passée en échec", job_id.hex, action)
+        except Exception as exc:
+            logger.exception("Échec de l'action en masse %s (%s)", job_id.hex, action)
+            jobs.update(status=BulkActionJob.FAILED, error=str(exc), updated_at=now())
+        finally:
+            connection.close()
+
+
+def job_state(job):
+    """Représentation d'une tâche renvoyée par l'API et lue par l'administration."""
+    return {
+        'job_id': job.pk.hex,
+        'action': job.action,
+        'status': job.status,
+        'total': job.total,
+        'done': job.done,
+        'changed': job.changed,
+        'requested_by': job.requested_by_id,
+        'error': job.error or None,
+    }
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def get_bulk_runner():
+    """
+    Renvoie l'exécuteur des actions en masse du processus, configuré par
+    ``settings.BULK_ACTIONS``.
+    """
+    global _runner
+    if _runner is None:
+        with _runner_lock:
+            if _runner is None:
+                config = bulk_settings()
+                _runner = BulkActionRunner(ttl=config['TTL'], workers=config['WORKERS'],
+                                           stale_after=config['STALE_AFTER'])
+    return _runner
+
+
+def apply_action(action, user_ids, requested_by=None):
+    """
+    Applique ``action`` immédiatement, ou en arrière-plan au-delà de
+    ``BACKGROUND_ABOVE`` comptes. Renvoie ``(tâche, en arrière-plan)``.
+    """
+    if len(user_ids) > bulk_settings()['BACKGROUND_ABOVE']:
+        return get_bulk_runner().submit(action, user_ids, requested_by), True
+    changed = run_action(action, user_ids)
+    return {
+        'job_id': None,
+        'action': action,
+        'status': 'done',
+        'total': len(user_ids),
+        'done': len(user_ids),
+        'changed': changed,
+        'requested_by': requested_by,
+        'error': None,
+    }, False
@@ -0,0 +1,334 @@
+# accounts/cache.py
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+
+def is_process_local(alias):
+    """Indique si l'entrée ``alias`` de ``CACHES`` n'est visible que du processus courant."""
+    return isinstance(caches[alias], LocMemCache)
+
+
+class LRUCache:
+    """
+    Cache LRU en mémoire, borné en taille, avec expiration par entrée.
+
+    Chaque entrée expire après ``ttl`` secondes, ou plus tôt si une date
+    d'expiration absolue (``expires_at``, horloge ``time.time()``) est fournie.
+    Sûr entre threads.
+    """
+
+    def __init__(self, max_size=1024, ttl=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None, expires_at=None):
+        ttl = self.ttl if ttl is None else ttl
+        if ttl is not None:
+            ttl_expiry = time.time() + ttl
+            expires_at = ttl_expiry if expires_at is None else min(expires_at, ttl_expiry)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        """Renvoie les compteurs de succès/échecs du cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+class UserCache:
+    """
+    Cache des utilisateurs authentifiés, indexé par leur identifiant.
+
+    Chaque utilisateur a un jeton de version (``stamp``) dans un cache Django
+    partagé entre processus (``SHARED_CACHE``), supprimé à chaque
+    modification du compte (voir ``accounts.signals``). Une entrée n'est
+    servie que si elle a été produite pour le jeton courant : une
+    désactivation ou un changement de mot de passe invalide donc
+    l'utilisateur pour tous les processus, pas seulement pour celui qui l'a
+    enregistré.
+
+    Premier niveau : ``LRUCache`` en mémoire, qui évite de relire et de
+    désérialiser la ligne dans le cache partagé. Second niveau : le cache
+    partagé. On y stocke les valeurs des colonnes et non l'instance, chaque
+    requête reçoit donc sa propre instance du modèle. Sans cache partagé
+    (``shared_cache=None``), le cache est désactivé.
+    """
+    key_prefix = 'accounts:user:'
+
+    def __init__(self, user_model, ttl=30, max_size=10000, shared_cache=None):
+        self.user_model = user_model
+        self.ttl = ttl
+        self.local = LRUCache(max_size=max_size, ttl=ttl)
+        self.shared = caches[shared_cache] if shared_cache else None
+        self._field_names = [field.attname for field in user_model._meta.concrete_fields]
+
+    def _keys(self, user_id):
+        return f'{self.key_prefix}{user_id}:stamp', f'{self.key_prefix}{user_id}'
+
+    @property
+    def enabled(self):
+        return self.shared is not None
+
+    def lookup(self, user_id):
+        """
+        Renvoie ``(stamp, utilisateur)`` ; l'utilisateur est ``None`` s'il est
+        absent du cache ou produit pour un autre jeton. Le jeton est lu avant
+        la requête SQL de l'appelant et repassé à ``store`` : une
+        modification intervenue entre-temps rend l'entrée stockée inutilisable.
+        """
+        if self.shared is None:
+            return None, None
+        user_id = str(user_id)
+        stamp_key, entry_key = self._keys(user_id)
+        stamp = self.shared.get(stamp_key)
+        if stamp is None:
+            stamp = uuid.uuid4().hex
+            if not self.shared.add(stamp_key, stamp, self.ttl):
+                # Jeton créé entre-temps par une autre requête
+                stamp = self.shared.get(stamp_key, stamp)
+            return stamp, None
+        entry = self.local.get(user_id)
+        if entry is None or entry[0] != stamp:
+            entry = self.shared.get(entry_key)
+            if entry is None or entry[0] != stamp:
+                return stamp, None
+            self.local.set(user_id, entry)
+        _, db, values = entry
+        return stamp, self.user_model.from_db(db, self._field_names, values)
+
+    def store(self, user, stamp):
+        if self.shared is None:
+            return
+        entry = (stamp, user._state.db, [getattr(user, name) for name in self._field_names])
+        self.local.set(str(user.pk), entry)
+        self.shared.set(self._keys(user.pk)[1], entry, self.ttl)
+
+    def invalidate(self, user_id):
+        """
+        Supprime le jeton de l'utilisateur, immédiatement puis à la
+        validation de la transaction en cours (une lecture concurrente a pu
+        recréer un jeton pour les anciennes données entre-temps).
+        """
+        self.local.delete(str(user_id))
+        if self.shared is None:
+            return
+        stamp_key = self._keys(user_id)[0]
+        self.shared.delete(stamp_key)
+        transaction.on_commit(lambda: self.shared.delete(stamp_key))
+
+    def invalidate_many(self, user_ids):
+        """Comme ``invalidate``, pour plusieurs utilisateurs (mises à jour en masse)."""
+        for user_id in user_ids:
+            self.local.delete(str(user_id))
+        if self.shared is None:
+            return
+        stamp_keys = [self._keys(user_id)[0] for user_id in user_ids]
+        self.shared.delete_many(stamp_keys)
+        transaction.on_commit(lambda: self.shared.delete_many(stamp_keys))
+
+    def stats(self):
+        return self.local.stats()
+
+
+_user_cache = None
+_user_cache_lock = threading.Lock()
+
+
+def get_user_cache():
+    """
+    Renvoie le cache des utilisateurs du processus, configuré par
+    ``settings.USER_CACHE``.
+    """
+    global _user_cache
+    if _user_cache is None:
+        with _user_cache_lock:
+            if _user_cache is None:
+                config = getattr(settings, 'USER_CACHE', {})
+                _user_cache = UserCache(
+                    get_user_model(),
+                    ttl=config.get('TTL', 30),
+                    max_size=config.get('MAX_SIZE', 10000),
+                    shared_cache=config.get('SHARED_CACHE'),
+                )
+    return _user_cache
+
+
+_token_cache = None
+_token_cache_lock = threading.Lock()
+
+
+def get_token_cache():
+    """
+    Renvoie le cache des tokens JWT déjà vérifiés, configuré par
+    ``settings.TOKEN_CACHE``.
+    """
+    global _token_cache
+    if _token_cache is None:
+        with _token_cache_lock:
+            if _token_cache is None:
+                config = getattr(settings, 'TOKEN_CACHE', {})
+                _token_cache = LRUCache(max_size=config.get('MAX_SIZE', 10000))
+    return _token_cache
+
+
+class ProfileCache:
+    """
+    Cache des profils sérialisés (``GET profile/``), par utilisateur.
+
+    Chaque utilisateur a une version, renouvelée à chaque enregistrement de
+    son compte, de son profil ou de son adresse (voir ``accounts.signals``)
+    et renvoyée comme ``ETag``. Le contenu en cache n'est servi que s'il a
+    été produit pour la version courante. Version et contenu sont stockés
+    dans un cache Django partagé entre processus (vérifié par
+    ``accounts.checks``) : une modification invalide ainsi le profil pour
+    tous les processus. Sans cache (``cache=None``), le profil est lu en
+    base à chaque requête.
+    """
+    key_prefix = 'accounts:profile:'
+
+    def __init__(self, cache=None, ttl=300):
+        self.cache = caches[cache] if cache else None
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.not_modified = 0
+        self.misses = 0
+
+    def _keys(self, user_id):
+        return f'{self.key_prefix}{user_id}:version', f'{self.key_prefix}{user_id}:payload'
+
+    @property
+    def enabled(self):
+        return self.cache is not None
+
+    def lookup(self, user_id):
+        """Renvoie ``(version, contenu)`` ; le contenu est ``None`` s'il est absent ou périmé."""
+        version_key, payload_key = self._keys(user_id)
+        values = self.cache.get_many([version_key, payload_key])
+        version = values.get(version_key)
+        if version is None:
+            version = uuid.uuid4().hex
+            if not self.cache.add(version_key, version, self.ttl):
+                # Version créée entre-temps par une autre requête
+                version = self.cache.get(version_key, version)
+            return version, None
+        entry = values.get(payload_key)
+        if entry is not None and entry[0] == version:
+            return version, entry[1]
+        return version, None
+
+    def store(self, user_id, version, payload):
+        self.cache.set(self._keys(user_id)[1], (version, payload), self.ttl)
+
+    def invalidate(self, user_id):
+        """
+        Renouvelle la version de l'utilisateur, immédiatement puis à la
+        validation de la transaction en cours (une lecture concurrente a pu
+        remettre en cache les anciennes données entre-temps).
+        """
+        if self.cache is None:
+            return
+        version_key = self._keys(user_id)[0]
+        self.cache.delete(version_key)
+        transaction.on_commit(lambda: self.cache.delete(version_key))
+
+    def invalidate_many(self, user_ids):
+        """Comme ``invalidate``, pour plusieurs utilisateurs à la fois."""
+        if self.cache is None:
+            return
+        version_keys = [self._keys(user_id)[0] for user_id in user_ids]
+        self.cache.delete_many(version_keys)
+        transaction.on_commit(lambda: self.cache.delete_many(version_keys))
+
+    @staticmethod
+    def etag(version):
+        return f'"{version}"'
+
+    def record(self, outcome):
+        """Comptabilise une lecture : ``'hit'``, ``'not_modified'`` ou ``'miss'``."""
+        with self._lock:
+            if outcome == 'hit':
+                self.hits += 1
+            elif outcome == 'not_modified':
+                self.not_modified += 1
+            else:
+                self.misses += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.not_modified + self.misses
+            return {
+                'hits': self.hits,
+                'not_modified': self.not_modified,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.not_modified) / lookups if lookups else 0.0,
+            }
+
+
+_profile_cache = None
+_profile_cache_lock = threading.Lock()
+
+
+def get_profile_cache():
+    """
+    Renvoie le cache des profils sérialisés, configuré par
+    ``settings.PROFILE_CACHE``.
+    """
+    global _profile_cache
+    if _profile_cache is None:
+        with _profile_cache_lock:
+            if _profile_cache is None:
+                config = getattr(settings, 'PROFILE_CACHE', {})
+                _profile_cache = ProfileCache(
+                    cache=config.get('CACHE'),
+                    ttl=config.get('TTL', 300),
+                )
+    return _profile_cache
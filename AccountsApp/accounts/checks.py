@@ -0,0 +1,49 @@
+# accounts/checks.py
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+from .cache import is_process_local
+from .throttling import get_rate_limiter
+
+
+@register(Tags.caches)
+def check_shared_caches(app_configs, **kwargs):
+    """
+    Les caches des profils et des utilisateurs sont invalidés par le
+    processus qui enregistre la modification : avec un cache propre à chaque
+    processus, les autres continueraient de servir l'ancien profil (et des
+    304), ou d'authentifier un compte désactivé, jusqu'au TTL.
+    """
+    errors = []
+    alias = getattr(settings, 'PROFILE_CACHE', {}).get('CACHE')
+    if alias and is_process_local(alias):
+        errors.append(Error(
+            f"PROFILE_CACHE['CACHE'] désigne le cache '{alias}', propre à chaque processus.",
+            hint="Utilisez une entrée de CACHES partagée (Redis, Memcached) ou désactivez le cache (None).",
+            id='accounts.E001',
+        ))
+    alias = getattr(settings, 'USER_CACHE', {}).get('SHARED_CACHE')
+    if alias and is_process_local(alias):
+        errors.append(Error(
+            f"USER_CACHE['SHARED_CACHE'] désigne le cache '{alias}', propre à chaque processus.",
+            hint="Utilisez une entrée de CACHES partagée (Redis, Memcached) ou désactivez le cache (None).",
+            id='accounts.E003',
+        ))
+    return errors
+
+
+@register(Tags.security)
+def check_shared_rate_limits(app_configs, **kwargs):
+    """
+    Les limites de débit (tentatives de connexion, codes OTP à 4 chiffres)
+    doivent être comptées pour tous les processus : des compteurs propres à
+    chaque processus multiplient la limite par le nombre de workers.
+    """
+    backend = get_rate_limiter().backend
+    if not backend.process_local:
+        return []
+    return [Error(
+        f"RATE_LIMIT['BACKEND'] ({type(backend).__name__}) compte les requêtes dans chaque processus.",
+        hint="Utilisez accounts.throttling.DatabaseBackend, ou CacheBackend sur un cache partagé (Redis, Memcached).",
+        id='accounts.E002',
+    )]
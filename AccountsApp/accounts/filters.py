@@ -0,0 +1,40 @@
+# accounts/filters.py
+import django_filters
+from django.db import connections
+from django.db.models.functions import Lower
+
+from .models import UserModel
+
+
+class UserFilter(django_filters.FilterSet):
+    """
+    Filtres de l'annuaire des utilisateurs (``users/``).
+
+    Chaque filtre s'appuie sur un index : ``is_active`` et ``is_verify``
+    sur les index composés avec la date d'inscription (qui servent aussi au
+    tri de la pagination), la période d'inscription sur
+    ``user_registered_idx`` et le préfixe d'email sur ``user_email_lower_uniq``
+    (SQLite) ou ``user_email_lower_pattern_idx`` (PostgreSQL).
+    """
+    registered_after = django_filters.IsoDateTimeFilter(field_name='user_registered_at', lookup_expr='gte')
+    registered_before = django_filters.IsoDateTimeFilter(field_name='user_registered_at', lookup_expr='lt')
+    email = django_filters.CharFilter(method='filter_email_prefix', label="Début de l'email (insensible à la casse)")
+
+    class Meta:
+        model = UserModel
+        fields = ['is_active', 'is_verify']
+
+    def filter_email_prefix(self, queryset, name, value):
+        prefix = UserModel.objects.normalize_lookup_email(value)
+        if not prefix:
+            return queryset
+        queryset = queryset.alias(email_lower=Lower('email'))
+        if connections[queryset.db].vendor == 'sqlite' and prefix[-1] != '\U0010ffff':
+            # LIKE n'utilise pas l'index sous SQLite ; la collation BINARY y
+            # compare dans l'ordre des points de code, où l'intervalle
+            # [préfixe, préfixe au dernier caractère incrémenté[ est exact.
+            upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+            return queryset.filter(email_lower__gte=prefix, email_lower__lt=upper)
+        # LIKE 'préfixe%' : exact sous toute collation ; sous PostgreSQL,
+        # servi par l'index text_pattern_ops de la migration 0019
+        return queryset.filter(email_lower__startswith=prefix)
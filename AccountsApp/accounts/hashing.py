@@ -0,0 +1,216 @@
+# accounts/hashing.py
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+logger = logging.getLogger(__name__)
+
+
+class HashingPoolSaturated(APIException):
+    """
+    Levée lorsque la file d'attente du pool de hachage est pleine.
+    """
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Le serveur est surchargé, veuillez réessayer dans quelques instants."
+    default_code = 'hashing_pool_saturated'
+
+
+class PasswordHashingPool:
+    """
+    Pool de threads borné dédié au hachage des mots de passe (PBKDF2).
+
+    hashlib relâche le GIL pendant le calcul, des threads suffisent donc à
+    paralléliser le travail. Au-delà de ``max_workers`` tâches en cours et
+    ``max_queue`` tâches en attente, les nouvelles demandes sont refusées
+    plutôt que de bloquer indéfiniment les workers qui servent les autres
+    endpoints.
+
+    Les métriques (``stats``) sont journalisées au plus toutes les
+    ``log_interval`` secondes, lors d'une soumission (0 : jamais), et
+    exposées au personnel par ``GET stats/hashing-pool/``.
+    """
+
+    def __init__(self, max_workers=4, max_queue=64, log_interval=60):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.log_interval = log_interval
+        self._next_log = time.monotonic() + log_interval
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='password-hashing'
+        )
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._peak_pending = 0
+        self._submitted = 0
+        self._rejected = 0
+        self._started = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Soumet une tâche au pool et renvoie un ``concurrent.futures.Future``.
+
+        Lève ``HashingPoolSaturated`` si la file d'attente est pleine.
+        """
+        self._log_stats()
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise HashingPoolSaturated()
+
+        with self._lock:
+            self._submitted += 1
+            self._pending += 1
+            self._peak_pending = max(self._peak_pending, self._pending)
+
+        enqueued_at = time.monotonic()
+
+        def task():
+            wait = time.monotonic() - enqueued_at
+            with self._lock:
+                self._started += 1
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._pending -= 1
+                self._slots.release()
+
+        try:
+            return self._executor.submit(task)
+        except RuntimeError:
+            with self._lock:
+                self._pending -= 1
+            self._slots.release()
+            raise
+
+    def run(self, fn, *args, **kwargs):
+        """Exécute la tâche dans le pool et attend son résultat (vues synchrones)."""
+        return self.submit(fn, *args, **kwargs).result()
+
+    async def arun(self, fn, *args, **kwargs):
+        """Exécute la tâche dans le pool sans bloquer la boucle d'événements."""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def _log_stats(self):
+        if not self.log_interval:
+            return
+        current = time.monotonic()
+        with self._lock:
+            if current < self._next_log:
+                return
+            self._next_log = current + self.log_interval
+        logger.info("Pool de hachage : %s", self.stats())
+
+    def stats(self):
+        """
+        Renvoie les métriques de saturation et de temps d'attente du pool.
+        """
+        with self._lock:
+            return {
+                'max_workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'pending': self._pending,
+                'queued': max(self._pending - self.max_workers, 0),
+                'peak_pending': self._peak_pending,
+                'saturation': self._pending / (self.max_workers + self.max_queue),
+                'submitted': self._submitted,
+                'rejected': self._rejected,
+                'avg_queue_wait': self._total_wait / self._started if self._started else 0.0,
+                'max_queue_wait': self._max_wait,
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_hashing_pool():
+    """
+    Renvoie le pool de hachage du processus, créé à la première utilisation
+    à partir de ``settings.PASSWORD_HASHING_POOL``.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                config = getattr(settings, 'PASSWORD_HASHING_POOL', {})
+                _pool = PasswordHashingPool(
+                    max_workers=config.get('MAX_WORKERS', 4),
+                    max_queue=config.get('MAX_QUEUE', 64),
+                    log_interval=config.get('LOG_INTERVAL', 60),
+                )
+    return _pool
+
+
+def _verify(raw_password, encoded):
+    if encoded is None:
+        # Hachage factice : même coût que l'utilisateur existe ou non
+        hashers.make_password(raw_password)
+        return False, False
+    return hashers.verify_password(raw_password, encoded)
+
+
+def _upgrade_password(user, encoded):
+    user.password = encoded
+    # La mise à niveau du hash n'est pas un changement de mot de passe
+    user._password = None
+    user.save(update_fields=['password'])
+
+
+def check_password(user, raw_password):
+    """
+    Vérifie le mot de passe dans le pool de hachage.
+
+    ``user`` peut valoir ``None`` : un hachage factice est alors effectué.
+    Met à niveau le hash si l'algorithme préféré a changé.
+    """
+    encoded = user.password if user is not None else None
+    pool = get_hashing_pool()
+    is_correct, must_update = pool.run(_verify, raw_password, encoded)
+    if is_correct and must_update:
+        _upgrade_password(user, pool.run(hashers.make_password, raw_password))
+    return is_correct
+
+
+async def acheck_password(user, raw_password):
+    """Version asynchrone de ``check_password``."""
+    encoded = user.password if user is not None else None
+    pool = get_hashing_pool()
+    is_correct, must_update = await pool.arun(_verify, raw_password, encoded)
+    if is_correct and must_update:
+        new_encoded = await pool.arun(hashers.make_password, raw_password)
+        await sync_to_async(_upgrade_password)(user, new_encoded)
+    return is_correct
+
+
+def make_password(raw_password):
+    """Calcule le hash d'un mot de passe dans le pool de hachage."""
+    return get_hashing_pool().run(hashers.make_password, raw_password)
+
+
+async def amake_password(raw_password):
+    """Version asynchrone de ``make_password``."""
+    return await get_hashing_pool().arun(hashers.make_password, raw_password)
+
+
+def set_password(user, raw_password, encoded):
+    """
+    Applique un hash déjà calculé (``make_password``) à l'utilisateur,
+    comme le ferait ``user.set_password(raw_password)``.
+    """
+    user.password = encoded
+    user._password = raw_password
@@ -0,0 +1,213 @@
+# accounts/images.py
+import hashlib
+import io
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+from PIL import Image, ImageOps, ImageSequence
+
+from .cache import get_profile_cache
+from .models import UserProfile
+
+logger = logging.getLogger(__name__)
+
+EXTENSIONS = {'WEBP': 'webp', 'JPEG': 'jpg'}
+# Qualité du réencodage des originaux avec perte (JPEG, WebP)
+ORIGINAL_QUALITY = 95
+
+
+def rendition_names(source_name, sizes, image_format):
+    """Noms des déclinaisons d'une image source, par taille."""
+    digest = hashlib.sha256(source_name.encode()).hexdigest()[:12]
+    extension = EXTENSIONS[image_format]
+    return {str(size): f'profile_pictures/renditions/{digest}_{size}.{extension}' for size in sizes}
+
+
+def current_renditions(profile):
+    """
+    Renvoie ``{taille: nom de fichier}`` des déclinaisons de la photo
+    actuelle du profil (vide si elles ne sont pas encore générées).
+    """
+    renditions = profile.renditions or {}
+    if not profile.profile_picture or renditions.get('source') != profile.profile_picture.name:
+        return {}
+    return renditions.get('files', {})
+
+
+def strip_metadata(source):
+    """
+    Réencode une image dans son format sans ses métadonnées et renvoie les
+    octets obtenus.
+
+    EXIF (position GPS, appareil, date), XMP et commentaires sont abandonnés ;
+    l'orientation EXIF est appliquée aux pixels et le profil de couleur ICC
+    conservé. Les images animées (GIF, WebP) gardent toutes leurs images.
+    """
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    with Image.open(source) as image:
+        image_format = image.format
+        options = {}
+        if image.info.get('icc_profile'):
+            options['icc_profile'] = image.info['icc_profile']
+        if image_format in ('JPEG', 'WEBP'):
+            options['quality'] = ORIGINAL_QUALITY
+        if getattr(image, 'n_frames', 1) > 1:
+            frames = []
+            for frame in ImageSequence.Iterator(image):
+                frame = frame.copy()
+                frame.info.pop('comment', None)
+                frames.append(frame)
+            first, rest = frames[0], frames[1:]
+            options.update(save_all=True, append_images=rest, loop=image.info.get('loop', 0))
+            if 'duration' in image.info:
+                options['duration'] = image.info['duration']
+        else:
+            first = ImageOps.exif_transpose(image)
+            first.info.pop('comment', None)
+        buffer = io.BytesIO()
+        first.save(buffer, image_format, **options)
+    return buffer.getvalue()
+
+
+def strip_stored_picture(profile):
+    """
+    Remplace la photo enregistrée d'un profil par une copie sans métadonnées
+    (photos envoyées avant leur suppression à la réception) et renvoie le
+    nom du nouveau fichier. Les déclinaisons sont à régénérer.
+    """
+    storage = profile.profile_picture.storage
+    old_name = profile.profile_picture.name
+    with storage.open(old_name, 'rb') as source:
+        content = strip_metadata(source)
+    new_name = storage.save(old_name, ContentFile(content))
+    if not UserProfile.objects.filter(pk=profile.pk, profile_picture=old_name).update(profile_picture=new_name):
+        # Photo remplacée entre-temps
+        storage.delete(new_name)
+        return None
+    storage.delete(old_name)
+    profile.profile_picture.name = new_name
+    get_profile_cache().invalidate(profile.pk)
+    return new_name
+
+
+def render(source, sizes, image_format='WEBP', quality=80):
+    """
+    Décode l'image une seule fois et renvoie ``{taille: octets}``.
+
+    L'orientation EXIF est appliquée puis les métadonnées sont abandonnées ;
+    chaque déclinaison est réduite à partir de la précédente (la plus grande
+    d'abord), sans jamais agrandir l'original.
+    """
+    with Image.open(source) as image:
+        image.draft('RGB', (max(sizes), max(sizes)))  # décodage JPEG réduit
+        image = ImageOps.exif_transpose(image)
+        image = image.convert('RGBA' if image_format == 'WEBP' and image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+
+    renditions = {}
+    for size in sorted(sizes, reverse=True):
+        image.thumbnail((size, size), Image.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, image_format, quality=quality, optimize=True)
+        renditions[str(size)] = buffer.getvalue()
+    return renditions
+
+
+class RenditionPipeline:
+    """
+    Génère les déclinaisons réduites de ``UserProfile.profile_picture`` hors
+    du thread de la requête.
+
+    Le travail est soumis à la validation de la transaction qui enregistre
+    la photo. Le résultat n'est enregistré que si la photo n'a pas changé
+    entre-temps ; les fichiers de l'ancienne série sont alors supprimés.
+    ``manage.py render_profile_pictures`` rattrape les profils sans
+    déclinaisons (worker interrompu, photos antérieures).
+    """
+
+    def __init__(self, sizes=(64, 256, 1024), image_format='WEBP', quality=80, workers=2):
+        self.sizes = tuple(sizes)
+        self.image_format = image_format
+        self.quality = quality
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='renditions')
+
+    def schedule(self, profile):
+        """Planifie les déclinaisons de la photo courante du profil."""
+        if not profile.profile_picture:
+            self.clear(profile)
+            return
+        user_id, source_name = profile.pk, profile.profile_picture.name
+        transaction.on_commit(lambda: self.executor.submit(self.run, user_id, source_name))
+
+    def run(self, user_id, source_name):
+        try:
+            self.process(user_id, source_name)
+        except Exception:
+            logger.exception("Échec des déclinaisons de la photo du profil %s", user_id)
+        finally:
+            connection.close()
+
+    def process(self, user_id, source_name):
+        """Génère et enregistre les déclinaisons d'une photo (synchrone)."""
+        storage = UserProfile._meta.get_field('profile_picture').storage
+        with storage.open(source_name, 'rb') as source:
+            images = render(source, self.sizes, self.image_format, self.quality)
+
+        names = rendition_names(source_name, self.sizes, self.image_format)
+        files = {}
+        for size, content in images.items():
+            if storage.exists(names[size]):
+                storage.delete(names[size])
+            files[size] = storage.save(names[size], ContentFile(content))
+
+        old = UserProfile.objects.filter(pk=user_id).values_list('renditions', flat=True).first() or {}
+        updated = UserProfile.objects.filter(pk=user_id, profile_picture=source_name).update(
+            renditions={'source': source_name, 'files': files}
+        )
+        if not updated:
+            # La photo a changé pendant le traitement : cette série est obsolète
+            self.delete_files(files.values())
+            return
+        self.delete_files(set(old.get('files', {}).values()) - set(files.values()))
+        # update() ne déclenche pas les signaux
+        get_profile_cache().invalidate(user_id)
+
+    def clear(self, profile):
+        """Supprime les déclinaisons d'un profil sans photo."""
+        if profile.renditions:
+            self.delete_files(profile.renditions.get('files', {}).values())
+            UserProfile.objects.filter(pk=profile.pk).update(renditions={})
+            profile.renditions = {}
+            get_profile_cache().invalidate(profile.pk)
+
+    def delete_files(self, names):
+        storage = UserProfile._meta.get_field('profile_picture').storage
+        for name in names:
+            storage.delete(name)
+
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def get_rendition_pipeline():
+    """
+    Renvoie le pipeline de déclinaisons du processus, configuré par
+    ``settings.PROFILE_PICTURE_RENDITIONS``.
+    """
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                config = getattr(settings, 'PROFILE_PICTURE_RENDITIONS', {})
+                _pipeline = RenditionPipeline(
+                    sizes=config.get('SIZES', (64, 256, 1024)),
+                    image_format=config.get('FORMAT', 'WEBP'),
+                    quality=config.get('QUALITY', 80),
+                    workers=config.get('WORKERS', 2),
+                )
+    return _pipeline
@@ -0,0 +1,183 @@
+# accounts/mail.py
+import logging
+import queue
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.mail import get_connection
+
+logger = logging.getLogger(__name__)
+
+# Erreurs imputables à la connexion (serveur parti, connexion inactive
+# fermée) et non au message : on reconnecte et on renvoie sans pénalité.
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError)
+
+# Refus du message par le serveur : la connexion reste utilisable.
+MESSAGE_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError)
+
+
+class _Progress:
+    """
+    Itérable passé à ``send_messages`` qui retient la position atteinte :
+    en cas d'exception, les messages précédents sont partis et l'erreur
+    concerne le message courant.
+    """
+
+    def __init__(self, messages):
+        self.messages = messages
+        self.index = -1
+
+    def __len__(self):
+        return len(self.messages)
+
+    def __iter__(self):
+        for self.index, message in enumerate(self.messages):
+            yield message
+
+
+class MailConnectionPool:
+    """
+    Pool de connexions persistantes au backend email (SMTP en production).
+
+    Chaque connexion reste ouverte entre deux lots (poignée de main TLS et
+    AUTH une seule fois) et est rouverte si elle est restée inactive plus de
+    ``max_idle`` secondes ou si le serveur l'a coupée. Les messages sont
+    envoyés par lots de ``batch_size`` via ``send_messages``.
+    """
+
+    def __init__(self, size=4, batch_size=20, max_idle=30, backend=None, **backend_options):
+        self.size = size
+        self.batch_size = batch_size
+        self.max_idle = max_idle
+        self.backend = backend
+        self.backend_options = backend_options
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._stats_lock = threading.Lock()
+        self._started = time.monotonic()
+        self._sent = 0
+        self._failed = 0
+        self._batches = 0
+        self._reconnects = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    @contextmanager
+    def connection(self):
+        """Prête une connexion ouverte du pool ; bloque si toutes sont occupées."""
+        self._slots.acquire()
+        try:
+            try:
+                connection, last_used = self._idle.get_nowait()
+                if time.monotonic() - last_used > self.max_idle:
+                    self._close(connection)
+            except queue.Empty:
+                connection = get_connection(self.backend, fail_silently=False, **self.backend_options)
+            yield connection
+            self._idle.put((connection, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    def send(self, messages):
+        """
+        Envoie des ``EmailMessage`` et renvoie, pour chacun, ``None`` s'il est
+        parti ou le message d'erreur.
+        """
+        errors = [None] * len(messages)
+        for offset in range(0, len(messages), self.batch_size):
+            batch = messages[offset:offset + self.batch_size]
+            started = time.monotonic()
+            with self.connection() as connection:
+                self._send_batch(connection, batch, errors, offset)
+            self._record(batch, errors[offset:offset + len(batch)], time.monotonic() - started)
+        return errors
+
+    def _send_batch(self, connection, messages, errors, offset):
+        position = 0
+        retried = False
+        while position < len(messages):
+            progress = _Progress(messages[position:])
+            try:
+                connection.open()
+                connection.send_messages(progress)
+                return
+            except Exception as exc:
+                failed = position + max(progress.index, 0)
+                if not isinstance(exc, MESSAGE_ERRORS):
+                    self._close(connection)
+                    with self._stats_lock:
+                        self._reconnects += 1
+                if isinstance(exc, CONNECTION_ERRORS) and not retried:
+                    retried = True
+                    position = failed
+                    continue
+                logger.warning("Échec de l'envoi d'un email : %r", exc)
+                if progress.index < 0:
+                    # Connexion impossible : le reste du lot échoue
+                    for index in range(failed, len(messages)):
+                        errors[offset + index] = repr(exc)
+                    return
+                errors[offset + failed] = repr(exc)
+                position = failed + 1
+
+    def _close(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def _record(self, batch, errors, latency):
+        failed = sum(error is not None for error in errors)
+        with self._stats_lock:
+            self._batches += 1
+            self._sent += len(batch) - failed
+            self._failed += failed
+            self._latency_total += latency
+            self._latency_max = max(self._latency_max, latency)
+
+    def stats(self):
+        """Renvoie les compteurs d'envoi, le débit et la latence par lot."""
+        with self._stats_lock:
+            elapsed = time.monotonic() - self._started
+            return {
+                'sent': self._sent,
+                'failed': self._failed,
+                'batches': self._batches,
+                'reconnects': self._reconnects,
+                'throughput': self._sent / elapsed if elapsed else 0.0,  # emails/s
+                'batch_latency_avg': self._latency_total / self._batches if self._batches else 0.0,
+                'batch_latency_max': self._latency_max,
+            }
+
+    def close(self):
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(connection)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_mail_pool():
+    """
+    Renvoie le pool de connexions email du processus, configuré par
+    ``settings.EMAIL_POOL``.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                config = getattr(settings, 'EMAIL_POOL', {})
+                _pool = MailConnectionPool(
+                    size=config.get('SIZE', 4),
+                    batch_size=config.get('BATCH_SIZE', 20),
+                    max_idle=config.get('MAX_IDLE', 30),
+                )
+    return _pool
@@ -0,0 +1,199 @@
+import csv
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import django
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.validators import validate_email
+from django.db import connection, transaction
+from django.db.models import Q
+
+from accounts.models import OutboxEmail, UserModel, UserProfile
+from accounts.outbox import welcome_email
+
+
+def read_csv(path):
+    with open(path, newline='', encoding='utf-8') as file:
+        yield from csv.DictReader(file)
+
+
+def read_ndjson(path):
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+READERS = {'csv': read_csv, 'ndjson': read_ndjson}
+
+
+class Command(BaseCommand):
+    """
+    Importe des utilisateurs en masse depuis un fichier CSV ou NDJSON.
+
+    Colonnes attendues : ``email``, ``first_name``, ``last_name`` et soit
+    ``password`` (haché par un pool de processus), soit ``password_hash``
+    (hash Django déjà calculé). L'email sert aussi de nom d'utilisateur.
+
+    Chaque lot est écrit dans sa propre transaction par ``bulk_create``
+    (utilisateurs, profils sans adresse et, en option, emails de
+    bienvenue), sans passer par ``create_user`` ni par les signaux
+    ``post_save``. Les emails déjà présents en base sont ignorés : relancer
+    la commande est sans risque, et ``--start-line`` évite de relire le
+    début du fichier après une interruption.
+    """
+    help = "Importe des utilisateurs en masse depuis un fichier CSV ou NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Fichier à importer.")
+        parser.add_argument('--format', choices=sorted(READERS),
+                            help="Format du fichier (déduit de l'extension par défaut).")
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help="Nombre d'utilisateurs écrits par transaction.")
+        parser.add_argument('--processes', type=int, default=None,
+                            help="Processus de hachage (défaut : nombre de CPU, 0 = sans pool).")
+        parser.add_argument('--start-line', type=int, default=0,
+                            help="Ignore les N premières lignes de données (dernière ligne affichée).")
+        parser.add_argument('--verified', action='store_true',
+                            help="Marque les comptes importés comme vérifiés.")
+        parser.add_argument('--welcome-email', action='store_true',
+                            help="Met en file l'email de bienvenue de chaque compte créé.")
+
+    def handle(self, *args, **options):
+        file_format = options['format'] or options['path'].rsplit('.', 1)[-1].lower()
+        if file_format not in READERS:
+            raise CommandError("Format inconnu : utilisez --format csv ou --format ndjson.")
+
+        rows = enumerate(READERS[file_format](options['path']), start=1)
+        rows = islice(rows, options['start_line'], None)
+
+        executor = None
+        if options['processes'] != 0:
+            executor = ProcessPoolExecutor(max_workers=options['processes'], initializer=django.setup)
+
+        self.created = self.skipped = self.invalid = 0
+        started = time.monotonic()
+        try:
+            batches = self.hashed_batches(rows, options['batch_size'], executor)
+            for number, (last_line, batch) in enumerate(batches, start=1):
+                self.write_batch(batch, options)
+                rate = self.created / (time.monotonic() - started)
+                self.stdout.write(
+                    f"Lot {number} : {self.created} créé(s), {self.skipped} déjà présent(s), "
+                    f"{self.invalid} invalide(s), dernière ligne {last_line} ({rate:.0f}/s)"
+                )
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{self.created} utilisateur(s) importé(s), {self.skipped} déjà présent(s), {self.invalid} invalide(s)."
+        ))
+
+    def hashed_batches(self, rows, batch_size, executor):
+        """
+        Renvoie les lots ``(dernière ligne, [(ligne, données, hash)])``.
+
+        Le hachage du lot suivant est soumis au pool avant que le lot courant
+        soit rendu : il se poursuit pendant l'écriture en base.
+        """
+        pending = None
+        while True:
+            chunk = list(islice(rows, batch_size))
+            current = None
+            if chunk:
+                batch = self.clean_rows(chunk)
+                passwords = [row['password'] for line, row in batch if not row['password_hash']]
+                if executor is not None:
+                    hashes = executor.map(make_password, passwords, chunksize=max(1, len(passwords) // 32))
+                else:
+                    hashes = map(make_password, passwords)
+                current = (chunk[-1][0], batch, hashes)
+
+            if pending is not None:
+                yield self.apply_hashes(*pending)
+            if current is None:
+                return
+            pending = current
+
+    def apply_hashes(self, last_line, batch, hashes):
+        hashes = iter(hashes)
+        return last_line, [
+            (line, row, row['password_hash'] or next(hashes)) for line, row in batch
+        ]
+
+    def clean_rows(self, rows):
+        batch = []
+        for line, row in rows:
+            values = {name: (row.get(name) or '').strip() for name in ('email', 'first_name', 'last_name')}
+            password = row.get('password') or ''
+            password_hash = row.get('password_hash') or ''
+            try:
+                validate_email(values['email'])
+                for name, value in values.items():
+                    if not value:
+                        raise ValidationError(f"{name} obligatoire")
+                    if len(value) > UserModel._meta.get_field(name).max_length:
+                        raise ValidationError(f"{name} trop long")
+                if password_hash:
+                    identify_hasher(password_hash)
+                elif not password:
+                    raise ValidationError("mot de passe manquant")
+            except (ValidationError, ValueError) as exc:
+                self.invalid += 1
+                message = '; '.join(exc.messages) if isinstance(exc, ValidationError) else str(exc)
+                self.stderr.write(f"Ligne {line} ignorée : {message}")
+                continue
+            batch.append((line, dict(values, password=password, password_hash=password_hash)))
+        return batch
+
+    def write_batch(self, batch, options):
+        normalize = UserModel.objects.normalize_lookup_email
+        emails = [row['email'] for line, row, password_hash in batch]
+        # Nom d'utilisateur (sensible à la casse) ou email (insensible) déjà pris
+        existing = set()
+        for username, email in UserModel.objects.filter(
+            Q(username__in=emails) | Q(pk__in=UserModel.objects.filter_by_emails(emails).values('pk'))
+        ).values_list('username', 'email'):
+            existing.update((normalize(username), normalize(email)))
+
+        users = []
+        for line, row, password_hash in batch:
+            email = normalize(row['email'])
+            if email in existing:
+                self.skipped += 1
+                continue
+            existing.add(email)  # doublon dans le fichier
+            users.append(UserModel(
+                username=row['email'],
+                email=row['email'],
+                first_name=row['first_name'],
+                last_name=row['last_name'],
+                telephone_number="",
+                password=password_hash,
+                is_active=True,
+                is_verify=options['verified'],
+            ))
+        if not users:
+            return
+
+        with transaction.atomic():
+            UserModel.objects.bulk_create(users)
+            if not connection.features.can_return_rows_from_bulk_insert:
+                # Base sans RETURNING sur les insertions multiples (MySQL)
+                ids = dict(UserModel.objects.filter(
+                    username__in=[user.username for user in users]
+                ).values_list('username', 'pk'))
+                for user in users:
+                    user.pk = ids[user.username]
+
+            UserProfile.objects.bulk_create([UserProfile(user=user) for user in users])
+            if options['welcome_email']:
+                OutboxEmail.objects.bulk_create([welcome_email(user) for user in users])
+
+        self.created += len(users)
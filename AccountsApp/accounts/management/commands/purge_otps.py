@@ -0,0 +1,87 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils.timezone import now
+
+from accounts.models import OTPRequest
+
+
+class Command(BaseCommand):
+    """
+    Supprime par lots les OTPRequest expirés ou consommés.
+
+    Les lots sont parcourus par clé primaire croissante et supprimés par un
+    DELETE direct (sans passer par le collecteur de suppression de Django),
+    chacun dans sa propre transaction courte. La commande affiche le dernier
+    id traité : ``--start-pk`` permet de reprendre après une interruption.
+    """
+    help = "Supprime par lots les codes OTP expirés ou consommés."
+
+    def add_arguments(self, parser):
+        config = getattr(settings, 'OTP_PURGE', {})
+        parser.add_argument('--batch-size', type=int, default=config.get('BATCH_SIZE', 1000),
+                            help="Nombre de lignes supprimées par transaction.")
+        parser.add_argument('--sleep', type=float, default=config.get('SLEEP', 0.5),
+                            help="Pause en secondes entre deux lots (limite le retard de réplication).")
+        parser.add_argument('--retention-days', type=int, default=config.get('RETENTION_DAYS', 0),
+                            help="Conserve les codes créés depuis moins de N jours.")
+        parser.add_argument('--start-pk', type=int, default=0,
+                            help="Reprend après cet id (dernier id affiché par une exécution interrompue).")
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Compte les lignes concernées sans rien supprimer.")
+
+    def get_queryset(self, retention_days):
+        current = now()
+        # Codes expirés, ou invalidés / consommés (otp_code vidé) : plus aucun
+        # chemin ne les lit. Les OTP de réinitialisation validés gardent leur
+        # code jusqu'à leur expiration.
+        queryset = OTPRequest.objects.filter(
+            Q(expiry_time__lt=current) | Q(used=True, otp_code__isnull=True)
+        )
+        if retention_days:
+            queryset = queryset.filter(created_at__lt=current - timedelta(days=retention_days))
+        return queryset
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        queryset = self.get_queryset(options['retention_days'])
+
+        if options['dry_run']:
+            count = queryset.filter(pk__gt=options['start_pk']).count()
+            self.stdout.write(f"{count} code(s) OTP à supprimer.")
+            return
+
+        table = connection.ops.quote_name(OTPRequest._meta.db_table)
+        pk_column = connection.ops.quote_name(OTPRequest._meta.pk.column)
+        last_pk = options['start_pk']
+        total = 0
+        batch = 0
+
+        while True:
+            pks = list(
+                queryset.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:batch_size]
+            )
+            if not pks:
+                break
+
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    placeholders = ', '.join(['%s'] * len(pks))
+                    cursor.execute(f'DELETE FROM {table} WHERE {pk_column} IN ({placeholders})', pks)
+                    deleted = cursor.rowcount
+
+            batch += 1
+            total += deleted
+            last_pk = pks[-1]
+            self.stdout.write(f"Lot {batch} : {deleted} supprimé(s), total {total}, dernier id {last_pk}")
+
+            if len(pks) < batch_size:
+                break
+            if options['sleep']:
+                time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS(f"{total} code(s) OTP supprimé(s)."))
@@ -0,0 +1,30 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils.timezone import now
+
+from accounts import uploads
+from accounts.models import ProfilePictureUpload
+
+
+class Command(BaseCommand):
+    """
+    Supprime les envois fractionnés de photo de profil abandonnés.
+
+    Un envoi interrompu garde sa ligne et son fichier temporaire pour
+    pouvoir être repris ; passé ``--older-than`` heures, les deux sont
+    supprimés.
+    """
+    help = "Supprime les envois de photo de profil abandonnés."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than', type=int, default=24,
+                            help="Âge minimal (en heures) d'un envoi supprimé.")
+
+    def handle(self, *args, **options):
+        cutoff = now() - timedelta(hours=options['older_than'])
+        total = 0
+        for upload in ProfilePictureUpload.objects.filter(created_at__lt=cutoff).order_by('created_at').iterator():
+            uploads.abort(upload)
+            total += 1
+        self.stdout.write(self.style.SUCCESS(f"{total} envoi(s) supprimé(s)."))
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+
+from accounts.images import current_renditions, get_rendition_pipeline, strip_stored_picture
+from accounts.models import UserProfile
+
+
+class Command(BaseCommand):
+    """
+    Génère les déclinaisons manquantes des photos de profil.
+
+    Rattrape les photos envoyées avant la mise en place des déclinaisons ou
+    dont le traitement en arrière-plan a été interrompu. ``--all`` régénère
+    toutes les séries (après un changement de ``PROFILE_PICTURE_RENDITIONS``).
+    ``--strip-metadata`` réencode d'abord les originaux sans leurs métadonnées
+    (photos envoyées avant leur suppression à la réception) puis régénère
+    leurs déclinaisons.
+    """
+    help = "Génère les déclinaisons manquantes des photos de profil."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true',
+                            help="Régénère aussi les déclinaisons existantes.")
+        parser.add_argument('--strip-metadata', action='store_true',
+                            help="Retire les métadonnées (EXIF) des originaux enregistrés.")
+
+    def handle(self, *args, **options):
+        pipeline = get_rendition_pipeline()
+        profiles = (
+            UserProfile.objects.exclude(profile_picture='').exclude(profile_picture__isnull=True)
+            .only('pk', 'profile_picture', 'renditions').order_by('pk')
+        )
+        done = failed = 0
+        for profile in profiles.iterator():
+            if not (options['all'] or options['strip_metadata']) and current_renditions(profile):
+                continue
+            try:
+                source_name = profile.profile_picture.name
+                if options['strip_metadata']:
+                    source_name = strip_stored_picture(profile)
+                    if source_name is None:
+                        continue
+                pipeline.process(profile.pk, source_name)
+            except Exception as exc:
+                failed += 1
+                self.stderr.write(f"Profil {profile.pk} : {exc!r}")
+                continue
+            done += 1
+        self.stdout.write(self.style.SUCCESS(f"{done} photo(s) traitée(s), {failed} en échec."))
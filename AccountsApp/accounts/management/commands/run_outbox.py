@@ -0,0 +1,65 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from accounts.outbox import OutboxWorker
+
+
+class Command(BaseCommand):
+    """
+    Envoie en continu les emails de la file (``OutboxEmail``).
+
+    Plusieurs instances peuvent tourner en parallèle : chaque lot est
+    réclamé par un bail, aucun email n'est envoyé deux fois tant que le bail
+    n'a pas expiré. ``--once`` vide la file puis s'arrête (cron, tests).
+    """
+    help = "Envoie les emails en attente dans la file d'envoi."
+
+    def add_arguments(self, parser):
+        config = getattr(settings, 'EMAIL_OUTBOX', {})
+        parser.add_argument('--workers', type=int, default=config.get('WORKERS', 4),
+                            help="Nombre de threads d'envoi.")
+        parser.add_argument('--batch-size', type=int, default=config.get('BATCH_SIZE', 50),
+                            help="Nombre d'emails réclamés par lot.")
+        parser.add_argument('--lease', type=int, default=config.get('LEASE', 60),
+                            help="Durée du bail en secondes avant qu'un lot non traité soit repris.")
+        parser.add_argument('--max-attempts', type=int, default=config.get('MAX_ATTEMPTS', 5),
+                            help="Nombre de tentatives avant de marquer un email en échec.")
+        parser.add_argument('--poll-interval', type=float, default=config.get('POLL_INTERVAL', 1.0),
+                            help="Pause en secondes quand la file est vide.")
+        parser.add_argument('--once', action='store_true',
+                            help="Vide la file puis s'arrête.")
+
+    def handle(self, *args, **options):
+        config = getattr(settings, 'EMAIL_OUTBOX', {})
+        worker = OutboxWorker(
+            workers=options['workers'],
+            batch_size=options['batch_size'],
+            lease=options['lease'],
+            max_attempts=options['max_attempts'],
+            backoff_base=config.get('BACKOFF_BASE', 30),
+            backoff_max=config.get('BACKOFF_MAX', 3600),
+        )
+
+        try:
+            while True:
+                claimed = worker.run_once()
+                if claimed:
+                    self.stdout.write(f"Lot de {claimed} email(s) : {worker.sent} envoyé(s), {worker.failed} en échec")
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            worker.close()
+
+        stats = worker.pool.stats()
+        self.stdout.write(
+            f"Débit {stats['throughput']:.1f} email(s)/s, {stats['batches']} lot(s), "
+            f"latence moyenne {stats['batch_latency_avg'] * 1000:.0f} ms, "
+            f"max {stats['batch_latency_max'] * 1000:.0f} ms, {stats['reconnects']} reconnexion(s)"
+        )
+        self.stdout.write(self.style.SUCCESS(f"{worker.sent} email(s) envoyé(s), {worker.failed} en échec."))
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.6 on 2026-10-17 06:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_revokedtoken'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='otprequest',
+            index=models.Index(condition=models.Q(('used', False)), fields=['user', 'purpose', 'expiry_time'], name='otp_pending_expiry_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='otprequest',
+            index=models.Index(condition=models.Q(('used', False)), fields=['user', 'purpose', 'created_at'], name='otp_pending_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='otprequest',
+            index=models.Index(condition=models.Q(('used', True)), fields=['user', 'purpose', 'expiry_time'], name='otp_used_expiry_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.6 on 2026-10-17 06:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_otprequest_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OTPWindow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('purpose', models.CharField(choices=[('register', 'Register'), ('reset_password', 'Reset Password')], max_length=30)),
+                ('window', models.BigIntegerField()),
+                ('verified_until', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'purpose'), name='otp_window_user_purpose_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+from django.db import migrations
+from django.db.models import Count, F
+from django.db.models.functions import Lower
+
+
+def dedupe_emails(apps, schema_editor):
+    """
+    Prépare la contrainte d'unicité sur ``Lower(email)``.
+
+    Pour chaque email présent en plusieurs exemplaires (à la casse près),
+    le compte conservé est le compte vérifié, puis le plus récemment
+    connecté, puis le plus ancien. Les autres comptes ne sont pas supprimés :
+    leur email est vidé (ils restent accessibles par leur nom d'utilisateur)
+    pour pouvoir être fusionnés ou supprimés manuellement.
+    """
+    UserModel = apps.get_model('accounts', 'UserModel')
+    # Un email vide équivaut à une absence d'email (NULL n'est pas soumis à l'unicité)
+    UserModel.objects.filter(email='').update(email=None)
+
+    duplicates = list(
+        UserModel.objects.exclude(email__isnull=True)
+        .annotate(email_lower=Lower('email'))
+        .values('email_lower')
+        .annotate(count=Count('id'))
+        .filter(count__gt=1)
+        .values_list('email_lower', flat=True)
+    )
+    for email_lower in duplicates:
+        users = list(
+            UserModel.objects.annotate(email_lower=Lower('email'))
+            .filter(email_lower=email_lower)
+            .order_by('-is_verify', F('last_login').desc(nulls_last=True), 'user_registered_at', 'id')
+            .values_list('id', flat=True)
+        )
+        UserModel.objects.filter(id__in=users[1:]).update(email=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_outboxemail'),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_emails, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-17 07:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_usermodel_email_lower_uniq'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,43 @@
+from django.db import migrations, transaction
+from django.db.models import Q
+
+BATCH_SIZE = 1000
+
+
+def reclaim_empty_addresses(apps, schema_editor):
+    """
+    Détache puis supprime les adresses vides créées à l'inscription.
+
+    Traite les lignes par lots de ``BATCH_SIZE`` (clé primaire croissante),
+    chacun dans sa propre transaction courte : la migration peut être
+    interrompue et relancée.
+    """
+    Address = apps.get_model('accounts', 'Address')
+    UserProfile = apps.get_model('accounts', 'UserProfile')
+    alias = schema_editor.connection.alias
+
+    empty = Address.objects.using(alias).filter(
+        Q(postal_code='') | Q(postal_code='0'), country='', city='', address=''
+    )
+    last_pk = 0
+    while True:
+        pks = list(empty.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:BATCH_SIZE])
+        if not pks:
+            break
+        with transaction.atomic(using=alias):
+            UserProfile.objects.using(alias).filter(address_id__in=pks).update(address=None)
+            Address.objects.using(alias).filter(pk__in=pks).delete()
+        last_pk = pks[-1]
+
+
+class Migration(migrations.Migration):
+    # Un lot par transaction
+    atomic = False
+
+    dependencies = [
+        ('accounts', '0012_userprofile_address_optional'),
+    ]
+
+    operations = [
+        migrations.RunPython(reclaim_empty_addresses, migrations.RunPython.noop),
+    ]
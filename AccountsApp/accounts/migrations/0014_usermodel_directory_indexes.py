@@ -0,0 +1,26 @@
+# Generated by Django 5.1.6 on 2026-10-17 07:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0013_reclaim_empty_addresses'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='usermodel',
+            index=models.Index(fields=['user_registered_at', 'id'], name='user_registered_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usermodel',
+            index=models.Index(fields=['is_active', 'user_registered_at', 'id'], name='user_active_registered_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usermodel',
+            index=models.Index(fields=['is_verify', 'user_registered_at', 'id'], name='user_verify_registered_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.6 on 2026-10-17 07:20
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0014_usermodel_directory_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='otprequest',
+            name='otp_pending_created_idx',
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-17 07:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0016_revokedtoken_revoked_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='otpwindow',
+            name='expires_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='otpwindow',
+            name='issued_window',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,35 @@
+from django.db import migrations
+
+INDEX_NAME = 'user_email_lower_pattern_idx'
+
+
+def create_pattern_index(apps, schema_editor):
+    """
+    Index ``text_pattern_ops`` sur ``LOWER(email)`` pour le filtre de
+    préfixe de l'annuaire (``LIKE 'préfixe%'``), qu'un index ordinaire ne
+    sert pas sous une collation autre que C. PostgreSQL uniquement.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    UserModel = apps.get_model('accounts', 'UserModel')
+    table = schema_editor.quote_name(UserModel._meta.db_table)
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON {table} (LOWER("email") text_pattern_ops)'
+    )
+
+
+def drop_pattern_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f'DROP INDEX IF EXISTS {INDEX_NAME}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0018_bulkactionjob'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_pattern_index, drop_pattern_index),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.6 on 2026-10-17 07:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0019_usermodel_email_lower_pattern_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='otpwindow',
+            name='expires_at',
+        ),
+        migrations.RemoveField(
+            model_name='otpwindow',
+            name='issued_window',
+        ),
+        migrations.RemoveField(
+            model_name='otpwindow',
+            name='window',
+        ),
+        migrations.AddField(
+            model_name='otpwindow',
+            name='consumed',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
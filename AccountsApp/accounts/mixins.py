@@ -0,0 +1,41 @@
+# accounts/mixins.py
+import inspect
+
+from asgiref.sync import sync_to_async
+
+
+class AsyncAPIViewMixin:
+    """
+    Permet d'écrire des vues DRF dont les handlers sont des coroutines.
+
+    Django détecte les handlers ``async def`` et expose la vue comme une
+    coroutine ; ``dispatch`` reprend alors le cycle de vie de
+    ``APIView.dispatch`` en exécutant les étapes synchrones qui touchent
+    la base de données (authentification, permissions, throttling) via
+    ``sync_to_async``.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if inspect.isawaitable(response):
+                response = await response
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
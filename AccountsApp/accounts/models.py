@@ -1,3 +1,5 @@
+import uuid
+
 from django.db import models
 from django.contrib.auth import get_user_model
 from rest_framework.exceptions import ValidationError
@@ -13,6 +15,7 @@ from django.contrib.auth.models import (
     PermissionsMixin,
 )
 from django.core.validators import RegexValidator, validate_email
+from django.db.models.functions import Lower
 from django.conf import settings
 
 
@@ -48,6 +51,26 @@ class UserManager(BaseUserManager):
         return user
 
 
+    @staticmethod
+    def normalize_lookup_email(email):
+        """Forme de l'email utilisée pour les recherches et l'unicité (insensible à la casse)."""
+        return (email or '').strip().lower()
+
+    def get_by_email(self, email):
+        """
+        Renvoie l'utilisateur de cet email, sans tenir compte de la casse.
+
+        La recherche porte sur ``Lower(email)`` et utilise donc l'index
+        unique ``user_email_lower_uniq``.
+        """
+        return self.alias(email_lower=Lower('email')).get(email_lower=self.normalize_lookup_email(email))
+
+    def filter_by_emails(self, emails):
+        """Utilisateurs dont l'email figure dans ``emails``, sans tenir compte de la casse."""
+        return self.alias(email_lower=Lower('email')).filter(
+            email_lower__in={self.normalize_lookup_email(email) for email in emails}
+        )
+
     def create_superuser(self, username, password):
         user = self.create_user(
             username=username, password=password,
@@ -88,6 +111,20 @@ class UserModel(AbstractBaseUser, PermissionsMixin):
 
     USERNAME_FIELD = 'username'
 
+    class Meta:
+        constraints = [
+            # Un seul compte par email quelle que soit la casse ; sert aussi
+            # d'index aux recherches de UserManager.get_by_email
+            models.UniqueConstraint(Lower('email'), name='user_email_lower_uniq'),
+        ]
+        indexes = [
+            # Pagination de l'annuaire (accounts.pagination.UserKeysetPagination)
+            # et filtre sur la période d'inscription
+            models.Index(fields=['user_registered_at', 'id'], name='user_registered_idx'),
+            # Filtres is_active / is_verify avec le même tri
+            models.Index(fields=['is_active', 'user_registered_at', 'id'], name='user_active_registered_idx'),
+            models.Index(fields=['is_verify', 'user_registered_at', 'id'], name='user_verify_registered_idx'),
+        ]
 
     def get_full_name(self):
         return self.first_name + " " + self.last_name
@@ -113,7 +150,10 @@ class UserProfile(models.Model):
     )
 
     profile_picture = models.ImageField(upload_to='profile_pictures/', blank=True, null=True)
-    address = models.ForeignKey(Address, on_delete=models.DO_NOTHING)
+    # Déclinaisons réduites de la photo : {'source': nom, 'files': {taille: nom}} (accounts.images)
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
+    # Créée à la première saisie d'une adresse (UserUpdateSerializer)
+    address = models.ForeignKey(Address, on_delete=models.SET_NULL, null=True, blank=True)
 
     def __str__(self):
         return f"Profile of {self.user.username}"
@@ -127,5 +167,168 @@ class OTPRequest(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     purpose = models.CharField(max_length=30, choices=[('register', 'Register'), ('reset_password', 'Reset Password')])
 
+    class Meta:
+        # Index partiels sur ``used`` : SQLite ne sait pas utiliser un index
+        # pour ``NOT used``, mais reconnaît la condition d'un index partiel.
+        indexes = [
+            # Vérification / invalidation des OTP en attente (CheckOTP, nouvelle demande)
+            models.Index(
+                fields=['user', 'purpose', 'expiry_time'],
+                condition=models.Q(used=False),
+                name='otp_pending_expiry_idx',
+            ),
+            # OTP validé avant réinitialisation du mot de passe
+            models.Index(
+                fields=['user', 'purpose', 'expiry_time'],
+                condition=models.Q(used=True),
+                name='otp_used_expiry_idx',
+            ),
+        ]
+
     def __str__(self):
         return f"OTP for {self.user.email} (used: {self.used}, purpose: {self.purpose})"
+
+
+class RevokedToken(models.Model):
+    """
+    Token JWT révoqué (déconnexion), identifié par son ``jti``.
+
+    Consulté uniquement lorsque le filtre de Bloom de ``accounts.revocation``
+    signale une correspondance possible ; supprimé une fois le token expiré.
+    """
+    jti = models.CharField(max_length=255, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+    # Synchronisation incrémentale des filtres de Bloom des autres processus
+    revoked_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return self.jti
+
+
+class OTPWindow(models.Model):
+    """
+    Marqueur d'usage unique du backend OTP sans état
+    (``accounts.otp.HMACOTPBackend``), par utilisateur et par objet : nombre
+    de codes consommés, qui entre dans le calcul des codes.
+    """
+    user = models.ForeignKey(UserModel, on_delete=models.CASCADE)
+    purpose = models.CharField(max_length=30, choices=[('register', 'Register'), ('reset_password', 'Reset Password')])
+    consumed = models.PositiveIntegerField(default=0)
+    verified_until = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'purpose'], name='otp_window_user_purpose_uniq'),
+        ]
+
+    def __str__(self):
+        return f"OTP marker {self.consumed} for {self.user_id} ({self.purpose})"
+
+
+class OutboxEmail(models.Model):
+    """
+    Email en attente d'envoi (file transactionnelle).
+
+    La ligne est écrite dans la transaction qui crée l'objet concerné
+    (utilisateur, OTP) puis envoyée par ``manage.py run_outbox``.
+    ``available_at`` sert à la fois de date de nouvelle tentative et
+    d'échéance du bail posé par le worker qui a réclamé la ligne.
+    """
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = [(PENDING, 'En attente'), (SENT, 'Envoyé'), (FAILED, 'Échec')]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255, blank=True)
+    recipients = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    lease_token = models.UUIDField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Lignes à réclamer par le worker, dans l'ordre d'envoi
+            models.Index(
+                fields=['available_at', 'id'],
+                condition=models.Q(status='pending'),
+                name='outbox_pending_idx',
+            ),
+            models.Index(fields=['lease_token'], name='outbox_lease_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.recipients)} ({self.status})"
+
+
+class ProfilePictureUpload(models.Model):
+    """
+    Envoi fractionné et reprenable d'une photo de profil, en cours.
+
+    ``offset`` est le nombre d'octets déjà reçus ; le contenu est stocké
+    dans un fichier temporaire (``accounts.uploads.part_path``) et la ligne
+    est supprimée une fois la photo attachée au profil.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(UserModel, on_delete=models.CASCADE)
+    content_type = models.CharField(max_length=50)
+    size = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"Upload {self.pk} ({self.offset}/{self.size})"
+
+
+class BulkActionJob(models.Model):
+    """
+    Action en masse exécutée en arrière-plan (``accounts.bulk``) : état et
+    avancement, consultables depuis n'importe quel processus.
+
+    ``updated_at`` sert de signal de vie : il est renouvelé à chaque lot
+    traité ; une tâche en attente ou en cours qui n'avance plus (processus
+    arrêté) est passée en échec.
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [(PENDING, 'En attente'), (RUNNING, 'En cours'), (DONE, 'Terminée'), (FAILED, 'Échec')]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    action = models.CharField(max_length=30)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    total = models.PositiveIntegerField()
+    done = models.PositiveIntegerField(default=0)
+    changed = models.PositiveIntegerField(default=0)
+    requested_by = models.ForeignKey(UserModel, null=True, blank=True, on_delete=models.SET_NULL, related_name='+')
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.action} {self.pk} ({self.done}/{self.total}, {self.status})"
+
+
+class RateLimitCounter(models.Model):
+    """
+    Compteur de requêtes d'une clé de limitation de débit sur une fenêtre de
+    temps (``accounts.throttling.DatabaseBackend``).
+    """
+    key = models.CharField(max_length=64)  # SHA-256 de la clé
+    window = models.BigIntegerField()
+    count = models.PositiveIntegerField(default=0)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['key', 'window'], name='ratelimit_key_window_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.key[:12]}… {self.window}: {self.count}"
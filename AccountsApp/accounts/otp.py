@@ -0,0 +1,218 @@
+# accounts/otp.py
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils.crypto import constant_time_compare, salted_hmac
+from django.utils.module_loading import import_string
+from django.utils.timezone import now
+
+from .models import OTPRequest, OTPWindow
+from .utils import get_otp_code
+
+
+class BaseOTPBackend:
+    """
+    Interface commune des backends OTP.
+
+    ``issue`` renvoie un ``OTPRequest`` (enregistré ou non selon le backend)
+    portant le code et sa date d'expiration. ``invalidate=False`` indique
+    qu'aucun code antérieur ne peut exister (utilisateur tout juste créé).
+    """
+
+    def issue(self, user, purpose, minutes=10, invalidate=True):
+        raise NotImplementedError
+
+    def issue_many(self, users, purpose, minutes=10):
+        """Émet un code pour chacun des ``users`` (actions en masse)."""
+        return [self.issue(user, purpose, minutes=minutes) for user in users]
+
+    def consume(self, user, purpose, code):
+        """Vérifie le code et le marque comme utilisé. Renvoie ``True`` si valide."""
+        raise NotImplementedError
+
+    def has_verified(self, user, purpose):
+        """Indique si un OTP a été validé récemment (réinitialisation du mot de passe)."""
+        raise NotImplementedError
+
+    def redeem(self, user, purpose):
+        """Invalide la validation obtenue par ``consume`` une fois utilisée."""
+        raise NotImplementedError
+
+
+class DatabaseOTPBackend(BaseOTPBackend):
+    """
+    Backend historique : une ligne ``OTPRequest`` par code émis.
+    """
+
+    def issue(self, user, purpose, minutes=10, invalidate=True):
+        # Invalider les OTP encore valides
+        if invalidate:
+            OTPRequest.objects.filter(
+                user=user,
+                purpose=purpose,
+                used=False,
+                expiry_time__gt=now()
+            ).update(
+                used=True,
+                otp_code=None
+            )
+
+        otp_code, expiry_time = get_otp_code(minutes=minutes)
+        return OTPRequest.objects.create(
+            user=user,
+            otp_code=otp_code,
+            expiry_time=expiry_time,
+            purpose=purpose
+        )
+
+    def issue_many(self, users, purpose, minutes=10):
+        # Un UPDATE pour invalider les codes en attente, un INSERT pour les nouveaux
+        OTPRequest.objects.filter(
+            user__in=users,
+            purpose=purpose,
+            used=False,
+            expiry_time__gt=now()
+        ).update(
+            used=True,
+            otp_code=None
+        )
+
+        otp_requests = []
+        for user in users:
+            otp_code, expiry_time = get_otp_code(minutes=minutes)
+            otp_requests.append(OTPRequest(user=user, otp_code=otp_code, expiry_time=expiry_time, purpose=purpose))
+        return OTPRequest.objects.bulk_create(otp_requests)
+
+    def consume(self, user, purpose, code):
+        # Un seul UPDATE conditionnel : vérification et consommation sont
+        # atomiques, deux soumissions concurrentes ne peuvent pas réussir toutes
+        # les deux (la seconde ne trouve plus de ligne avec used=False).
+        changes = {'used': True}
+        if purpose == 'register':
+            changes['otp_code'] = None
+
+        return OTPRequest.objects.filter(
+            user=user,
+            otp_code=code,
+            purpose=purpose,
+            used=False,
+            expiry_time__gte=now()
+        ).update(**changes) > 0
+
+    def has_verified(self, user, purpose):
+        # Les codes invalidés ou déjà utilisés pour une réinitialisation ont otp_code=None
+        return OTPRequest.objects.filter(
+            user=user,
+            purpose=purpose,
+            used=True,
+            otp_code__isnull=False,
+            expiry_time__gte=now()
+        ).exists()
+
+    def redeem(self, user, purpose):
+        OTPRequest.objects.filter(
+            user=user,
+            purpose=purpose,
+            used=True,
+            expiry_time__gte=now()
+        ).update(otp_code=None)
+
+
+class HMACOTPBackend(BaseOTPBackend):
+    """
+    Backend sans état : le code est dérivé par HMAC (clé ``SECRET_KEY``)
+    d'un secret stable propre à l'utilisateur (identifiant et date
+    d'inscription), de l'objet de l'OTP, d'une fenêtre de temps et du
+    nombre de codes déjà consommés.
+
+    Émettre un code n'écrit rien en base (une lecture du compteur au plus).
+    Seules la fenêtre courante et la précédente sont acceptées : la fenêtre
+    dure la moitié de la validité de l'objet (``step`` pour forcer une
+    durée), un code reste donc valide entre une et deux fenêtres et deux
+    codes au plus sont acceptés à un instant donné. L'usage unique est
+    garanti à la vérification : ``OTPWindow.consumed`` (une ligne par
+    utilisateur et par objet) est incrémenté par un UPDATE conditionnel,
+    ce qui invalide tout code émis avant.
+    """
+    validity = {'register': 60, 'reset_password': 10}  # minutes
+
+    def __init__(self, step=None):
+        self.step = step
+
+    def _step(self, purpose):
+        return self.step or self.validity.get(purpose, 10) * 60 // 2
+
+    def _window(self, purpose, timestamp=None):
+        return int((time.time() if timestamp is None else timestamp) // self._step(purpose))
+
+    def _code(self, user, purpose, window, consumed):
+        value = f'{user.pk}:{user.user_registered_at.timestamp()}:{purpose}:{window}:{consumed}'
+        digest = salted_hmac('accounts.otp.HMACOTPBackend', value, algorithm='sha256').digest()
+        return str(1000 + int.from_bytes(digest[:8], 'big') % 9000)
+
+    def _otp_request(self, user, purpose, consumed):
+        window = self._window(purpose)
+        # Fin de la fenêtre suivante : dernier instant où le code est accepté
+        expiry_time = datetime.fromtimestamp((window + 2) * self._step(purpose), tz=dt_timezone.utc)
+        return OTPRequest(user=user, otp_code=self._code(user, purpose, window, consumed),
+                          expiry_time=expiry_time, purpose=purpose)
+
+    def issue(self, user, purpose, minutes=10, invalidate=True):
+        consumed = 0
+        if invalidate:
+            consumed = OTPWindow.objects.filter(
+                user=user, purpose=purpose
+            ).values_list('consumed', flat=True).first() or 0
+        return self._otp_request(user, purpose, consumed)
+
+    def issue_many(self, users, purpose, minutes=10):
+        # Une seule lecture des compteurs, aucune écriture
+        consumed = dict(
+            OTPWindow.objects.filter(user__in=users, purpose=purpose).values_list('user_id', 'consumed')
+        )
+        return [self._otp_request(user, purpose, consumed.get(user.pk, 0)) for user in users]
+
+    def consume(self, user, purpose, code):
+        consumed = OTPWindow.objects.filter(
+            user=user, purpose=purpose
+        ).values_list('consumed', flat=True).first()
+        current = self._window(purpose)
+        if not any(constant_time_compare(self._code(user, purpose, window, consumed or 0), code)
+                   for window in (current, current - 1)):
+            return False
+
+        # Compteur incrémenté de façon conditionnelle : une seule vérification
+        # concurrente du code réussit, et le code ne redevient jamais valide
+        verified_until = now() + timedelta(minutes=self.validity.get(purpose, 10))
+        if consumed is not None:
+            return OTPWindow.objects.filter(
+                user=user, purpose=purpose, consumed=consumed
+            ).update(consumed=consumed + 1, verified_until=verified_until) > 0
+        try:
+            with transaction.atomic():
+                OTPWindow.objects.create(user=user, purpose=purpose, consumed=1, verified_until=verified_until)
+        except IntegrityError:
+            # Code consommé entre-temps par une vérification concurrente
+            return False
+        return True
+
+    def has_verified(self, user, purpose):
+        return OTPWindow.objects.filter(
+            user=user, purpose=purpose, verified_until__gte=now()
+        ).exists()
+
+    def redeem(self, user, purpose):
+        OTPWindow.objects.filter(user=user, purpose=purpose).update(verified_until=None)
+
+
+@lru_cache(maxsize=None)
+def get_otp_backend():
+    """
+    Renvoie le backend OTP configuré par ``settings.OTP['BACKEND']``.
+    """
+    config = getattr(settings, 'OTP', {})
+    backend_class = import_string(config.get('BACKEND', 'accounts.otp.DatabaseOTPBackend'))
+    return backend_class(**config.get('OPTIONS', {}))
@@ -0,0 +1,175 @@
+# accounts/outbox.py
+import random
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils.timezone import now
+
+from .mail import get_mail_pool
+from .models import OutboxEmail
+
+
+def build_email(subject, body, recipients, from_email=None):
+    """Prépare une ligne de la file d'envoi, sans l'enregistrer (``bulk_create``)."""
+    return OutboxEmail(
+        subject=subject,
+        body=body,
+        recipients=list(recipients),
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+    )
+
+
+def enqueue_email(subject, body, recipients, from_email=None):
+    """
+    Ajoute un email à la file d'envoi.
+
+    À appeler dans la transaction qui crée l'objet concerné : l'email n'est
+    envoyé que si cette transaction est validée.
+    """
+    email = build_email(subject, body, recipients, from_email)
+    email.save(force_insert=True)
+    return email
+
+
+def welcome_email(user):
+    """Prépare l'email de bienvenue d'un utilisateur nouvellement inscrit."""
+    body = f'Bonjour {user.first_name or user.email},\n\n' \
+           f'Merci de vous être inscrit sur notre plateforme. ' \
+           f'Votre compte a été créé avec succès.\n\n' \
+           f'Cordialement,\nL\'équipe de notre application'
+    return build_email('Bienvenue sur notre plateforme !', body, [user.email])
+
+
+def otp_email(otp_request):
+    """Prépare l'email contenant un code OTP (inscription ou réinitialisation)."""
+    user = otp_request.user
+    if otp_request.purpose == 'register':
+        subject = 'Votre code de vérification'
+        reason = 'vérifier votre adresse email'
+    else:
+        subject = 'Réinitialisation de votre mot de passe'
+        reason = 'réinitialiser votre mot de passe'
+    body = f'Bonjour {user.first_name or user.email},\n\n' \
+           f'Votre code pour {reason} est : {otp_request.otp_code}\n' \
+           f'Il expire le {otp_request.expiry_time:%d/%m/%Y à %H:%M} (UTC).\n\n' \
+           f'Cordialement,\nL\'équipe de notre application'
+    return build_email(subject, body, [user.email])
+
+
+def enqueue_welcome_email(user):
+    """Met en file l'email de bienvenue."""
+    email = welcome_email(user)
+    email.save(force_insert=True)
+    return email
+
+
+def enqueue_otp_email(otp_request):
+    """Met en file l'email contenant un code OTP."""
+    email = otp_email(otp_request)
+    email.save(force_insert=True)
+    return email
+
+
+class OutboxWorker:
+    """
+    Envoie les emails de la file par lots.
+
+    Un lot est réclamé en posant un bail (``lease_token`` et ``available_at``
+    repoussé de ``lease`` secondes) : une ligne réclamée n'est pas reprise
+    par un autre worker tant que le bail court, et redevient disponible si
+    le worker s'arrête avant d'avoir enregistré le résultat. Le lot est
+    découpé en sous-lots envoyés en parallèle par un pool de threads, chacun
+    sur une connexion persistante de ``accounts.mail.MailConnectionPool`` ;
+    les échecs sont retentés avec un délai exponentiel jusqu'à
+    ``max_attempts``.
+    """
+
+    def __init__(self, workers=4, batch_size=50, lease=60, max_attempts=5, backoff_base=30, backoff_max=3600,
+                 pool=None):
+        self.batch_size = batch_size
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.pool = pool or get_mail_pool()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='outbox')
+        self.sent = 0
+        self.failed = 0
+
+    def claim(self):
+        """Réclame un lot de lignes à envoyer et le renvoie."""
+        token = uuid.uuid4()
+        current = now()
+        with transaction.atomic():
+            pending = OutboxEmail.objects.filter(
+                status=OutboxEmail.PENDING, available_at__lte=current
+            ).order_by('available_at', 'pk')
+            if connection.features.has_select_for_update_skip_locked:
+                pending = pending.select_for_update(skip_locked=True)
+            pks = list(pending.values_list('pk', flat=True)[:self.batch_size])
+            if not pks:
+                return []
+            # UPDATE conditionnel : sans SKIP LOCKED (SQLite), une ligne déjà
+            # réclamée entre-temps par un autre worker n'est pas reprise.
+            OutboxEmail.objects.filter(
+                pk__in=pks, status=OutboxEmail.PENDING, available_at__lte=current
+            ).update(
+                lease_token=token,
+                available_at=current + timedelta(seconds=self.lease),
+                attempts=F('attempts') + 1,
+            )
+        return list(OutboxEmail.objects.filter(lease_token=token).order_by('pk'))
+
+    def deliver(self, emails):
+        """Envoie des emails ; renvoie, pour chacun, ``None`` ou le message d'erreur."""
+        messages = [
+            EmailMessage(email.subject, email.body, email.from_email, email.recipients)
+            for email in emails
+        ]
+        return self.pool.send(messages)
+
+    def run_once(self):
+        """Traite un lot ; renvoie le nombre de lignes réclamées."""
+        emails = self.claim()
+        if not emails:
+            return 0
+
+        size = self.pool.batch_size
+        batches = [emails[offset:offset + size] for offset in range(0, len(emails), size)]
+        results = [error for errors in self.executor.map(self.deliver, batches) for error in errors]
+
+        sent = [email.pk for email, error in zip(emails, results) if error is None]
+        if sent:
+            # Bail expiré pendant l'envoi : la ligne reprise par un autre
+            # worker (et son état) lui appartient désormais
+            self.sent += OutboxEmail.objects.filter(pk__in=sent, lease_token=emails[0].lease_token).update(
+                status=OutboxEmail.SENT, sent_at=now(), lease_token=None, last_error=''
+            )
+
+        for email, error in zip(emails, results):
+            if error is not None:
+                self.retry_later(email, error)
+        return len(emails)
+
+    def retry_later(self, email, error):
+        changes = {'lease_token': None, 'last_error': error}
+        if email.attempts >= self.max_attempts:
+            changes['status'] = OutboxEmail.FAILED
+            self.failed += 1
+        else:
+            changes['available_at'] = now() + timedelta(seconds=self.backoff(email.attempts))
+        OutboxEmail.objects.filter(pk=email.pk, lease_token=email.lease_token).update(**changes)
+
+    def backoff(self, attempts):
+        """Délai exponentiel avec gigue avant la tentative suivante."""
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1))
+        return delay * random.uniform(0.8, 1.2)
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.pool.close()
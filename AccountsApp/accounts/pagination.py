@@ -0,0 +1,159 @@
+# accounts/pagination.py
+import base64
+import json
+
+from django.db.models import Q
+from django.utils.encoding import force_str
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.utils.urls import replace_query_param
+
+from .utils import CustomResponse
+
+
+class KeysetPagination(BasePagination):
+    """
+    Pagination par curseur opaque sur une clé composée (``ordering``).
+
+    Le curseur contient les valeurs de la clé de la dernière ligne de la page
+    (ou de la première, pour la page précédente) ; la page suivante est lue
+    par une comparaison lexicographique sur ces colonnes, sans OFFSET : avec
+    un index sur ``ordering``, la page 10 000 coûte autant que la première.
+    La dernière colonne de ``ordering`` doit être unique (clé primaire).
+    """
+    ordering = ('-pk',)
+    cursor_query_param = 'cursor'
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    invalid_cursor_message = "Curseur invalide."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.model = queryset.model
+        position, reverse = self.decode_cursor(request)
+
+        # Page précédente : lecture en sens inverse depuis la première ligne affichée
+        ordering = [self.flip(field) for field in self.ordering] if reverse else list(self.ordering)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.after(ordering, position))
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.next_position = self.previous_position = None
+        if rows:
+            if has_more or reverse:
+                self.next_position = self.position(rows[-1])
+            if has_more if reverse else position is not None:
+                self.previous_position = self.position(rows[0])
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    @staticmethod
+    def flip(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def field_name(field):
+        return field.lstrip('-')
+
+    def get_field(self, field):
+        name = self.field_name(field)
+        return self.model._meta.pk if name == 'pk' else self.model._meta.get_field(name)
+
+    def position(self, instance):
+        return [
+            self.get_field(field).value_to_string(instance)
+            for field in self.ordering
+        ]
+
+    def after(self, ordering, position):
+        """
+        Condition « strictement après ``position`` » dans l'ordre ``ordering`` :
+        ``(a > x) OR (a = x AND b > y) OR ...``.
+        """
+        condition = Q()
+        for index, field in enumerate(ordering):
+            name = self.field_name(field)
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            equal = {self.field_name(previous): position[i] for i, previous in enumerate(ordering[:index])}
+            condition |= Q(**equal, **{f'{name}__{lookup}': position[index]})
+        # Borne redondante sur la première colonne : permet un parcours
+        # d'index à partir de la position plutôt que depuis le début
+        first = ordering[0]
+        lookup = 'lte' if first.startswith('-') else 'gte'
+        return Q(**{f'{self.field_name(first)}__{lookup}': position[0]}) & condition
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            values, reverse = data['p'], bool(data.get('r'))
+            if len(values) != len(self.ordering):
+                raise ValueError
+            position = [
+                self.get_field(field).to_python(value)
+                for field, value in zip(self.ordering, values)
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, position, reverse=False):
+        data = {'p': position}
+        if reverse:
+            data['r'] = 1
+        encoded = force_str(base64.urlsafe_b64encode(json.dumps(data).encode()))
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position)
+
+    def get_previous_link(self):
+        if self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+    def get_paginated_response(self, data):
+        return CustomResponse.response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'status_code': {'type': 'integer'},
+                'body': {
+                    'type': 'object',
+                    'required': ['results'],
+                    'properties': {
+                        'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                        'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                        'results': schema,
+                    },
+                },
+            },
+        }
+
+
+class UserKeysetPagination(KeysetPagination):
+    """Utilisateurs du plus récent au plus ancien (index ``user_registered_idx``)."""
+    ordering = ('-user_registered_at', '-id')
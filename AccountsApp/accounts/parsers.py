@@ -0,0 +1,43 @@
+# accounts/parsers.py
+import codecs
+import io
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    orjson = None
+
+
+def is_utf8(encoding):
+    try:
+        return codecs.lookup(encoding).name == 'utf-8'
+    except LookupError:
+        return False
+
+
+class FastJSONParser(JSONParser):
+    """
+    ``JSONParser`` s'appuyant sur orjson lorsqu'il est installé (sinon le
+    module ``json`` standard, via DRF). Un corps UTF-8 est décodé directement
+    depuis les octets reçus, sans conversion préalable en ``str``.
+
+    Le résultat est celui de DRF : un autre ``charset`` de la requête, ainsi
+    que ``STRICT_JSON = False`` (``NaN``/``Infinity`` acceptés), passent par
+    DRF, tout comme un corps refusé par orjson, pour le même message d'erreur.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or not self.strict or not is_utf8(encoding):
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            # Erreur (ou constante refusée par STRICT_JSON) telle que DRF la signale
+            return super().parse(io.BytesIO(body), media_type, parser_context)
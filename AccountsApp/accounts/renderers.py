@@ -0,0 +1,69 @@
+# accounts/renderers.py
+import math
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    orjson = None
+
+
+# Types sans flottant à vérifier
+SCALARS = frozenset((str, int, bool, type(None)))
+
+
+def has_non_finite(data):
+    """
+    Vrai si ``data`` contient un flottant ``NaN`` ou infini. Les conteneurs
+    ne contenant que des scalaires (cas courant : lignes d'une liste) sont
+    écartés d'un seul test.
+    """
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+            continue
+        if not isinstance(value, (dict, list, tuple)):
+            continue
+        values = value.values() if isinstance(value, dict) else value
+        if not SCALARS.issuperset(map(type, values)):
+            stack.extend(values)
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` s'appuyant sur orjson lorsqu'il est installé (sinon le
+    module ``json`` standard, via DRF).
+
+    La sortie est la même que celle de DRF : les types qu'orjson ne connaît
+    pas, ainsi que les dates (format de DRF), passent par l'encodeur de DRF.
+    orjson écrit ``NaN`` et l'infini en ``null`` : une sortie contenant
+    ``null`` est vérifiée et, s'il y en a, rendue par DRF (``ValueError``
+    sous ``STRICT_JSON``, ``NaN`` sinon). Les réglages qu'orjson ne sait pas
+    reproduire (``UNICODE_JSON``/``COMPACT_JSON`` désactivés, indentation
+    autre que 2) passent aussi par DRF.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        indent = self.get_indent(accepted_media_type or '', renderer_context or {})
+        if orjson is None or self.ensure_ascii or not self.compact or indent not in (None, 2):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        ret = orjson.dumps(data, default=JSONEncoder().default, option=options)
+        if b'null' in ret and has_non_finite(data):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Comme DRF : séparateurs de ligne échappés pour l'inclusion dans du JavaScript
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -0,0 +1,196 @@
+# accounts/revocation.py
+import hashlib
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connection
+from django.utils.timezone import now
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    Filtre de Bloom en mémoire sur des chaînes.
+
+    ``might_contain`` ne renvoie jamais de faux négatif ; le taux de faux
+    positifs reste proche de ``error_rate`` tant que le nombre d'éléments
+    ne dépasse pas ``capacity``.
+    """
+
+    def __init__(self, capacity=1_000_000, error_rate=0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value):
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, value):
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def might_contain(self, value):
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class RevocationStore:
+    """
+    Liste des tokens JWT révoqués, indexée par ``jti``.
+
+    Le cas courant (« non révoqué ») est tranché par le filtre de Bloom, sans
+    aucune E/S ni verrou ; seule une correspondance possible interroge la
+    table ``RevokedToken``. Tant que le filtre n'est pas chargé, chaque
+    vérification interroge la table.
+
+    Le chargement, la synchronisation et la purge sont faits par un unique
+    thread d'arrière-plan par processus, démarré au premier appel de
+    ``is_revoked`` (et redémarré dans un processus issu d'un ``fork``) : le
+    chemin de la requête ne fait jamais de requête SQL de maintenance.
+    Toutes les ``sync_interval`` secondes, le filtre intègre les révocations
+    des autres processus, en relisant les lignes révoquées depuis la
+    dernière synchronisation moins ``sync_margin`` secondes (les transactions
+    concurrentes ne sont pas validées dans l'ordre de leurs clés primaires).
+    Toutes les ``prune_interval`` secondes, les lignes expirées sont
+    supprimées et un nouveau filtre est construit puis substitué à l'ancien.
+
+    Un token révoqué par un autre processus est donc encore accepté pendant
+    au plus ``sync_interval`` secondes (plus la durée d'une synchronisation) ;
+    le processus qui a traité la révocation le refuse immédiatement.
+    """
+
+    def __init__(self, capacity=1_000_000, error_rate=0.001, sync_interval=5, sync_margin=60,
+                 prune_interval=3600):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.sync_margin = timedelta(seconds=sync_margin)
+        self.prune_interval = prune_interval
+        self._bloom = None
+        # Protège les ajouts au filtre et la substitution d'un nouveau filtre
+        self._lock = threading.Lock()
+        self._refresher = None
+        self._refresher_lock = threading.Lock()
+        self._stopped = threading.Event()
+        # Révocations locales faites pendant la construction d'un nouveau filtre
+        self._pending = None
+        self._synced_at = None
+        self._next_prune = 0.0
+
+    def revoke(self, token):
+        """Révoque un token (access ou refresh) jusqu'à son expiration."""
+        jti = token[api_settings.JTI_CLAIM]
+        expires_at = datetime.fromtimestamp(token['exp'], tz=dt_timezone.utc)
+        RevokedToken.objects.get_or_create(jti=jti, defaults={'expires_at': expires_at})
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+            if self._pending is not None:
+                self._pending.append(jti)
+
+    def is_revoked(self, token):
+        refresher = self._refresher
+        if refresher is None or not refresher.is_alive():
+            self._start_refresher()
+        jti = token.get(api_settings.JTI_CLAIM)
+        if jti is None:
+            return False
+        bloom = self._bloom
+        if bloom is not None and not bloom.might_contain(jti):
+            return False
+        return RevokedToken.objects.filter(jti=jti).exists()
+
+    def _start_refresher(self):
+        """Démarre le thread de synchronisation, sauf s'il tourne déjà ou a été arrêté."""
+        with self._refresher_lock:
+            if self._stopped.is_set() or (self._refresher is not None and self._refresher.is_alive()):
+                return
+            self._refresher = threading.Thread(target=self._run, name='token-revocation', daemon=True)
+            self._refresher.start()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self.refresh()
+            except Exception:
+                # Nouvel essai à la prochaine échéance
+                logger.exception("Échec de la synchronisation de la liste de révocation")
+            finally:
+                connection.close()
+            self._stopped.wait(self.sync_interval)
+
+    def stop(self):
+        """Arrête définitivement le thread de synchronisation et attend sa fin."""
+        self._stopped.set()
+        with self._refresher_lock:
+            refresher = self._refresher
+        if refresher is not None:
+            refresher.join()
+
+    def refresh(self):
+        """
+        Intègre au filtre les révocations récentes ; purge la table et
+        reconstruit le filtre si nécessaire. Appelée hors du chemin des
+        requêtes, toutes les ``sync_interval`` secondes (thread d'arrière-plan).
+        """
+        current = time.monotonic()
+        if self._bloom is None or current >= self._next_prune:
+            self.rebuild()
+            self._next_prune = current + self.prune_interval
+        else:
+            synced_at = now()
+            queryset = RevokedToken.objects.filter(revoked_at__gte=self._synced_at - self.sync_margin)
+            bloom = self._bloom
+            for jti in queryset.values_list('jti', flat=True).iterator():
+                bloom.add(jti)
+            self._synced_at = synced_at
+
+    def rebuild(self):
+        """Purge les révocations expirées et substitue un filtre reconstruit à l'ancien."""
+        RevokedToken.objects.filter(expires_at__lte=now()).delete()
+        with self._lock:
+            self._pending = []
+        synced_at = now()
+        bloom = BloomFilter(self.capacity, self.error_rate)
+        for jti in RevokedToken.objects.values_list('jti', flat=True).iterator():
+            bloom.add(jti)
+        with self._lock:
+            for jti in self._pending:
+                bloom.add(jti)
+            self._pending = None
+            self._bloom = bloom
+        self._synced_at = synced_at
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_revocation_store():
+    """
+    Renvoie la liste de révocation du processus, configurée par
+    ``settings.TOKEN_REVOCATION``.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                config = getattr(settings, 'TOKEN_REVOCATION', {})
+                _store = RevocationStore(
+                    capacity=config.get('BLOOM_CAPACITY', 1_000_000),
+                    error_rate=config.get('BLOOM_ERROR_RATE', 0.001),
+                    sync_interval=config.get('SYNC_INTERVAL', 5),
+                    sync_margin=config.get('SYNC_MARGIN', 60),
+                    prune_interval=config.get('PRUNE_INTERVAL', 3600),
+                )
+    return _store
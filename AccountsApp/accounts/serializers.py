@@ -1,14 +1,26 @@
 from rest_framework import serializers
-from .models import UserProfile, Address, UserModel, OTPRequest
+from .models import UserProfile, Address, UserModel, OTPRequest, ProfilePictureUpload
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_api_settings
+from django.contrib.auth.models import update_last_login
 from datetime import datetime
-from django.db.models import Sum
+from django.db.models import FileField, Sum
 from datetime import datetime, timedelta
 from django.conf import settings
-from .utils import get_otp_code
+from django.core.files.base import ContentFile
+from django.db import transaction
+from .otp import get_otp_backend
+from .outbox import enqueue_otp_email
+from .services import register_user
+from .images import current_renditions, get_rendition_pipeline, strip_metadata
+from . import batch, bulk, uploads
+from . import hashing
+from .revocation import get_revocation_store
 from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.settings import api_settings
 from django.utils.timezone import now
 
 
@@ -20,6 +32,9 @@ class AddressSerializer(serializers.ModelSerializer):
     
     Gère la sérialisation/désérialisation des informations d'adresse.
     """
+    # Représentation d'un profil sans adresse
+    EMPTY = {'country': '', 'city': '', 'postal_code': '', 'address': ''}
+
     class Meta:
         model = Address
         fields = ['country', 'city', 'postal_code', 'address']
@@ -41,7 +56,8 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
     Serializer pour l'inscription d'un nouvel utilisateur.
     
     Gère la validation des données d'inscription, notamment la correspondance
-    des mots de passe et la vérification d'unicité de l'email.
+    des mots de passe. L'unicité de l'email est vérifiée à l'insertion par
+    ``accounts.services.register_user``.
     """
     password = serializers.CharField(write_only=True, required=True, style={'input_type': 'password'})
     password2 = serializers.CharField(write_only=True, required=True, style={'input_type': 'password'})
@@ -57,31 +73,21 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Les mots de passe doivent correspondre.")
         return data
 
-    def validate_email(self, value):
-        """Vérifie que l'email n'est pas déjà utilisé."""
-        if UserModel.objects.filter(email=value).exists():
-            raise serializers.ValidationError("Cet email existe déjà. Connectez vous.")
-        return value
-
     def create(self, validated_data):
         """
         Crée un nouvel utilisateur et génère un code OTP pour la vérification.
         
         L'email est également utilisé comme nom d'utilisateur.
         """
-        validated_data.pop('password2')
-        validated_data['username'] = validated_data['email']
-        user = UserModel.objects.create_user(**validated_data)
-
-        # Générer l'OTP après création
-        otp_code, expiry_time = get_otp_code(minutes=60)
-        OTPRequest.objects.create(
-            user=user,
-            otp_code=otp_code,
-            expiry_time=expiry_time,
-            purpose='register'
+        # Le hash peut avoir été calculé en amont par la vue (pool de hachage)
+        password_hash = validated_data.get('password_hash') or hashing.make_password(validated_data['password'])
+        return register_user(
+            email=validated_data['email'],
+            first_name=validated_data['first_name'],
+            last_name=validated_data['last_name'],
+            password_hash=password_hash,
+            password=validated_data['password'],
         )
-        return user
 
 
 class UserUpdateSerializer(serializers.ModelSerializer):
@@ -96,41 +102,173 @@ class UserUpdateSerializer(serializers.ModelSerializer):
     last_name = serializers.CharField(source='user.last_name', required=False)
     email = serializers.EmailField(source='user.email', read_only=True)
     profile_picture = serializers.ImageField(required=False, allow_null=True)
+    profile_picture_renditions = serializers.SerializerMethodField()
     telephone_number = serializers.CharField(source='user.telephone_number', required=False)
     address = AddressSerializer(required=False)
 
     class Meta:
         model = UserProfile
-        fields = ['first_name', 'last_name', 'email', 'profile_picture', 
+        fields = ['first_name', 'last_name', 'email', 'profile_picture', 'profile_picture_renditions',
                   'telephone_number', 'address']
+
+    def get_profile_picture_renditions(self, instance):
+        """URLs des déclinaisons réduites de la photo, par taille (vide tant qu'elles sont en cours)."""
+        storage = instance.profile_picture.storage
+        request = self.context.get('request')
+        urls = {}
+        for size, name in current_renditions(instance).items():
+            url = storage.url(name)
+            urls[size] = request.build_absolute_uri(url) if request is not None else url
+        return urls
+
+    def validate_profile_picture(self, value):
+        """Photo enregistrée sans ses métadonnées (EXIF, dont la position GPS)."""
+        if value is None:
+            return value
+        return ContentFile(strip_metadata(value), name=value.name)
     
+    @staticmethod
+    def assign_changed(obj, data):
+        """
+        Affecte ``data`` à ``obj`` et renvoie la liste des champs dont la
+        valeur a réellement changé.
+        """
+        changed = []
+        for attr, value in data.items():
+            field = obj._meta.get_field(attr)
+            if isinstance(field, FileField):
+                # Un nouveau fichier est toujours une modification ; None n'en
+                # est une que si une photo était présente
+                if value is None and not getattr(obj, attr):
+                    continue
+            elif field.value_from_object(obj) == value:
+                continue
+            setattr(obj, attr, value)
+            changed.append(attr)
+        return changed
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Profil sans adresse : même forme de réponse, sans requête
+        if data.get('address') is None:
+            data['address'] = dict(AddressSerializer.EMPTY)
+        return data
+
     def update(self, instance, validated_data):
         """
         Met à jour les informations de l'utilisateur, son adresse et son profil.
         
-        Gère la mise à jour des différentes entités liées à un utilisateur.
+        Seuls les modèles modifiés sont enregistrés, avec leurs seuls champs
+        modifiés (``update_fields``), dans une même transaction : un PATCH
+        sans changement n'écrit rien. L'adresse est créée à sa première
+        saisie non vide.
         """
-        # Update user fields
         user_data = validated_data.pop('user', {})
-        for attr, value in user_data.items():
-            setattr(instance.user, attr, value)
-        instance.user.save()
-
-        # Update address
-        address_data = validated_data.pop('address', None)
-        if address_data:
-            for attr, value in address_data.items():
-                setattr(instance.address, attr, value)
-            instance.address.save()
-
-        # Update UserProfile fields directement
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
+        address_data = validated_data.pop('address', None) or {}
+
+        address = instance.address
+        if address is None:
+            address = Address(**AddressSerializer.EMPTY)
+        user_fields = self.assign_changed(instance.user, user_data)
+        address_fields = self.assign_changed(address, address_data)
+        profile_fields = self.assign_changed(instance, validated_data)
+
+        if user_fields or address_fields or profile_fields:
+            with transaction.atomic():
+                if user_fields:
+                    instance.user.save(update_fields=user_fields)
+                if address_fields and address.pk is None:
+                    address.save(force_insert=True)
+                    instance.address = address
+                    profile_fields.append('address')
+                elif address_fields:
+                    address.save(update_fields=address_fields)
+                if profile_fields:
+                    instance.save(update_fields=profile_fields)
+
+                # Nouvelle photo : déclinaisons générées en arrière-plan
+                if 'profile_picture' in profile_fields:
+                    get_rendition_pipeline().schedule(instance)
 
         return instance
 
 
+class ProfilePictureUploadSerializer(serializers.ModelSerializer):
+    """
+    Serializer pour l'ouverture d'un envoi fractionné de photo de profil.
+
+    Vérifie la taille annoncée et le type de l'image avant tout envoi.
+    """
+    upload_id = serializers.UUIDField(source='id', read_only=True)
+
+    class Meta:
+        model = ProfilePictureUpload
+        fields = ['upload_id', 'content_type', 'size', 'offset']
+        read_only_fields = ['offset']
+
+    def validate_content_type(self, value):
+        if uploads.content_type_extension(value) is None:
+            raise serializers.ValidationError("Type d'image non accepté (JPEG, PNG, GIF ou WebP).")
+        return value
+
+    def validate_size(self, value):
+        max_size = uploads.upload_settings()['MAX_SIZE']
+        if not 0 < value <= max_size:
+            raise serializers.ValidationError(f"La taille doit être comprise entre 1 et {max_size} octets.")
+        return value
+
+
+class BulkUserActionSerializer(serializers.Serializer):
+    """
+    Serializer pour une action en masse sur des comptes (personnel).
+
+    ``action`` parmi ``activate``, ``deactivate``, ``verify`` et
+    ``resend_otp`` ; les identifiants en double sont ignorés.
+    """
+    action = serializers.ChoiceField(choices=list(bulk.ACTIONS))
+    user_ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False)
+
+    def validate_user_ids(self, value):
+        max_users = bulk.bulk_settings()['MAX_USERS']
+        if len(value) > max_users:
+            raise serializers.ValidationError(f"Au plus {max_users} comptes par requête.")
+        return list(dict.fromkeys(value))
+
+
+class BatchItemSerializer(serializers.Serializer):
+    """Une sous-requête d'un appel ``batch/`` (chemin relatif à ``api/accounts/``)."""
+    method = serializers.ChoiceField(choices=['GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE'])
+    path = serializers.CharField()
+    body = serializers.JSONField(required=False, allow_null=True)
+    headers = serializers.DictField(child=serializers.CharField(), required=False)
+
+    def validate_headers(self, value):
+        refused = [name for name in value if name.lower() in batch.IDENTITY_HEADERS]
+        if refused:
+            raise serializers.ValidationError(
+                f"En-têtes non autorisés : {', '.join(refused)} (ceux de l'appel batch/ sont utilisés)."
+            )
+        return value
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    """
+    Serializer pour les requêtes groupées.
+
+    ``parallel`` autorise l'exécution simultanée des lectures consécutives ;
+    l'ordre des écritures, et des lectures par rapport aux écritures, est
+    toujours celui de la liste.
+    """
+    requests = BatchItemSerializer(many=True, allow_empty=False)
+    parallel = serializers.BooleanField(default=False)
+
+    def validate_requests(self, value):
+        max_requests = batch.batch_settings()['MAX_REQUESTS']
+        if len(value) > max_requests:
+            raise serializers.ValidationError(f"Au plus {max_requests} sous-requêtes par appel.")
+        return value
+
+
 class ChangePasswordSerializer(serializers.Serializer):
     """
     Serializer pour le changement de mot de passe.
@@ -154,18 +292,30 @@ class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
         
         Vérifie que l'utilisateur existe, que son mot de passe est correct,
         que son compte est vérifié et actif avant de générer les tokens.
+
+        L'utilisateur n'est chargé qu'une fois, le mot de passe n'est haché
+        qu'une fois et une seule paire de tokens est émise : on n'appelle pas
+        ``super().validate()`` qui authentifierait une seconde fois.
         """
-        username = attrs.get(self.username_field)
-        password = attrs.get('password')
+        user = self.get_user(attrs)
+        password_ok = hashing.check_password(user, attrs.get('password'))
+        self.check_user(user, password_ok)
+        return self.get_token_data(user)
 
-        # Récupère l'utilisateur sans encore authentifier
+    def get_user(self, attrs):
+        """
+        Récupère l'utilisateur sans encore authentifier (``None`` s'il n'existe pas).
+        """
         try:
-            user = UserModel.objects.get(**{self.username_field: username})
-            # Vérification du mot de passe
-            if not user.check_password(password):
-                raise AuthenticationFailed("Identifiants invalides.")
+            return UserModel.objects.get(**{self.username_field: attrs.get(self.username_field)})
         except UserModel.DoesNotExist:
-            # Si l'utilisateur n'existe pas
+            return None
+
+    def check_user(self, user, password_ok):
+        """
+        Vérifie le résultat du contrôle du mot de passe et l'état du compte.
+        """
+        if user is None or not password_ok:
             raise AuthenticationFailed("Identifiants invalides.")
 
         # Vérifications supplémentaires
@@ -175,21 +325,40 @@ class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
         if not user.is_active:
             raise AuthenticationFailed("Votre compte a été desactivé, veuillez contacter les administrateurs du site.")
 
-        data = super().validate(attrs)
-        
-        # Récupération de l'utilisateur
-        user = self.user
+    def get_token_data(self, user):
+        """
+        Émet la paire de tokens et en dérive les dates d'expiration.
+        """
+        self.user = user
 
-        refresh = self.get_token(self.user)
+        refresh = self.get_token(user)
         access = refresh.access_token
 
-        # Conversion des timestamps en format ISO
-        data['access_token_expiration'] = datetime.fromtimestamp(access['exp']).isoformat()
-        data['refresh_token_expiration'] = datetime.fromtimestamp(refresh['exp']).isoformat()
+        data = {
+            'refresh': str(refresh),
+            'access': str(access),
+            # Conversion des timestamps en format ISO
+            'access_token_expiration': datetime.fromtimestamp(access['exp']).isoformat(),
+            'refresh_token_expiration': datetime.fromtimestamp(refresh['exp']).isoformat(),
+        }
+
+        if jwt_api_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, user)
 
         return data
 
 
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Serializer de rafraîchissement qui refuse les tokens révoqués à la déconnexion.
+    """
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        if get_revocation_store().is_revoked(refresh):
+            raise InvalidToken("Token révoqué.")
+        return super().validate(attrs)
+
+
 class OTPRequestSerializer(serializers.Serializer):
     """
     Serializer pour la demande de code OTP.
@@ -202,24 +371,16 @@ class OTPRequestSerializer(serializers.Serializer):
 
     def validate_email(self, value):
         """
-        Vérifie que l'email correspond à un utilisateur existant et que 
-        le nombre de demandes récentes ne dépasse pas la limite.
+        Vérifie que l'email correspond à un utilisateur existant.
+
+        Le nombre de demandes récentes est limité en amont par
+        ``OTPRequestRateThrottle`` (voir ``OTPRequestView``).
         """
         try:
-            user = UserModel.objects.get(email=value)
+            user = UserModel.objects.get_by_email(value)
         except UserModel.DoesNotExist:
             raise serializers.ValidationError("Aucun utilisateur associé à cet email.")
 
-        recent_otp_count = OTPRequest.objects.filter(
-            user=user,
-            created_at__gte=now() - timedelta(minutes=5),
-            used=False,
-            purpose=self.initial_data.get('purpose')
-        ).count()
-
-        if recent_otp_count >= 3:
-            raise serializers.ValidationError("Trop de demandes d'OTP récentes. Veuillez patienter avant de réessayer.")
-
         self.context['user'] = user
         return value
 
@@ -232,26 +393,10 @@ class OTPRequestSerializer(serializers.Serializer):
         user = self.context['user']
         purpose = validated_data['purpose']
 
-        # Invalider les OTP encore valides
-        OTPRequest.objects.filter(
-            user=user,
-            purpose=purpose,
-            used=False,
-            expiry_time__gt=now()
-        ).update(
-            used=True,
-            otp_code=None
-        )
-
-        # Générer un nouveau code OTP
-        otp_code, expiry_time = get_otp_code()
-
-        otp_request = OTPRequest.objects.create(
-            user=user,
-            otp_code=otp_code,
-            expiry_time=expiry_time,
-            purpose=purpose
-        )
+        # Le backend invalide les codes précédents et génère le nouveau
+        with transaction.atomic():
+            otp_request = get_otp_backend().issue(user, purpose)
+            enqueue_otp_email(otp_request)
         return otp_request
 
 
@@ -267,30 +412,38 @@ class CheckOTPSerializer(serializers.Serializer):
 
     def validate(self, data):
         """
-        Vérifie que l'email existe et que le code OTP est valide, 
-        non utilisé et non expiré.
+        Vérifie que l'email correspond à un utilisateur existant.
         """
         try:
-            user = UserModel.objects.get(email=data['email'])
+            user = UserModel.objects.get_by_email(data['email'])
         except UserModel.DoesNotExist:
             raise serializers.ValidationError("Aucun utilisateur associé à cet email.")
 
-        otp_request = OTPRequest.objects.filter(
-            user=user,
-            otp_code=data['otp'],
-            purpose=data['purpose'],
-            used=False,
-            expiry_time__gte=now()
-        ).first()
-
-        if not otp_request:
-            raise serializers.ValidationError("L'OTP renseigné n'est pas valide ou a expiré.")
-
-        # Stocker pour la vue
+        # Stocker pour la création
         self.user = user
-        self.otp_request = otp_request
         return data
 
+    def create(self, validated_data):
+        """
+        Consomme le code OTP s'il est valide, non utilisé et non expiré,
+        puis valide le compte s'il s'agit d'une inscription, dans la même
+        transaction.
+        """
+        user = self.user
+        purpose = validated_data['purpose']
+
+        with transaction.atomic():
+            if not get_otp_backend().consume(user, purpose, validated_data['otp']):
+                raise serializers.ValidationError(
+                    {api_settings.NON_FIELD_ERRORS_KEY: ["L'OTP renseigné n'est pas valide ou a expiré."]}
+                )
+
+            if purpose == 'register':
+                user.is_verify = True  # Valide le compte utilisateur
+                user.save(update_fields=['is_verify'])
+
+        return user
+
 
 class PasswordResetConfirmSerializer(serializers.Serializer):
     """
@@ -312,23 +465,15 @@ class PasswordResetConfirmSerializer(serializers.Serializer):
             raise serializers.ValidationError("Les mots de passe ne correspondent pas.")
 
         try:
-            user = UserModel.objects.get(email=data['email'])
+            user = UserModel.objects.get_by_email(data['email'])
         except UserModel.DoesNotExist:
             raise serializers.ValidationError("Aucun utilisateur associé à cet email.")
 
         # Vérifie l'OTP
-        otp_request = OTPRequest.objects.filter(
-            user=user,
-            purpose='reset_password',
-            used=True,
-            expiry_time__gte=now()
-        ).first()
-
-        if not otp_request:
+        if not get_otp_backend().has_verified(user, 'reset_password'):
             raise serializers.ValidationError("OTP invalide ou expiré.")
 
-        # Stocker l'user et l'otp_request pour la view
+        # Stocker l'user pour la view
         self.user = user
-        self.otp_request = otp_request
 
         return data
@@ -0,0 +1,43 @@
+# accounts/services.py
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+
+from .models import OutboxEmail, UserModel, UserProfile
+from .otp import get_otp_backend
+from .outbox import otp_email, welcome_email
+
+
+def register_user(email, first_name, last_name, password_hash, password=None):
+    """
+    Inscrit un utilisateur : compte, profil (sans adresse), OTP d'inscription
+    et emails (bienvenue, code OTP) en file d'envoi.
+
+    Tout est écrit dans une seule transaction, sans vérification préalable
+    de l'email : un doublon est détecté par la contrainte d'unicité de
+    ``username`` (égal à l'email). Le profil est créé ici plutôt que par le
+    signal ``post_save`` afin de grouper les deux emails dans un seul INSERT.
+    """
+    user = UserModel(
+        username=email,
+        first_name=first_name,
+        last_name=last_name,
+        telephone_number="",
+        email=email,
+        is_active=True,
+        password=password_hash,
+    )
+    user._password = password
+    # Le signal create_user_profile laisse ce travail à la fonction
+    user._profile_ready = True
+
+    try:
+        with transaction.atomic():
+            user.save(force_insert=True)
+            UserProfile.objects.create(user=user)
+
+            # Nouvel utilisateur : aucun code antérieur à invalider
+            otp_request = get_otp_backend().issue(user, 'register', minutes=60, invalidate=False)
+            OutboxEmail.objects.bulk_create([welcome_email(user), otp_email(otp_request)])
+    except IntegrityError:
+        raise serializers.ValidationError({'email': ["Cet email existe déjà. Connectez vous."]})
+    return user
@@ -1,70 +1,69 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
-from django.core.mail import send_mail
-from django.conf import settings
 from .models import UserProfile, Address
-
-# Pour les tâches asynchrones (importer si Celery est configuré)
-# from AccountsApp.celery import app
+from .cache import get_profile_cache, get_user_cache
+from .outbox import enqueue_welcome_email
 
 User = get_user_model()
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
     """
-    Signal pour créer automatiquement un profil utilisateur et une adresse vide
-    lorsqu'un nouvel utilisateur est créé.
+    Signal pour créer automatiquement un profil utilisateur lorsqu'un nouvel
+    utilisateur est créé. L'adresse n'est créée qu'à sa première saisie.
     
-    Peut également envoyer un email de bienvenue à l'utilisateur.
+    L'email de bienvenue est mis en file d'envoi dans la même transaction
+    (voir ``accounts.outbox`` et ``manage.py run_outbox``). Ignoré pour les
+    utilisateurs dont le profil est préparé par l'appelant
+    (``accounts.services.register_user``).
     """
-    if created:
-        # Création d'une adresse vide ou avec des valeurs par défaut
-        address = Address.objects.create(
-            country='',
-            city='',
-            postal_code=0,
-            address=''
-        )
-        UserProfile.objects.create(user=instance, address=address)
+    if created and not getattr(instance, '_profile_ready', False):
+        UserProfile.objects.create(user=instance)
         
-        # Envoi d'un email de bienvenue
-        # Pour un traitement synchrone (peut ralentir la réponse API) :
-        send_welcome_email(instance)
-        
-        # Pour un traitement asynchrone avec Celery (recommandé en production) :
-        # send_welcome_email.delay(instance.id)  # Utiliser l'ID plutôt que l'objet pour la sérialisation
+        # Email de bienvenue, envoyé par le worker de la file d'envoi
+        enqueue_welcome_email(instance)
 
 
-def send_welcome_email(user):
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, update_fields=None, **kwargs):
     """
-    Envoie un email de bienvenue à l'utilisateur nouvellement inscrit.
-    
-    Cette fonction peut être transformée en tâche Celery pour un traitement asynchrone.
+    Retire l'utilisateur du cache d'authentification (``UserCache``).
+
+    Toute modification invalide l'entrée (is_active, is_verify, mot de passe
+    et les autres colonnes mises en cache), sauf la simple mise à jour de
+    ``last_login`` effectuée à chaque connexion.
     """
-    subject = 'Bienvenue sur notre plateforme !'
-    message = f'Bonjour {user.first_name or user.email},\n\n' \
-              f'Merci de vous être inscrit sur notre plateforme. ' \
-              f'Votre compte a été créé avec succès.\n\n' \
-              f'Cordialement,\nL\'équipe de notre application'
-    
-    send_mail(
-        subject=subject,
-        message=message,
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        recipient_list=[user.email],
-        fail_silently=False,
-    )
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    get_user_cache().invalidate(instance.pk)
 
-# Exemple de décorateur Celery pour transformer cette fonction en tâche asynchrone
-# @app.task
-# def send_welcome_email_async(user_id):
-#     """
-#     Version asynchrone de l'envoi d'email de bienvenue.
-#     Récupère l'utilisateur par son ID pour éviter les problèmes de sérialisation.
-#     """
-#     try:
-#         user = User.objects.get(id=user_id)
-#         send_welcome_email(user)
-#     except User.DoesNotExist:
-#         logger.error(f"Impossible d'envoyer l'email de bienvenue: Utilisateur {user_id} non trouvé")
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user_profile(sender, instance, update_fields=None, **kwargs):
+    """Renouvelle la version (ETag) du profil sérialisé de l'utilisateur."""
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    get_profile_cache().invalidate(instance.pk)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_cached_profile(sender, instance, **kwargs):
+    get_profile_cache().invalidate(instance.user_id)
+
+
+@receiver(post_save, sender=Address)
+@receiver(post_delete, sender=Address)
+def invalidate_cached_address(sender, instance, created=False, **kwargs):
+    # Une adresse tout juste créée n'est encore rattachée à aucun profil
+    if created:
+        return
+    cache = get_profile_cache()
+    # Cache désactivé : inutile de chercher les profils concernés
+    if not cache.enabled:
+        return
+    for user_id in UserProfile.objects.filter(address=instance).values_list('user_id', flat=True):
+        cache.invalidate(user_id)
@@ -0,0 +1,6 @@
+from accounts.revocation import get_revocation_store
+
+# Pas de synchronisation en arrière-plan pendant les tests : elle écrirait dans
+# la base de test en même temps qu'eux. Sans filtre de Bloom, chaque contrôle
+# de révocation interroge la table RevokedToken.
+get_revocation_store().stop()
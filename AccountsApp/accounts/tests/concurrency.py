@@ -0,0 +1,48 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+
+from django.db import connection
+from django.test import TransactionTestCase
+
+
+class ConcurrentTransactionTestCase(TransactionTestCase):
+    """
+    ``TransactionTestCase`` dont les threads travaillent chacun sur leur
+    propre connexion.
+
+    La base de test SQLite en mémoire refuse les écritures concurrentes
+    (« database table is locked ») : le temps de la classe, elle est copiée
+    dans un fichier temporaire, hors du dépôt, supprimé à la fin. Les autres
+    bases sont utilisées telles quelles.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            cls._use_file_database()
+        super().setUpClass()
+
+    @classmethod
+    def _use_file_database(cls):
+        directory = tempfile.mkdtemp(prefix='accounts-tests-')
+        path = os.path.join(directory, 'test.sqlite3')
+        connection.ensure_connection()
+        # Connexion gardée ouverte : la base en mémoire disparaît avec la dernière
+        memory = connection.connection
+        target = sqlite3.connect(path)
+        memory.backup(target)
+        target.close()
+
+        name = connection.settings_dict['NAME']
+        connection.connection = None
+        connection.settings_dict['NAME'] = path
+
+        def restore():
+            connection.close()
+            connection.settings_dict['NAME'] = name
+            connection.connection = memory
+            shutil.rmtree(directory, ignore_errors=True)
+
+        cls.addClassCleanup(restore)
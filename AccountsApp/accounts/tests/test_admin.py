@@ -0,0 +1,86 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from accounts.admin import EstimatedCountPaginator, UserModelAdmin
+from accounts.models import UserModel
+
+
+def create_users(count, start=0):
+    return [
+        UserModel.objects.create_user(
+            username=f'user{index}@example.com', first_name='Jean', last_name='Dupont',
+            email=f'user{index}@example.com', password='Secr3t!pass',
+        )
+        for index in range(start, start + count)
+    ]
+
+
+class EstimatedCountPaginatorTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        create_users(5)
+
+    def test_unfiltered_count_is_cached(self):
+        paginator = EstimatedCountPaginator(UserModel.objects.order_by('-pk'), 2)
+        with self.assertNumQueries(1):
+            self.assertEqual(paginator.count, 5)
+        self.assertTrue(paginator.estimated)
+
+        create_users(1, start=5)
+        with self.assertNumQueries(0):
+            self.assertEqual(EstimatedCountPaginator(UserModel.objects.order_by('-pk'), 2).count, 5)
+
+    @override_settings(ADMIN_CHANGELIST={'FILTERED_COUNT_LIMIT': 3})
+    def test_filtered_count_is_bounded(self):
+        paginator = EstimatedCountPaginator(UserModel.objects.filter(is_active=True).order_by('-pk'), 2)
+        self.assertEqual(paginator.count, 3)
+        self.assertTrue(paginator.estimated)
+
+        paginator = EstimatedCountPaginator(UserModel.objects.filter(username='user1@example.com').order_by('-pk'), 2)
+        self.assertEqual(paginator.count, 1)
+        self.assertFalse(paginator.estimated)
+
+
+@mock.patch.object(UserModelAdmin, 'list_per_page', 2)
+class KeysetChangeListTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        admin = UserModel.objects.create_superuser(username='admin@example.com', password='Secr3t!pass')
+        self.client.force_login(admin)
+        self.users = create_users(4)
+        self.url = reverse('admin:accounts_usermodel_changelist')
+
+    def test_pages_follow_the_primary_key(self):
+        expected = sorted(UserModel.objects.values_list('pk', flat=True), reverse=True)
+        seen = []
+        params = {}
+        while True:
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 200)
+            changelist = response.context['cl']
+            self.assertTrue(changelist.keyset)
+            seen.extend(user.pk for user in changelist.result_list)
+            if changelist.next_cursor is None:
+                break
+            self.assertContains(response, f'after={changelist.next_cursor}')
+            params = {'after': changelist.next_cursor}
+        self.assertEqual(seen, expected)
+
+    def test_sorting_on_a_column_uses_page_numbers(self):
+        response = self.client.get(self.url, {'o': '1'})
+        self.assertFalse(response.context['cl'].keyset)
+        self.assertTrue(response.context['cl'].multi_page)
+
+    def test_invalid_cursor_redirects(self):
+        for cursor in ('abc', '1.5', '-3', ' 4', '99999999999999999999999'):
+            with self.subTest(cursor=cursor):
+                response = self.client.get(self.url, {'after': cursor})
+                self.assertEqual(response.status_code, 302)
+                self.assertIn('e=1', response['Location'])
@@ -0,0 +1,75 @@
+from unittest import mock
+
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.cache import LRUCache
+from accounts.models import UserModel
+
+
+class CachedTokenRejectionTests(APITestCase):
+    """
+    Un token déjà vérifié reste dans le cache des tokens jusqu'à son ``exp`` :
+    révocation et état du compte doivent être contrôlés à chaque requête,
+    après la lecture du cache.
+    """
+
+    def setUp(self):
+        self.user = UserModel.objects.create_user(
+            username='jean@example.com', first_name='Jean', last_name='Dupont',
+            email='jean@example.com', password='Secr3t!pass',
+        )
+        self.refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.refresh.access_token}')
+        self.token_cache = LRUCache()
+        patcher = mock.patch('accounts.authentication.get_token_cache', return_value=self.token_cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def assertTokenCached(self):
+        self.assertEqual(self.client.get(reverse('profile')).status_code, 200)
+        self.assertEqual(self.client.get(reverse('profile')).status_code, 200)
+        self.assertEqual(len(self.token_cache), 1)
+        self.assertEqual(self.token_cache.stats()['hits'], 1)
+
+    def test_rejected_after_logout(self):
+        self.assertTokenCached()
+        response = self.client.post(reverse('logout'), {'refresh': str(self.refresh)}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(reverse('profile')).status_code, 401)
+        self.assertEqual(len(self.token_cache), 0)
+
+    def test_rejected_after_deactivation(self):
+        self.assertTokenCached()
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(reverse('profile')).status_code, 401)
+
+
+class AuthenticationCacheStatsTests(APITestCase):
+
+    def setUp(self):
+        self.user = UserModel.objects.create_user(
+            username='jean@example.com', first_name='Jean', last_name='Dupont',
+            email='jean@example.com', password='Secr3t!pass',
+        )
+
+    def test_staff_only(self):
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get(reverse('auth-cache-stats')).status_code, 403)
+
+    def test_stats_are_served_to_staff(self):
+        self.user.is_staff = True
+        self.user.save()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        token_cache = LRUCache()
+        with mock.patch('accounts.authentication.get_token_cache', return_value=token_cache), \
+                mock.patch('accounts.views.get_token_cache', return_value=token_cache):
+            self.client.get(reverse('auth-cache-stats'))
+            response = self.client.get(reverse('auth-cache-stats'))
+        self.assertEqual(response.status_code, 200)
+        body = response.json()['body']
+        self.assertEqual((body['tokens']['hits'], body['tokens']['misses']), (1, 1))
+        self.assertIn('hit_rate', body['users'])
+        self.assertIn('pid', body)
@@ -0,0 +1,103 @@
+from django.urls import reverse
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.models import UserModel
+from accounts.throttling import get_rate_limiter
+
+from .concurrency import ConcurrentTransactionTestCase
+
+
+def create_user(**values):
+    return UserModel.objects.create_user(
+        username='jean@example.com', first_name='Jean', last_name='Dupont',
+        email='jean@example.com', password='Secr3t!pass', **values,
+    )
+
+
+def first_names(responses):
+    return [response['body']['body']['first_name'] for response in responses if response['status'] == 200]
+
+
+class BatchAuthenticationTests(APITestCase):
+    """Chaque sous-requête est authentifiée et autorisée par sa propre vue."""
+
+    def setUp(self):
+        get_rate_limiter.cache_clear()
+        self.user = create_user()
+        self.refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.refresh.access_token}')
+
+    def batch(self, *requests, parallel=False):
+        return self.client.post(reverse('batch'), {'requests': list(requests), 'parallel': parallel}, format='json')
+
+    def statuses(self, response):
+        self.assertEqual(response.status_code, 200)
+        return [item['status'] for item in response.json()['body']['responses']]
+
+    def test_unauthenticated_call_is_refused(self):
+        self.client.credentials()
+        self.assertEqual(self.batch({'method': 'GET', 'path': 'profile/'}).status_code, 401)
+
+    def test_permissions_apply_per_item(self):
+        response = self.batch({'method': 'GET', 'path': 'profile/'}, {'method': 'GET', 'path': 'users/'})
+        self.assertEqual(self.statuses(response), [200, 403])
+
+    def test_revoked_token_is_refused_per_item(self):
+        # Déconnexion au milieu du batch : les sous-requêtes suivantes sont refusées
+        response = self.batch(
+            {'method': 'GET', 'path': 'profile/'},
+            {'method': 'POST', 'path': 'logout/', 'body': {}},
+            {'method': 'GET', 'path': 'profile/'},
+        )
+        self.assertEqual(self.statuses(response), [200, 200, 401])
+
+    def test_identity_headers_cannot_be_overridden(self):
+        response = self.batch({'method': 'GET', 'path': 'profile/', 'headers': {'Authorization': 'Bearer autre'}})
+        self.assertEqual(response.status_code, 400)
+
+    def test_nested_batch_is_rejected(self):
+        response = self.batch(
+            {'method': 'POST', 'path': 'batch/', 'body': {'requests': [{'method': 'GET', 'path': 'profile/'}]}},
+            {'method': 'GET', 'path': 'profile/'},
+        )
+        self.assertEqual(self.statuses(response), [400, 200])
+
+    def test_unknown_route(self):
+        self.assertEqual(self.statuses(self.batch({'method': 'GET', 'path': 'inconnue/'})), [404])
+
+    def test_token_refresh_and_profile(self):
+        response = self.batch(
+            {'method': 'POST', 'path': 'token/refresh/', 'body': {'refresh': str(self.refresh)}},
+            {'method': 'GET', 'path': 'profile/'},
+        )
+        self.assertEqual(self.statuses(response), [200, 200])
+        self.assertIn('access', response.json()['body']['responses'][0]['body'])
+
+    def test_mutations_run_in_list_order(self):
+        response = self.batch(
+            {'method': 'GET', 'path': 'profile/'},
+            {'method': 'PATCH', 'path': 'profile/', 'body': {'first_name': 'Paul'}},
+            {'method': 'GET', 'path': 'profile/'},
+            parallel=True,
+        )
+        self.assertEqual(self.statuses(response), [200, 200, 200])
+        self.assertEqual(first_names(response.json()['body']['responses']), ['Jean', 'Paul', 'Paul'])
+
+
+class ParallelBatchOrderingTests(ConcurrentTransactionTestCase):
+    """Les lectures parallèles ne franchissent jamais une écriture."""
+
+    def setUp(self):
+        get_rate_limiter.cache_clear()
+        self.client = APIClient()
+        user = create_user()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+
+    def test_reads_wait_for_preceding_write(self):
+        read = {'method': 'GET', 'path': 'profile/'}
+        requests = [read, read, {'method': 'PATCH', 'path': 'profile/', 'body': {'first_name': 'Paul'}}, read, read]
+        response = self.client.post(reverse('batch'), {'requests': requests, 'parallel': True}, format='json')
+        responses = response.json()['body']['responses']
+        self.assertEqual([item['status'] for item in responses], [200] * 5)
+        self.assertEqual(first_names(responses), ['Jean', 'Jean', 'Paul', 'Paul', 'Paul'])
@@ -0,0 +1,123 @@
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.timezone import now
+from rest_framework.test import APIClient
+
+from accounts import bulk
+from accounts.models import BulkActionJob, UserModel
+
+from .concurrency import ConcurrentTransactionTestCase
+
+
+@override_settings(BULK_ACTIONS={'BATCH_SIZE': 2, 'BACKGROUND_ABOVE': 2})
+class BackgroundBulkActionTests(ConcurrentTransactionTestCase):
+    """L'état d'une action en arrière-plan est enregistré en base."""
+
+    def setUp(self):
+        self.staff = UserModel.objects.create_user(
+            username='staff@example.com', first_name='Admin', last_name='Staff',
+            email='staff@example.com', password='Secr3t!pass',
+        )
+        self.staff.is_staff = True
+        self.staff.save(update_fields=['is_staff'])
+        self.user_ids = [
+            UserModel.objects.create_user(
+                username=f'user{index}@example.com', first_name='Jean', last_name='Dupont',
+                email=f'user{index}@example.com', password='Secr3t!pass',
+            ).pk
+            for index in range(5)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.staff)
+
+    def test_job_status_is_persisted(self):
+        response = self.client.post(reverse('bulk-user-action'), {'action': 'verify', 'user_ids': self.user_ids},
+                                    format='json')
+        self.assertEqual(response.status_code, 202)
+        job_id = response.json()['body']['job_id']
+        self.assertEqual(response['Location'], reverse('bulk-user-action-status', args=[job_id]))
+
+        for _ in range(100):
+            job = self.client.get(response['Location']).json()['body']
+            if job['status'] == 'done':
+                break
+            time.sleep(0.05)
+        self.assertEqual(job, {
+            'job_id': job_id, 'action': 'verify', 'status': 'done', 'total': 5, 'done': 5, 'changed': 5,
+            'requested_by': self.staff.pk, 'error': None,
+        })
+        self.assertTrue(BulkActionJob.objects.filter(pk=job_id, status=BulkActionJob.DONE).exists())
+        self.assertEqual(UserModel.objects.filter(pk__in=self.user_ids, is_verify=True).count(), 5)
+
+    def test_unknown_job(self):
+        for job_id in ('0' * 32, 'not-a-job'):
+            response = self.client.get(reverse('bulk-user-action-status', args=[job_id]))
+            self.assertEqual(response.status_code, 404)
+
+
+@override_settings(BULK_ACTIONS={'BATCH_SIZE': 2})
+class StaleBulkJobTests(TestCase):
+    """Une tâche qui n'avance plus (processus arrêté) est passée en échec."""
+
+    def setUp(self):
+        self.runner = bulk.BulkActionRunner(stale_after=60)
+        self.addCleanup(self.runner.executor.shutdown)
+        self.user_ids = [
+            UserModel.objects.create(username=f'user{index}', email=f'user{index}@example.com',
+                                     first_name='Jean', last_name='Dupont', telephone_number='').pk
+            for index in range(5)
+        ]
+
+    def job(self, status=BulkActionJob.RUNNING, age=0):
+        job = BulkActionJob.objects.create(action='verify', total=len(self.user_ids), status=status)
+        BulkActionJob.objects.filter(pk=job.pk).update(updated_at=now() - timedelta(seconds=age))
+        return job
+
+    def test_status_fails_a_stale_job(self):
+        stale, fresh = self.job(age=120), self.job(age=10)
+
+        self.assertEqual(self.runner.status(stale.pk.hex)['status'], 'failed')
+        self.assertEqual(self.runner.status(stale.pk.hex)['error'], self.runner.STALE_ERROR)
+        self.assertEqual(self.runner.status(fresh.pk.hex)['status'], 'running')
+
+    def test_submit_fails_stale_jobs(self):
+        stale = self.job(status=BulkActionJob.PENDING, age=120)
+        done = self.job(status=BulkActionJob.DONE, age=120)
+
+        self.runner.submit('verify', self.user_ids)
+
+        self.assertEqual(BulkActionJob.objects.get(pk=stale.pk).status, BulkActionJob.FAILED)
+        self.assertEqual(BulkActionJob.objects.get(pk=done.pk).status, BulkActionJob.DONE)
+
+    def test_failed_job_is_not_started(self):
+        job = self.job(status=BulkActionJob.FAILED)
+        self.runner.run(job.pk, 'verify', self.user_ids)
+        self.assertFalse(UserModel.objects.filter(pk__in=self.user_ids, is_verify=True).exists())
+
+    def test_job_failed_while_running_stops_at_next_batch(self):
+        job = self.job(status=BulkActionJob.PENDING)
+        label, handler = bulk.ACTIONS['verify']
+
+        def verify_then_fail(user_ids):
+            changed = handler(user_ids)
+            BulkActionJob.objects.filter(pk=job.pk).update(status=BulkActionJob.FAILED)
+            return changed
+
+        with mock.patch.dict(bulk.ACTIONS, {'verify': (label, verify_then_fail)}), \
+                self.assertLogs('accounts.bulk', 'WARNING'):
+            self.runner.run(job.pk, 'verify', self.user_ids)
+        self.assertEqual(UserModel.objects.filter(pk__in=self.user_ids, is_verify=True).count(), 2)
+        self.assertEqual(BulkActionJob.objects.get(pk=job.pk).status, BulkActionJob.FAILED)
+
+    def test_each_batch_refreshes_queued_jobs(self):
+        running, queued = self.job(status=BulkActionJob.PENDING), self.job(status=BulkActionJob.PENDING, age=50)
+        self.runner.queued.add(queued.pk)
+
+        self.runner.run(running.pk, 'verify', self.user_ids)
+
+        self.assertEqual(BulkActionJob.objects.get(pk=running.pk).status, BulkActionJob.DONE)
+        self.assertLess(now() - BulkActionJob.objects.get(pk=queued.pk).updated_at, timedelta(seconds=10))
@@ -0,0 +1,74 @@
+import importlib
+from datetime import timedelta
+
+from django.apps import apps
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase
+from django.utils.timezone import now
+
+from accounts.models import UserModel
+
+dedupe_emails = importlib.import_module('accounts.migrations.0008_dedupe_user_emails').dedupe_emails
+
+
+def create_user(username, email, **values):
+    return UserModel.objects.create(username=username, email=email, first_name='Jean', last_name='Dupont',
+                                    telephone_number='', **values)
+
+
+class EmailUniquenessTests(TestCase):
+
+    def test_emails_are_unique_regardless_of_case(self):
+        create_user('jean', 'jean@example.com')
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            create_user('jean2', 'Jean@Example.COM')
+
+    def test_missing_emails_are_not_unique(self):
+        create_user('a', None)
+        create_user('b', None)
+        self.assertEqual(UserModel.objects.filter(email__isnull=True).count(), 2)
+
+    def test_lookups_ignore_case_and_spaces(self):
+        user = create_user('jean', 'Jean@Example.com')
+        self.assertEqual(UserModel.objects.get_by_email('  jean@EXAMPLE.com '), user)
+        self.assertEqual(list(UserModel.objects.filter_by_emails(['JEAN@example.com', 'x@example.com'])), [user])
+
+    def test_lookup_uses_the_expression_index(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest("Plan d'exécution propre à SQLite")
+        queryset = UserModel.objects.filter_by_emails(['jean@example.com'])
+        self.assertIn('user_email_lower_uniq', queryset.explain())
+
+
+class DedupeEmailsMigrationTests(TestCase):
+    """Migration 0008 : prépare les données à la contrainte ``user_email_lower_uniq``."""
+
+    def setUp(self):
+        # Contrainte retirée le temps du test (rétablie par le rollback) pour créer des doublons
+        with connection.cursor() as cursor:
+            cursor.execute('DROP INDEX user_email_lower_uniq')
+
+    def test_keeps_one_account_per_email(self):
+        recent = now() - timedelta(days=1)
+        old_unverified = create_user('a', 'Foo@example.com')
+        verified = create_user('b', 'foo@example.com', is_verify=True)
+        logged_in = create_user('c', 'FOO@example.com', last_login=recent)
+        # Sans compte vérifié : le plus récemment connecté, puis le plus ancien
+        never_logged = create_user('d', 'bar@example.com')
+        recently_logged = create_user('e', 'BAR@example.com', last_login=recent)
+        first = create_user('f', 'baz@example.com')
+        second = create_user('g', 'Baz@example.com')
+        empty = create_user('h', '')
+        alone = create_user('i', 'Alone@example.com')
+
+        dedupe_emails(apps, None)
+
+        emails = dict(UserModel.objects.values_list('pk', 'email'))
+        self.assertEqual(emails[verified.pk], 'foo@example.com')
+        self.assertEqual(emails[recently_logged.pk], 'BAR@example.com')
+        self.assertEqual(emails[first.pk], 'baz@example.com')
+        self.assertEqual(emails[alone.pk], 'Alone@example.com')
+        for loser in (old_unverified, logged_in, never_logged, second, empty):
+            self.assertIsNone(emails[loser.pk])
+        # Les comptes écartés restent en base
+        self.assertEqual(UserModel.objects.count(), 9)
@@ -0,0 +1,35 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from accounts.filters import UserFilter
+from accounts.models import UserModel
+
+
+class EmailPrefixFilterTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        for email in ('Alice@example.com', 'alicia@example.com', 'alb@example.com', 'bob@example.com'):
+            UserModel.objects.create_user(username=email, first_name='A', last_name='B', email=email,
+                                          password='Secr3t!pass')
+
+    def filter_emails(self, prefix):
+        queryset = UserFilter({'email': prefix}, queryset=UserModel.objects.all()).qs
+        return sorted(queryset.values_list('email', flat=True))
+
+    def test_prefix_is_case_insensitive(self):
+        self.assertEqual(self.filter_emails('ALIC'), ['Alice@example.com', 'alicia@example.com'])
+        self.assertEqual(self.filter_emails('al'), ['Alice@example.com', 'alb@example.com', 'alicia@example.com'])
+        self.assertEqual(self.filter_emails('alice@example.com'), ['Alice@example.com'])
+        self.assertEqual(self.filter_emails('z'), [])
+
+    def test_prefix_uses_email_index(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest("Plan d'exécution vérifié sous SQLite.")
+        with CaptureQueriesContext(connection) as queries:
+            self.filter_emails('ali')
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + queries[-1]['sql'])
+            plan = ' '.join(str(column) for row in cursor.fetchall() for column in row)
+        self.assertIn('user_email_lower_uniq', plan)
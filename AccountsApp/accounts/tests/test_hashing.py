@@ -0,0 +1,43 @@
+from unittest import mock
+
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.hashing import PasswordHashingPool
+from accounts.models import UserModel
+
+
+class HashingPoolStatsTests(APITestCase):
+
+    def setUp(self):
+        self.user = UserModel.objects.create_user(
+            username='jean@example.com', first_name='Jean', last_name='Dupont',
+            email='jean@example.com', password='Secr3t!pass',
+        )
+
+    def test_staff_only(self):
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get(reverse('hashing-pool-stats')).status_code, 403)
+
+    def test_stats_are_served_to_staff(self):
+        self.user.is_staff = True
+        self.client.force_authenticate(self.user)
+        pool = PasswordHashingPool(max_workers=1, max_queue=1, log_interval=0)
+        pool.run(len, 'x')
+        with mock.patch('accounts.hashing.get_hashing_pool', return_value=pool):
+            response = self.client.get(reverse('hashing-pool-stats'))
+        self.assertEqual(response.status_code, 200)
+        body = response.json()['body']
+        self.assertEqual(body['submitted'], 1)
+        self.assertEqual(body['saturation'], 0.0)
+        self.assertIn('avg_queue_wait', body)
+        self.assertIn('pid', body)
+
+    def test_stats_are_logged_periodically(self):
+        pool = PasswordHashingPool(max_workers=1, max_queue=1, log_interval=60)
+        pool._next_log = 0  # Échéance atteinte
+        with self.assertLogs('accounts.hashing', 'INFO') as logs:
+            pool.run(len, 'x')
+            pool.run(len, 'y')
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("'submitted': 0", logs.output[0])
@@ -0,0 +1,171 @@
+import io
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework.test import APITestCase
+
+from accounts import images
+from accounts.models import UserModel, UserProfile
+
+
+def jpeg_with_exif(size=(120, 80)):
+    """JPEG « photo de téléphone » : appareil, position GPS et rotation EXIF."""
+    exif = Image.Exif()
+    exif[0x010F] = 'Appareil secret'  # Make
+    exif[0x0112] = 6  # Orientation : rotation de 90°
+    exif.get_ifd(0x8825)[2] = (48.0, 51.0, 24.0)  # GPSLatitude
+    buffer = io.BytesIO()
+    Image.new('RGB', size, (200, 30, 30)).save(buffer, 'JPEG', exif=exif)
+    return buffer.getvalue()
+
+
+def gif_with_comment():
+    frames = [Image.new('RGB', (32, 32), color) for color in ((255, 0, 0), (0, 255, 0), (0, 0, 255))]
+    buffer = io.BytesIO()
+    frames[0].save(buffer, 'GIF', save_all=True, append_images=frames[1:], duration=80, loop=0,
+                   comment=b'Appareil secret')
+    return buffer.getvalue()
+
+
+class MediaRootMixin:
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.mkdtemp(prefix='accounts-images-tests-')
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        overrides = override_settings(MEDIA_ROOT=self.directory)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.user = UserModel.objects.create_user(
+            username='jean@example.com', first_name='Jean', last_name='Dupont',
+            email='jean@example.com', password='Secr3t!pass',
+        )
+
+    def set_picture(self, content, name='photo.jpg'):
+        profile = UserProfile.objects.get(user=self.user)
+        profile.profile_picture.save(name, ContentFile(content), save=False)
+        UserProfile.objects.filter(pk=profile.pk).update(profile_picture=profile.profile_picture.name)
+        return UserProfile.objects.get(pk=profile.pk)
+
+    def open_stored(self, name):
+        storage = UserProfile._meta.get_field('profile_picture').storage
+        with storage.open(name, 'rb') as stored:
+            image = Image.open(io.BytesIO(stored.read()))
+            image.load()
+        return image
+
+
+class StripMetadataTests(TestCase):
+
+    def test_exif_is_dropped_and_orientation_applied(self):
+        image = Image.open(io.BytesIO(images.strip_metadata(io.BytesIO(jpeg_with_exif()))))
+        self.assertEqual(image.format, 'JPEG')
+        self.assertEqual(dict(image.getexif()), {})
+        # Rotation appliquée aux pixels
+        self.assertEqual(image.size, (80, 120))
+
+    def test_animated_gif_keeps_frames_without_comment(self):
+        content = images.strip_metadata(io.BytesIO(gif_with_comment()))
+        self.assertNotIn(b'Appareil secret', content)
+        image = Image.open(io.BytesIO(content))
+        self.assertEqual(image.format, 'GIF')
+        self.assertEqual(image.n_frames, 3)
+
+
+class ProfilePictureIngestTests(MediaRootMixin, APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch('accounts.serializers.get_rendition_pipeline')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client.force_authenticate(self.user)
+
+    def test_uploaded_picture_is_stored_without_exif(self):
+        picture = SimpleUploadedFile('photo.jpg', jpeg_with_exif(), content_type='image/jpeg')
+        response = self.client.patch(reverse('profile'), {'profile_picture': picture}, format='multipart')
+        self.assertEqual(response.status_code, 200)
+        profile = UserProfile.objects.get(user=self.user)
+        image = self.open_stored(profile.profile_picture.name)
+        self.assertEqual(dict(image.getexif()), {})
+        self.assertEqual(image.size, (80, 120))
+
+
+class RenditionPipelineTests(MediaRootMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.pipeline = images.RenditionPipeline(sizes=(16, 64), workers=1)
+        self.addCleanup(self.pipeline.executor.shutdown)
+
+    def test_process_stores_renditions_without_metadata(self):
+        profile = self.set_picture(jpeg_with_exif())
+        self.pipeline.process(profile.pk, profile.profile_picture.name)
+
+        profile.refresh_from_db()
+        self.assertEqual(set(images.current_renditions(profile)), {'16', '64'})
+        for size, name in images.current_renditions(profile).items():
+            rendition = self.open_stored(name)
+            self.assertEqual(rendition.format, 'WEBP')
+            self.assertEqual(max(rendition.size), int(size))
+            self.assertEqual(dict(rendition.getexif()), {})
+
+    def test_stale_series_is_discarded(self):
+        profile = self.set_picture(jpeg_with_exif())
+        stale_name = profile.profile_picture.name
+        newer = self.set_picture(jpeg_with_exif(), name='newer.jpg')
+
+        self.pipeline.process(newer.pk, stale_name)
+
+        newer.refresh_from_db()
+        self.assertEqual(newer.renditions, {})
+        names = images.rendition_names(stale_name, self.pipeline.sizes, 'WEBP')
+        storage = UserProfile._meta.get_field('profile_picture').storage
+        self.assertFalse(any(storage.exists(name) for name in names.values()))
+
+
+class RenderProfilePicturesCommandTests(MediaRootMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.pipeline = images.RenditionPipeline(sizes=(16, 64), workers=1)
+        self.addCleanup(self.pipeline.executor.shutdown)
+        patcher = mock.patch('accounts.management.commands.render_profile_pictures.get_rendition_pipeline',
+                             return_value=self.pipeline)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def call(self, *args):
+        out = io.StringIO()
+        call_command('render_profile_pictures', *args, stdout=out, stderr=io.StringIO())
+        return out.getvalue()
+
+    def test_backfills_missing_renditions_once(self):
+        profile = self.set_picture(jpeg_with_exif())
+
+        self.assertIn('1 photo(s) traitée(s), 0 en échec', self.call())
+        profile.refresh_from_db()
+        self.assertEqual(set(images.current_renditions(profile)), {'16', '64'})
+
+        self.assertIn('0 photo(s) traitée(s)', self.call())
+        self.assertIn('1 photo(s) traitée(s)', self.call('--all'))
+
+    def test_strip_metadata_rewrites_stored_originals(self):
+        profile = self.set_picture(jpeg_with_exif())
+        old_name = profile.profile_picture.name
+
+        self.assertIn('1 photo(s) traitée(s), 0 en échec', self.call('--strip-metadata'))
+
+        profile.refresh_from_db()
+        self.assertNotEqual(profile.profile_picture.name, old_name)
+        self.assertFalse(profile.profile_picture.storage.exists(old_name))
+        self.assertEqual(dict(self.open_stored(profile.profile_picture.name).getexif()), {})
+        self.assertEqual(profile.renditions['source'], profile.profile_picture.name)
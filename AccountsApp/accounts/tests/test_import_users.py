@@ -0,0 +1,99 @@
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import OutboxEmail, UserModel, UserProfile
+
+PASSWORD_HASH = make_password('Secr3t!pass')
+
+
+class ImportUsersTests(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='accounts-import-tests-')
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+    def write_csv(self, rows, name='users.csv'):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.DictWriter(file, ['email', 'first_name', 'last_name', 'password', 'password_hash'])
+            writer.writeheader()
+            writer.writerows(rows)
+        return path
+
+    def rows(self, count, start=0):
+        return [{'email': f'user{index}@example.com', 'first_name': 'Jean', 'last_name': 'Dupont',
+                 'password_hash': PASSWORD_HASH} for index in range(start, start + count)]
+
+    def call(self, path, *args):
+        out, err = io.StringIO(), io.StringIO()
+        call_command('import_users', path, '--processes', '0', *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_creates_users_with_profiles(self):
+        path = self.write_csv(self.rows(2) + [
+            {'email': 'paul@example.com', 'first_name': 'Paul', 'last_name': 'Martin', 'password': 'Autre!pass1'},
+        ])
+        out, err = self.call(path, '--verified')
+
+        self.assertIn('3 utilisateur(s) importé(s), 0 déjà présent(s), 0 invalide(s)', out)
+        self.assertEqual(UserProfile.objects.filter(user__username__endswith='@example.com').count(), 3)
+        user = UserModel.objects.get(username='user0@example.com')
+        self.assertTrue(user.is_verify and user.is_active)
+        self.assertEqual(user.password, PASSWORD_HASH)
+        self.assertTrue(UserModel.objects.get(username='paul@example.com').check_password('Autre!pass1'))
+
+    def test_existing_and_duplicate_emails_are_skipped(self):
+        UserModel.objects.create_user(username='user0@example.com', first_name='Jean', last_name='Dupont',
+                                      email='user0@example.com', password='Secr3t!pass')
+        rows = self.rows(2)
+        rows.append(dict(rows[1], email='USER1@example.com'))
+        rows.append(dict(rows[0], email='User0@Example.com'))
+        out, err = self.call(self.write_csv(rows))
+
+        self.assertIn('1 utilisateur(s) importé(s), 3 déjà présent(s)', out)
+        self.assertEqual(UserModel.objects.filter(email__iexact='user1@example.com').count(), 1)
+        # Relancer la commande ne crée rien
+        out, err = self.call(self.write_csv(rows))
+        self.assertIn('0 utilisateur(s) importé(s), 4 déjà présent(s)', out)
+
+    def test_invalid_rows_are_reported(self):
+        rows = self.rows(1) + [
+            {'email': 'pas-un-email', 'first_name': 'Jean', 'last_name': 'Dupont', 'password': 'x'},
+            {'email': 'sans-nom@example.com', 'first_name': '', 'last_name': 'Dupont', 'password': 'x'},
+            {'email': 'sans-mdp@example.com', 'first_name': 'Jean', 'last_name': 'Dupont'},
+            {'email': 'hash@example.com', 'first_name': 'Jean', 'last_name': 'Dupont', 'password_hash': 'abc'},
+        ]
+        out, err = self.call(self.write_csv(rows))
+
+        self.assertIn('1 utilisateur(s) importé(s), 0 déjà présent(s), 4 invalide(s)', out)
+        for line in (2, 3, 4, 5):
+            self.assertIn(f'Ligne {line} ignorée', err)
+
+    def test_ndjson_start_line_and_welcome_email(self):
+        path = os.path.join(self.directory, 'users.ndjson')
+        with open(path, 'w', encoding='utf-8') as file:
+            file.writelines(json.dumps(row) + '\n' for row in self.rows(3))
+        out, err = self.call(path, '--start-line', '1', '--welcome-email')
+
+        self.assertIn('2 utilisateur(s) importé(s)', out)
+        self.assertFalse(UserModel.objects.filter(username='user0@example.com').exists())
+        self.assertEqual(OutboxEmail.objects.count(), 2)
+
+    def test_queries_per_batch_do_not_grow_with_its_size(self):
+        counts = []
+        for start, size in ((0, 5), (100, 50)):
+            path = self.write_csv(self.rows(size, start), name=f'users{size}.csv')
+            with CaptureQueriesContext(connection) as queries:
+                self.call(path, '--batch-size', str(size), '--welcome-email')
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
@@ -0,0 +1,84 @@
+import datetime
+import decimal
+import io
+import uuid
+from unittest import mock
+
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from accounts.parsers import FastJSONParser
+from accounts.renderers import FastJSONRenderer
+
+PAYLOAD = {
+    'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    'created': datetime.datetime(2026, 10, 17, 8, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+    'day': datetime.date(2026, 10, 17),
+    'amount': decimal.Decimal('12.50'),
+    'name': 'Zoé ',
+    'empty': None,
+    1: [1.5, True, ('a', 'b')],
+}
+
+
+class FastJSONRendererTests(SimpleTestCase):
+
+    def test_output_matches_drf(self):
+        for accepted in (None, 'application/json; indent=2', 'application/json; indent=4'):
+            with self.subTest(accepted=accepted):
+                self.assertEqual(FastJSONRenderer().render(PAYLOAD, accepted),
+                                 JSONRenderer().render(PAYLOAD, accepted))
+
+    def test_non_finite_floats_raise_under_strict_json(self):
+        for value in (float('nan'), float('inf'), [{'score': float('-inf')}]):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                FastJSONRenderer().render({'value': value})
+
+    def test_non_finite_floats_are_written_without_strict_json(self):
+        with mock.patch.object(FastJSONRenderer, 'strict', False), \
+                mock.patch.object(JSONRenderer, 'strict', False):
+            self.assertEqual(FastJSONRenderer().render({'value': float('nan')}), b'{"value":NaN}')
+
+
+class FastJSONParserTests(SimpleTestCase):
+
+    def parse(self, body, parser_class=FastJSONParser, **context):
+        return parser_class().parse(io.BytesIO(body), 'application/json', context)
+
+    def test_utf8_body(self):
+        self.assertEqual(self.parse('{"name": "Zoé"}'.encode()), {'name': 'Zoé'})
+
+    def test_request_charset_is_honoured(self):
+        body = '{"name": "Zoé"}'.encode('latin-1')
+        self.assertEqual(self.parse(body, encoding='iso-8859-1'), {'name': 'Zoé'})
+        self.assertEqual(self.parse('{"name": "Zoé"}'.encode('utf-16'), encoding='utf-16'), {'name': 'Zoé'})
+
+    def test_charset_reaches_the_parser(self):
+        request = Request(
+            APIRequestFactory().post('/', '{"name": "Zoé"}'.encode('latin-1'),
+                                     content_type='application/json; charset=iso-8859-1'),
+            parsers=[FastJSONParser()],
+        )
+        self.assertEqual(request.data, {'name': 'Zoé'})
+
+    def test_constants_are_refused_under_strict_json(self):
+        for body in (b'{"value": NaN}', b'[Infinity]', b'-Infinity'):
+            with self.subTest(body=body), self.assertRaises(ParseError):
+                self.parse(body)
+
+    def test_constants_are_accepted_without_strict_json(self):
+        with mock.patch.object(FastJSONParser, 'strict', False):
+            self.assertEqual(self.parse(b'[Infinity]'), [float('inf')])
+
+    def test_errors_match_drf(self):
+        for body in (b'{"name": ', b'\xff', b'{"value": NaN}'):
+            with self.subTest(body=body):
+                with self.assertRaises(ParseError) as fast:
+                    self.parse(body)
+                with self.assertRaises(ParseError) as drf:
+                    self.parse(body, JSONParser)
+                self.assertEqual(str(fast.exception.detail), str(drf.exception.detail))
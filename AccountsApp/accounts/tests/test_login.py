@@ -0,0 +1,63 @@
+from datetime import datetime
+from unittest import mock
+
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from accounts.models import UserModel
+from accounts.throttling import get_rate_limiter
+
+
+# Compteurs du throttle hors base : seul le coût de la connexion est mesuré
+@override_settings(RATE_LIMIT={'BACKEND': 'accounts.throttling.MemoryBackend'})
+class LoginCostTests(APITestCase):
+    """Une connexion : une requête SQL, un hachage, une paire de tokens."""
+
+    def setUp(self):
+        get_rate_limiter.cache_clear()
+        self.addCleanup(get_rate_limiter.cache_clear)
+        self.user = UserModel.objects.create_user(
+            username='jean@example.com', first_name='Jean', last_name='Dupont',
+            email='jean@example.com', password='Secr3t!pass',
+        )
+        UserModel.objects.filter(pk=self.user.pk).update(is_verify=True)
+
+    def login(self, username='jean@example.com', password='Secr3t!pass'):
+        encode = mock.patch.object(PBKDF2PasswordHasher, 'encode', autospec=True,
+                                   side_effect=PBKDF2PasswordHasher.encode)
+        with encode as hashes:
+            response = self.client.post(reverse('login'), {'username': username, 'password': password}, format='json')
+        return response, hashes.call_count
+
+    def test_one_query_and_one_hash(self):
+        with self.assertNumQueries(1):
+            response, hashes = self.login()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(hashes, 1)
+
+    def test_one_token_pair_matching_expirations(self):
+        with mock.patch.object(RefreshToken, 'for_user', wraps=RefreshToken.for_user) as for_user:
+            response, _ = self.login()
+        self.assertEqual(for_user.call_count, 1)
+        body = response.json()['body']
+        access = AccessToken(body['access'])
+        self.assertEqual(body['access_token_expiration'], datetime.fromtimestamp(access['exp']).isoformat())
+
+    def test_wrong_password_costs_the_same(self):
+        with self.assertNumQueries(1):
+            response, hashes = self.login(password='mauvais')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(hashes, 1)
+
+    def test_unknown_user_costs_the_same(self):
+        with self.assertNumQueries(1):
+            response, hashes = self.login(username='inconnu@example.com')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(hashes, 1)
+
+    def test_username_lookup_is_exact(self):
+        response, _ = self.login(username='JEAN@example.com')
+        self.assertEqual(response.status_code, 401)
@@ -0,0 +1,125 @@
+import smtplib
+import time
+
+from django.core.mail import EmailMessage
+from django.core.mail.backends.base import BaseEmailBackend
+from django.test import SimpleTestCase
+
+from accounts.mail import MailConnectionPool, _Progress
+
+
+class ScriptedBackend(BaseEmailBackend):
+    """
+    Backend email de test : compte les ouvertures de connexion et lève, pour
+    un sujet donné, les exceptions prévues par ``failures``.
+    """
+    opens = 0
+    delivered = []
+    failures = {}
+    refuse_connection = 0
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.connection = None
+
+    def open(self):
+        if self.connection is not None:
+            return False
+        if ScriptedBackend.refuse_connection:
+            ScriptedBackend.refuse_connection -= 1
+            raise ConnectionRefusedError('refusé')
+        ScriptedBackend.opens += 1
+        self.connection = ScriptedBackend.opens
+        return True
+
+    def close(self):
+        self.connection = None
+
+    def send_messages(self, messages):
+        for message in messages:
+            pending = self.failures.get(message.subject)
+            if pending:
+                raise pending.pop(0)
+            self.delivered.append((message.subject, self.connection))
+        return len(messages)
+
+
+def messages(count):
+    return [EmailMessage(f'm{index}', 'Corps', 'webmaster@localhost', ['jean@example.com']) for index in range(count)]
+
+
+class MailConnectionPoolTests(SimpleTestCase):
+
+    def setUp(self):
+        ScriptedBackend.opens = 0
+        ScriptedBackend.delivered = []
+        ScriptedBackend.failures = {}
+        ScriptedBackend.refuse_connection = 0
+
+    def pool(self, **options):
+        options = {'size': 1, 'batch_size': 2, **options}
+        pool = MailConnectionPool(backend='accounts.tests.test_mail.ScriptedBackend', **options)
+        self.addCleanup(pool.close)
+        return pool
+
+    def subjects(self):
+        return [subject for subject, _ in ScriptedBackend.delivered]
+
+    def test_connection_is_reused_across_batches(self):
+        pool = self.pool()
+        self.assertEqual(pool.send(messages(5)), [None] * 5)
+        self.assertEqual(pool.send(messages(3)), [None] * 3)
+        self.assertEqual(ScriptedBackend.opens, 1)
+        stats = pool.stats()
+        self.assertEqual((stats['sent'], stats['failed'], stats['batches'], stats['reconnects']), (8, 0, 5, 0))
+
+    def test_idle_connection_is_reopened(self):
+        pool = self.pool(max_idle=0)
+        pool.send(messages(1))
+        time.sleep(0.01)
+        pool.send(messages(1))
+        self.assertEqual(ScriptedBackend.opens, 2)
+
+    def test_reconnects_and_resumes_after_disconnect(self):
+        ScriptedBackend.failures = {'m3': [smtplib.SMTPServerDisconnected('coupé')]}
+        pool = self.pool(batch_size=5)
+        self.assertEqual(pool.send(messages(5)), [None] * 5)
+        # Les messages partis avant la coupure ne sont pas renvoyés
+        self.assertEqual(self.subjects(), ['m0', 'm1', 'm2', 'm3', 'm4'])
+        self.assertEqual([connection for _, connection in ScriptedBackend.delivered], [1, 1, 1, 2, 2])
+        self.assertEqual(pool.stats()['reconnects'], 1)
+
+    def test_refused_message_keeps_connection(self):
+        ScriptedBackend.failures = {'m1': [smtplib.SMTPRecipientsRefused({})]}
+        pool = self.pool(batch_size=5)
+        with self.assertLogs('accounts.mail', 'WARNING'):
+            errors = pool.send(messages(4))
+        self.assertIsNone(errors[0])
+        self.assertIn('SMTPRecipientsRefused', errors[1])
+        self.assertEqual(errors[2:], [None, None])
+        self.assertEqual(self.subjects(), ['m0', 'm2', 'm3'])
+        self.assertEqual(ScriptedBackend.opens, 1)
+        stats = pool.stats()
+        self.assertEqual((stats['sent'], stats['failed'], stats['reconnects']), (3, 1, 0))
+
+    def test_unreachable_server_fails_the_batch(self):
+        ScriptedBackend.refuse_connection = 2
+        pool = self.pool(batch_size=5)
+        with self.assertLogs('accounts.mail', 'WARNING'):
+            errors = pool.send(messages(3))
+        self.assertTrue(all('ConnectionRefusedError' in error for error in errors))
+        self.assertEqual(self.subjects(), [])
+        self.assertEqual(pool.stats()['failed'], 3)
+
+
+class ProgressTests(SimpleTestCase):
+
+    def test_index_tracks_the_current_message(self):
+        progress = _Progress(['a', 'b', 'c'])
+        self.assertEqual((len(progress), progress.index), (3, -1))
+        iterator = iter(progress)
+        next(iterator)
+        next(iterator)
+        self.assertEqual(progress.index, 1)
+        self.assertEqual(list(iterator), ['c'])
+        self.assertEqual(progress.index, 2)
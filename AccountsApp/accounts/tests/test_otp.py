@@ -0,0 +1,127 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.models import OTPWindow, UserModel
+from accounts.otp import DatabaseOTPBackend, HMACOTPBackend
+from accounts.throttling import get_rate_limiter
+
+
+def create_user(email='otp@example.com'):
+    return UserModel.objects.create_user(
+        username=email, first_name='Jean', last_name='Dupont', email=email, password='Secr3t!pass',
+    )
+
+
+def query_plan(sql):
+    """Plan d'exécution d'une requête SQL capturée, en une seule chaîne."""
+    explain = 'EXPLAIN QUERY PLAN ' if connection.vendor == 'sqlite' else 'EXPLAIN '
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            # Tables presque vides : forcer l'évaluation des index
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        cursor.execute(explain + sql)
+        return '\n'.join(' '.join(str(column) for column in row) for row in cursor.fetchall())
+
+
+class OTPRequestIndexTests(TestCase):
+    """Les requêtes du backend OTP en base utilisent les index partiels."""
+
+    def setUp(self):
+        self.backend = DatabaseOTPBackend()
+        self.user = create_user()
+        self.backend.issue(self.user, 'reset_password', invalidate=False)
+
+    def assertUsesIndex(self, call, index_name, query=-1):
+        with CaptureQueriesContext(connection) as queries:
+            call()
+        self.assertIn(index_name, query_plan(queries[query]['sql']))
+
+    def test_issue_invalidation_uses_pending_index(self):
+        # Première requête : l'UPDATE qui invalide les codes en attente
+        self.assertUsesIndex(lambda: self.backend.issue(self.user, 'reset_password'), 'otp_pending_expiry_idx',
+                             query=0)
+
+    def test_consume_uses_pending_index(self):
+        self.assertUsesIndex(lambda: self.backend.consume(self.user, 'reset_password', '0000'),
+                             'otp_pending_expiry_idx')
+
+    def test_has_verified_uses_used_index(self):
+        self.assertUsesIndex(lambda: self.backend.has_verified(self.user, 'reset_password'), 'otp_used_expiry_idx')
+
+    def test_redeem_uses_used_index(self):
+        self.assertUsesIndex(lambda: self.backend.redeem(self.user, 'reset_password'), 'otp_used_expiry_idx')
+
+
+class HMACOTPBackendTests(TestCase):
+
+    def setUp(self):
+        self.backend = HMACOTPBackend()
+        self.user = create_user()
+        self.step = self.backend._step('register')
+
+    def at(self, window):
+        """Fige l'horloge au début de ``window``."""
+        return mock.patch('time.time', return_value=window * self.step)
+
+    def test_issue_writes_nothing(self):
+        with self.assertNumQueries(1):
+            self.backend.issue(self.user, 'register')
+        # Utilisateur tout juste créé : aucun compteur à lire
+        with self.assertNumQueries(0):
+            self.backend.issue(self.user, 'register', invalidate=False)
+        other = create_user('other@example.com')
+        with self.assertNumQueries(1):
+            self.backend.issue_many([self.user, other], 'register')
+        self.assertFalse(OTPWindow.objects.exists())
+
+    def test_code_is_single_use(self):
+        code = self.backend.issue(self.user, 'register').otp_code
+        self.assertTrue(self.backend.consume(self.user, 'register', code))
+        self.assertFalse(self.backend.consume(self.user, 'register', code))
+        self.assertTrue(self.backend.has_verified(self.user, 'register'))
+
+    def test_only_current_and_previous_windows_are_accepted(self):
+        window = self.backend._window('register')
+        with self.at(window):
+            code = self.backend.issue(self.user, 'register').otp_code
+        expired = self.backend._code(self.user, 'register', window - 1, 0)
+        with self.at(window + 2):
+            if code != self.backend._code(self.user, 'register', window + 1, 0):
+                self.assertFalse(self.backend.consume(self.user, 'register', code))
+        with self.at(window + 1):
+            if expired != code:
+                self.assertFalse(self.backend.consume(self.user, 'register', expired))
+            self.assertTrue(self.backend.consume(self.user, 'register', code))
+
+    def test_code_reissued_after_consumption_is_new(self):
+        first = self.backend.issue(self.user, 'register').otp_code
+        self.assertTrue(self.backend.consume(self.user, 'register', first))
+        second = self.backend.issue(self.user, 'register').otp_code
+        self.assertEqual(second, self.backend._code(self.user, 'register', self.backend._window('register'), 1))
+        self.assertTrue(self.backend.consume(self.user, 'register', second))
+
+    def test_password_change_keeps_pending_code(self):
+        code = self.backend.issue(self.user, 'reset_password').otp_code
+        # Mise à niveau du hash à la connexion, par exemple
+        self.user.set_password('Other!pass9')
+        self.user.save(update_fields=['password'])
+        self.assertTrue(self.backend.consume(self.user, 'reset_password', code))
+
+
+class CheckOTPThrottleTests(APITestCase):
+
+    def setUp(self):
+        get_rate_limiter.cache_clear()
+        create_user()
+
+    def test_attempts_are_limited_per_email_and_purpose(self):
+        data = {'email': 'otp@example.com', 'otp': '0000', 'purpose': 'register'}
+        statuses = [self.client.post(reverse('check-otp'), data, format='json').status_code for _ in range(6)]
+        self.assertEqual(statuses, [400] * 5 + [429])
+        data['purpose'] = 'reset_password'
+        self.assertEqual(self.client.post(reverse('check-otp'), data, format='json').status_code, 400)
@@ -0,0 +1,60 @@
+import threading
+from unittest import mock
+
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from accounts.models import OTPRequest, UserModel
+from accounts.otp import DatabaseOTPBackend
+from accounts.throttling import CheckOTPRateThrottle, get_rate_limiter
+
+from .concurrency import ConcurrentTransactionTestCase
+
+
+class ConcurrentOTPCheckTests(ConcurrentTransactionTestCase):
+    """Parmi N vérifications simultanées d'un même code, une seule réussit."""
+    threads = 8
+
+    def setUp(self):
+        get_rate_limiter.cache_clear()
+        self.user = UserModel.objects.create_user(
+            username='otp@example.com', first_name='Jean', last_name='Dupont',
+            email='otp@example.com', password='Secr3t!pass',
+        )
+        self.code = DatabaseOTPBackend().issue(self.user, 'register', minutes=10, invalidate=False).otp_code
+
+    def run_concurrently(self, check):
+        barrier = threading.Barrier(self.threads)
+        results = []
+
+        def worker():
+            try:
+                barrier.wait()
+                results.append(check())
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=worker) for _ in range(self.threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        return results
+
+    def test_consume(self):
+        backend = DatabaseOTPBackend()
+        results = self.run_concurrently(lambda: backend.consume(self.user, 'register', self.code))
+        self.assertEqual(results.count(True), 1, results)
+        self.assertEqual(results.count(False), self.threads - 1, results)
+
+    # Toutes les tentatives doivent atteindre la vue
+    @mock.patch.object(CheckOTPRateThrottle, 'THROTTLE_RATES', {'check_otp': None})
+    def test_check_otp_view(self):
+        data = {'email': 'otp@example.com', 'otp': self.code, 'purpose': 'register'}
+        results = self.run_concurrently(
+            lambda: APIClient().post(reverse('check-otp'), data, format='json').status_code
+        )
+        self.assertEqual(sorted(results), [200] + [400] * (self.threads - 1))
+        self.assertTrue(UserModel.objects.get(pk=self.user.pk).is_verify)
+        self.assertFalse(OTPRequest.objects.filter(user=self.user, used=False).exists())
@@ -0,0 +1,96 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core import mail
+from django.test import TestCase
+from django.utils.timezone import now
+
+from accounts.mail import MailConnectionPool
+from accounts.models import OutboxEmail
+from accounts.outbox import OutboxWorker, enqueue_email
+
+
+class FailingPool:
+    """Pool dont chaque envoi échoue."""
+    batch_size = 20
+
+    def send(self, messages):
+        return ['SMTPDataError(554)'] * len(messages)
+
+    def close(self):
+        pass
+
+
+class OutboxWorkerTests(TestCase):
+
+    def setUp(self):
+        self.emails = [enqueue_email('Sujet', 'Corps', [f'user{index}@example.com']) for index in range(3)]
+
+    def worker(self, pool=None, **options):
+        pool = pool or MailConnectionPool(backend='django.core.mail.backends.locmem.EmailBackend')
+        worker = OutboxWorker(workers=2, pool=pool, **options)
+        self.addCleanup(worker.close)
+        return worker
+
+    def test_sent_rows_are_marked_sent(self):
+        worker = self.worker()
+        self.assertEqual(worker.run_once(), 3)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(worker.sent, 3)
+        for email in OutboxEmail.objects.all():
+            self.assertEqual(email.status, OutboxEmail.SENT)
+            self.assertIsNotNone(email.sent_at)
+            self.assertIsNone(email.lease_token)
+        self.assertEqual(worker.run_once(), 0)
+
+    def test_claimed_rows_are_leased(self):
+        claimed = self.worker(lease=60).claim()
+        self.assertEqual([email.pk for email in claimed], [email.pk for email in self.emails])
+        self.assertEqual({email.attempts for email in claimed}, {1})
+        self.assertEqual(self.worker().claim(), [])
+
+    def test_expired_lease_is_reclaimed(self):
+        first = self.worker().claim()
+        OutboxEmail.objects.update(available_at=now() - timedelta(seconds=1))
+        second = self.worker().claim()
+        self.assertEqual(len(second), 3)
+        self.assertNotEqual(second[0].lease_token, first[0].lease_token)
+        self.assertEqual({email.attempts for email in second}, {2})
+
+    def test_expired_lease_does_not_overwrite_new_owner(self):
+        late_worker = self.worker()
+        stale = late_worker.claim()
+        OutboxEmail.objects.update(available_at=now() - timedelta(seconds=1))
+        owner = self.worker().claim()
+        # Le premier worker termine son envoi après la reprise de son lot
+        with mock.patch.object(late_worker, 'claim', return_value=stale):
+            late_worker.run_once()
+        self.assertEqual(late_worker.sent, 0)
+        for email in OutboxEmail.objects.all():
+            self.assertEqual(email.status, OutboxEmail.PENDING)
+            self.assertEqual(email.lease_token, owner[0].lease_token)
+
+    def test_failure_is_retried_with_backoff(self):
+        worker = self.worker(pool=FailingPool(), backoff_base=30)
+        started = now()
+        worker.run_once()
+        for email in OutboxEmail.objects.all():
+            self.assertEqual(email.status, OutboxEmail.PENDING)
+            self.assertEqual(email.attempts, 1)
+            self.assertEqual(email.last_error, 'SMTPDataError(554)')
+            self.assertIsNone(email.lease_token)
+            # 30 s ± 20 % de gigue
+            self.assertGreaterEqual(email.available_at, started + timedelta(seconds=24))
+            self.assertLessEqual(email.available_at, now() + timedelta(seconds=36))
+
+    def test_last_attempt_marks_failed(self):
+        OutboxEmail.objects.update(attempts=4)
+        worker = self.worker(pool=FailingPool(), max_attempts=5)
+        worker.run_once()
+        self.assertEqual(worker.failed, 3)
+        self.assertEqual(set(OutboxEmail.objects.values_list('status', flat=True)), {OutboxEmail.FAILED})
+
+    def test_backoff_is_exponential_and_capped(self):
+        worker = self.worker(backoff_base=30, backoff_max=3600)
+        with mock.patch('accounts.outbox.random.uniform', return_value=1.0):
+            self.assertEqual([worker.backoff(attempts) for attempts in (1, 2, 3, 10)], [30, 60, 120, 3600])
@@ -0,0 +1,47 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.cache import ProfileCache
+from accounts.checks import check_shared_caches
+from accounts.models import UserModel
+
+
+class SharedCacheCheckTests(TestCase):
+
+    def test_disabled_profile_cache_passes(self):
+        with override_settings(PROFILE_CACHE={'CACHE': None}):
+            self.assertEqual(check_shared_caches(None), [])
+
+    def test_process_local_profile_cache_is_refused(self):
+        with override_settings(PROFILE_CACHE={'CACHE': 'default'}):
+            self.assertEqual([error.id for error in check_shared_caches(None)], ['accounts.E001'])
+
+
+class ProfileViewCacheTests(APITestCase):
+
+    def setUp(self):
+        self.user = UserModel.objects.create_user(
+            username='jean@example.com', first_name='Jean', last_name='Dupont',
+            email='jean@example.com', password='Secr3t!pass',
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_disabled_cache_reads_profile_without_etag(self):
+        with mock.patch('accounts.views.get_profile_cache', return_value=ProfileCache(cache=None)):
+            response = self.client.get(reverse('profile'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['body']['first_name'], 'Jean')
+        self.assertFalse(response.has_header('ETag'))
+
+    def test_enabled_cache_answers_not_modified(self):
+        cache = ProfileCache(cache='default')
+        with mock.patch('accounts.views.get_profile_cache', return_value=cache):
+            etag = self.client.get(reverse('profile'))['ETag']
+            response = self.client.get(reverse('profile'), HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+            cache.invalidate(self.user.pk)
+            response = self.client.get(reverse('profile'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,76 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from accounts.cache import ProfileCache
+from accounts.models import Address, UserModel, UserProfile
+from accounts.serializers import UserUpdateSerializer
+
+
+class UserUpdateQueryTests(TestCase):
+    """
+    ``UserUpdateSerializer.update`` n'enregistre que les modèles modifiés,
+    avec leurs seuls champs modifiés.
+    """
+
+    def setUp(self):
+        user = UserModel.objects.create_user(
+            username='jean@example.com', first_name='Jean', last_name='Dupont',
+            email='jean@example.com', password='Secr3t!pass',
+        )
+        profile = UserProfile.objects.get(user=user)
+        profile.address = Address.objects.create(country='France', city='Lyon', postal_code='69001',
+                                                 address='1 rue de la République')
+        profile.save(update_fields=['address'])
+        self.profile = UserProfile.objects.select_related('user', 'address').get(user=user)
+
+    def update(self, data, queries):
+        """Applique ``data`` ; renvoie les ``update_fields`` enregistrés, par modèle."""
+        saved = {}
+
+        def recorder(model):
+            def save(instance, *args, **kwargs):
+                saved[model.__name__] = sorted(kwargs.get('update_fields') or [])
+                return original[model](instance, *args, **kwargs)
+            return save
+
+        original = {model: model.save for model in (UserModel, Address, UserProfile)}
+        serializer = UserUpdateSerializer(self.profile, data=data, partial=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        with mock.patch.object(UserModel, 'save', recorder(UserModel)), \
+                mock.patch.object(Address, 'save', recorder(Address)), \
+                mock.patch.object(UserProfile, 'save', recorder(UserProfile)), \
+                self.assertNumQueries(queries):
+            serializer.save()
+        return saved
+
+    def test_user_fields_only(self):
+        saved = self.update({'first_name': 'Paul', 'telephone_number': '0600000000', 'last_name': 'Dupont'}, 3)
+        self.assertEqual(saved, {'UserModel': ['first_name', 'telephone_number']})
+
+    def test_address_only(self):
+        saved = self.update({'address': {'city': 'Paris', 'country': 'France'}}, 3)
+        self.assertEqual(saved, {'Address': ['city']})
+
+    def test_address_invalidates_enabled_cache(self):
+        cache = ProfileCache(cache='default')
+        cache.invalidate(self.profile.user_id)
+        version = cache.lookup(self.profile.user_id)[0]
+        with mock.patch('accounts.signals.get_profile_cache', return_value=cache):
+            # + SELECT des profils de l'adresse (signal d'invalidation du cache)
+            self.update({'address': {'city': 'Paris'}}, 4)
+        self.assertNotEqual(cache.lookup(self.profile.user_id)[0], version)
+
+    def test_user_and_address(self):
+        saved = self.update({'last_name': 'Martin', 'address': {'postal_code': '69002'}}, 4)
+        self.assertEqual(saved, {'UserModel': ['last_name'], 'Address': ['postal_code']})
+
+    def test_no_change(self):
+        saved = self.update({'first_name': 'Jean', 'address': {'city': 'Lyon'}}, 0)
+        self.assertEqual(saved, {})
+
+    def test_first_address_is_created(self):
+        self.profile.address = None
+        saved = self.update({'address': {'city': 'Paris'}}, 4)
+        self.assertEqual(saved, {'Address': [], 'UserProfile': ['address']})
+        self.assertEqual(UserProfile.objects.get(pk=self.profile.pk).address.city, 'Paris')
@@ -0,0 +1,53 @@
+from django.contrib.auth.hashers import make_password
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts import services
+from accounts.models import OTPRequest, OutboxEmail, UserModel, UserProfile
+from accounts.throttling import get_rate_limiter
+
+
+class RegistrationQueryTests(APITestCase):
+    """
+    Budget de requêtes de l'inscription : un INSERT par table (compte,
+    profil, OTP, emails) dans une transaction, sans SELECT préalable.
+    """
+    # 4 INSERT + SAVEPOINT / RELEASE SAVEPOINT (transaction du test)
+    budget = 6
+
+    def setUp(self):
+        get_rate_limiter.cache_clear()
+        self.addCleanup(get_rate_limiter.cache_clear)
+
+    def assertRegistered(self, email):
+        user = UserModel.objects.get(email=email)
+        self.assertTrue(user.check_password('Secr3t!pass'))
+        self.assertTrue(UserProfile.objects.filter(user=user, address__isnull=True).exists())
+        self.assertTrue(OTPRequest.objects.filter(user=user, purpose='register', used=False).exists())
+        self.assertEqual(OutboxEmail.objects.filter(recipients=[email]).count(), 2)
+
+    def test_register_user(self):
+        password_hash = make_password('Secr3t!pass')
+        with self.assertNumQueries(self.budget):
+            services.register_user('new@example.com', 'Jean', 'Dupont', password_hash, password='Secr3t!pass')
+        self.assertRegistered('new@example.com')
+
+    # Compteurs du throttle hors base : seul le coût de l'inscription est mesuré
+    @override_settings(RATE_LIMIT={'BACKEND': 'accounts.throttling.MemoryBackend'})
+    def test_register_view(self):
+        data = {
+            'first_name': 'Jean', 'last_name': 'Dupont', 'email': 'new@example.com',
+            'password': 'Secr3t!pass', 'password2': 'Secr3t!pass',
+        }
+        with self.assertNumQueries(self.budget):
+            response = self.client.post(reverse('register'), data, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertRegistered('new@example.com')
+
+    def test_duplicate_email(self):
+        services.register_user('new@example.com', 'Jean', 'Dupont', make_password('Secr3t!pass'))
+        # Seul l'INSERT du compte est tenté, puis annulé
+        with self.assertNumQueries(4):
+            with self.assertRaises(services.serializers.ValidationError):
+                services.register_user('new@example.com', 'Jean', 'Dupont', make_password('Secr3t!pass'))
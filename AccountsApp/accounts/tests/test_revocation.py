@@ -0,0 +1,69 @@
+import threading
+import time
+from datetime import timedelta
+
+from django.test import TestCase, TransactionTestCase
+from django.utils.timezone import now
+
+from accounts.models import RevokedToken
+from accounts.revocation import RevocationStore
+
+
+class RevocationStoreTests(TestCase):
+
+    def setUp(self):
+        self.store = RevocationStore(capacity=1000, sync_interval=5, sync_margin=60)
+        self.store.stop()  # Synchronisations déclenchées par le test
+        self.store.refresh()
+
+    def test_sync_rescans_rows_committed_late(self):
+        expires_at = now() + timedelta(hours=1)
+        RevokedToken.objects.create(pk=2, jti='early', expires_at=expires_at)
+        self.store.rebuild()
+        # Transaction concurrente validée après la synchronisation, avec une
+        # clé primaire et un horodatage antérieurs
+        RevokedToken.objects.create(pk=1, jti='late', expires_at=expires_at, revoked_at=now() - timedelta(seconds=30))
+        self.store.refresh()
+        self.assertTrue(self.store.is_revoked({'jti': 'late'}))
+
+    def test_unrevoked_token_checked_without_query(self):
+        with self.assertNumQueries(0):
+            self.assertFalse(self.store.is_revoked({'jti': 'unknown'}))
+
+    def test_rebuild_purges_expired_rows(self):
+        RevokedToken.objects.create(jti='expired', expires_at=now() - timedelta(minutes=1))
+        self.store.rebuild()
+        self.assertFalse(RevokedToken.objects.filter(jti='expired').exists())
+        self.assertFalse(self.store.is_revoked({'jti': 'expired'}))
+
+    def test_revocation_by_another_process_applies_at_next_sync(self):
+        # Ligne écrite par un autre processus : absente du filtre local
+        RevokedToken.objects.create(jti='remote', expires_at=now() + timedelta(hours=1))
+        self.assertFalse(self.store.is_revoked({'jti': 'remote'}))
+        self.store.refresh()
+        self.assertTrue(self.store.is_revoked({'jti': 'remote'}))
+
+    def test_bloom_hit_is_confirmed_in_database(self):
+        self.store._bloom.add('false-positive')
+        with self.assertNumQueries(1):
+            self.assertFalse(self.store.is_revoked({'jti': 'false-positive'}))
+
+
+class RevocationRefresherTests(TransactionTestCase):
+
+    def test_one_long_lived_refresher(self):
+        running = {thread for thread in threading.enumerate() if thread.name == 'token-revocation'}
+        store = RevocationStore(capacity=1000, sync_interval=0.01)
+        self.addCleanup(store.stop)
+        store.is_revoked({'jti': 'unknown'})
+        refresher = store._refresher
+        for _ in range(20):
+            store.is_revoked({'jti': 'unknown'})
+            time.sleep(0.005)
+        self.assertIs(store._refresher, refresher)
+        self.assertTrue(refresher.is_alive())
+        started = {thread for thread in threading.enumerate() if thread.name == 'token-revocation'} - running
+        self.assertEqual(started, {refresher})
+        store.stop()
+        self.assertFalse(refresher.is_alive())
+
@@ -0,0 +1,91 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.timezone import now
+from rest_framework.test import APITestCase
+
+from accounts.checks import check_shared_rate_limits
+from accounts.models import RateLimitCounter
+from accounts.throttling import (
+    CacheBackend, DatabaseBackend, MemoryBackend, SlidingWindowRateLimiter, get_rate_limiter,
+)
+
+
+class ThrottleNonObjectBodyTests(APITestCase):
+    """Un corps JSON qui n'est pas un objet doit produire un 400, pas un 500."""
+
+    def setUp(self):
+        get_rate_limiter.cache_clear()
+
+    def test_login_with_list_body(self):
+        response = self.client.post(reverse('login'), [], format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_otp_request_with_list_body(self):
+        response = self.client.post(reverse('otp-request'), [], format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class SlidingWindowRateLimiterTests(TestCase):
+    """Chaque backend compte avant de comparer : la limite est exacte."""
+
+    def setUp(self):
+        cache.clear()
+
+    def assertLimit(self, backend):
+        limiter = SlidingWindowRateLimiter(backend)
+        with mock.patch('accounts.throttling.time.time', return_value=1000.0):
+            results = [limiter.hit('k', limit=3, period=300)[0] for _ in range(5)]
+        self.assertEqual(results, [True, True, True, False, False])
+        with mock.patch('accounts.throttling.time.time', return_value=1000.0):
+            self.assertTrue(limiter.hit('autre', limit=3, period=300)[0])
+
+    def test_memory_backend(self):
+        self.assertLimit(MemoryBackend())
+
+    def test_cache_backend(self):
+        self.assertLimit(CacheBackend())
+
+    def test_database_backend(self):
+        self.assertLimit(DatabaseBackend())
+        self.assertEqual(DatabaseBackend().get('k', int(1000 // 300)), 5)
+
+    def test_database_backend_purges_expired_counters(self):
+        backend = DatabaseBackend()
+        backend.incr('ancienne', 1, ttl=600)
+        RateLimitCounter.objects.update(expires_at=now() - timedelta(seconds=1))
+        backend.incr('nouvelle', 2, ttl=600)
+        self.assertEqual(RateLimitCounter.objects.count(), 1)
+
+    def test_previous_window_is_weighted(self):
+        limiter = SlidingWindowRateLimiter(MemoryBackend())
+        with mock.patch('accounts.throttling.time.time', return_value=900.0):
+            for _ in range(3):
+                limiter.hit('k', limit=3, period=300)
+        # Fenêtre suivante, un tiers écoulé : 3 * 2/3 = 2 requêtes encore comptées
+        with mock.patch('accounts.throttling.time.time', return_value=1300.0):
+            results = [limiter.hit('k', limit=3, period=300)[0] for _ in range(2)]
+        self.assertEqual(results, [True, False])
+
+
+class SharedRateLimitCheckTests(TestCase):
+
+    def tearDown(self):
+        get_rate_limiter.cache_clear()
+
+    def check(self, config):
+        get_rate_limiter.cache_clear()
+        with override_settings(RATE_LIMIT=config):
+            return [error.id for error in check_shared_rate_limits(None)]
+
+    def test_database_backend_passes(self):
+        self.assertEqual(self.check({'BACKEND': 'accounts.throttling.DatabaseBackend'}), [])
+
+    def test_memory_backend_is_refused(self):
+        self.assertEqual(self.check({'BACKEND': 'accounts.throttling.MemoryBackend'}), ['accounts.E002'])
+
+    def test_locmem_cache_backend_is_refused(self):
+        self.assertEqual(self.check({'BACKEND': 'accounts.throttling.CacheBackend'}), ['accounts.E002'])
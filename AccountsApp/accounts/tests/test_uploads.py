@@ -0,0 +1,128 @@
+import io
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils.timezone import now
+from PIL import Image
+from rest_framework.test import APITestCase
+
+from accounts import uploads
+from accounts.models import ProfilePictureUpload, UserModel, UserProfile
+
+CHUNK = 4096
+
+
+def png_bytes(size=(64, 48)):
+    buffer = io.BytesIO()
+    # Bruit : quelques morceaux par image
+    Image.frombytes('RGB', size, os.urandom(size[0] * size[1] * 3)).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+class ChunkedUploadTests(APITestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='accounts-uploads-tests-')
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        overrides = override_settings(
+            MEDIA_ROOT=os.path.join(self.directory, 'media'),
+            PROFILE_PICTURE_UPLOAD={'MAX_CHUNK': CHUNK, 'TEMP_DIR': os.path.join(self.directory, 'parts')},
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        patcher = mock.patch('accounts.uploads.get_rendition_pipeline')
+        self.pipeline = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+
+        self.user = UserModel.objects.create_user(
+            username='jean@example.com', first_name='Jean', last_name='Dupont',
+            email='jean@example.com', password='Secr3t!pass',
+        )
+        self.client.force_authenticate(self.user)
+        self.content = png_bytes()
+
+    def open_upload(self, content_type='image/png'):
+        response = self.client.post(reverse('profile-picture-upload'),
+                                    {'content_type': content_type, 'size': len(self.content)}, format='json')
+        self.assertEqual(response.status_code, 201)
+        return ProfilePictureUpload.objects.get(pk=response.json()['body']['upload_id'])
+
+    def put(self, upload, start, end, data=None, **extra):
+        data = self.content[start:end + 1] if data is None else data
+        return self.client.put(
+            reverse('profile-picture-upload-chunk', args=[upload.pk]), data,
+            content_type='application/octet-stream',
+            HTTP_CONTENT_RANGE=f'bytes {start}-{end}/{len(self.content)}', **extra,
+        )
+
+    def send_all(self, upload):
+        for start in range(0, len(self.content), CHUNK):
+            response = self.put(upload, start, min(start + CHUNK, len(self.content)) - 1)
+        return response
+
+    def test_chunks_in_order_complete_the_upload(self):
+        upload = self.open_upload()
+        response = self.send_all(upload)
+        self.assertEqual(response.status_code, 200)
+        profile = UserProfile.objects.get(user=self.user)
+        with profile.profile_picture.open('rb') as picture:
+            self.assertEqual(Image.open(picture).size, (64, 48))
+        self.assertFalse(ProfilePictureUpload.objects.filter(pk=upload.pk).exists())
+        self.assertFalse(os.path.exists(uploads.part_path(upload)))
+        self.pipeline.schedule.assert_called_once()
+
+    def test_out_of_order_chunk_is_refused_with_offset(self):
+        upload = self.open_upload()
+        self.assertEqual(self.put(upload, 0, 99).status_code, 200)
+        response = self.put(upload, 200, 299)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['body']['offset'], 100)
+        # Morceau déjà reçu
+        self.assertEqual(self.put(upload, 0, 99).status_code, 409)
+        self.assertEqual(self.put(upload, 100, 199).status_code, 200)
+        self.assertEqual(self.client.get(reverse('profile-picture-upload-chunk', args=[upload.pk]))
+                         .json()['body']['offset'], 200)
+
+    def test_oversized_chunk(self):
+        upload = self.open_upload()
+        self.assertEqual(self.put(upload, 0, CHUNK).status_code, 413)
+
+    def test_signature_mismatch_aborts(self):
+        upload = self.open_upload(content_type='image/jpeg')
+        response = self.put(upload, 0, 99)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ProfilePictureUpload.objects.filter(pk=upload.pk).exists())
+        self.assertFalse(os.path.exists(uploads.part_path(upload)))
+
+    def test_invalid_image_is_refused_on_complete(self):
+        self.content = png_bytes()[:16] + b'\x00' * 100
+        upload = self.open_upload()
+        response = self.send_all(upload)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(UserProfile.objects.get(user=self.user).profile_picture)
+        self.assertFalse(ProfilePictureUpload.objects.filter(pk=upload.pk).exists())
+
+    def test_non_numeric_content_length(self):
+        upload = self.open_upload()
+        response = self.put(upload, 0, 99, CONTENT_LENGTH='abc')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Content-Length', response.json()['body'])
+
+    def test_content_length_must_match_range(self):
+        upload = self.open_upload()
+        self.assertEqual(self.put(upload, 0, 99, data=self.content[:50]).status_code, 400)
+
+    def test_purge_removes_abandoned_uploads_only(self):
+        old = self.open_upload()
+        self.put(old, 0, 99)
+        ProfilePictureUpload.objects.filter(pk=old.pk).update(created_at=now() - timedelta(hours=25))
+        recent = self.open_upload()
+        call_command('purge_picture_uploads', stdout=io.StringIO())
+        self.assertEqual(list(ProfilePictureUpload.objects.values_list('pk', flat=True)), [recent.pk])
+        self.assertFalse(os.path.exists(uploads.part_path(old)))
@@ -0,0 +1,101 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.cache import UserCache
+from accounts.checks import check_shared_caches
+from accounts.models import UserModel
+
+
+def create_user():
+    return UserModel.objects.create_user(
+        username='jean@example.com', first_name='Jean', last_name='Dupont',
+        email='jean@example.com', password='Secr3t!pass',
+    )
+
+
+class UserCacheTests(TestCase):
+    """
+    Deux instances sur le même cache partagé figurent deux processus : la
+    modification enregistrée par l'un doit invalider le cache local de l'autre.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_user()
+        self.worker = UserCache(UserModel, shared_cache='default')
+        self.other_worker = UserCache(UserModel, shared_cache='default')
+
+    def cached_user(self):
+        stamp, user = self.worker.lookup(self.user.pk)
+        if user is None:
+            self.worker.store(UserModel.objects.get(pk=self.user.pk), stamp)
+            stamp, user = self.worker.lookup(self.user.pk)
+        return user
+
+    def save_on_other_worker(self):
+        with mock.patch('accounts.signals.get_user_cache', return_value=self.other_worker):
+            self.user.save()
+
+    def test_local_hit_runs_no_query(self):
+        self.cached_user()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.worker.lookup(self.user.pk)[1].email, 'jean@example.com')
+
+    def test_deactivation_invalidates_other_workers(self):
+        self.assertTrue(self.cached_user().is_active)
+        self.user.is_active = False
+        self.save_on_other_worker()
+        self.assertIsNone(self.worker.lookup(self.user.pk)[1])
+        self.assertFalse(self.cached_user().is_active)
+
+    def test_password_change_invalidates_other_workers(self):
+        self.cached_user()
+        self.user.set_password('N0uveau!pass')
+        self.save_on_other_worker()
+        self.assertIsNone(self.worker.lookup(self.user.pk)[1])
+        self.assertTrue(self.cached_user().check_password('N0uveau!pass'))
+
+    def test_store_after_concurrent_invalidation_is_ignored(self):
+        stamp, _ = self.worker.lookup(self.user.pk)
+        stale = UserModel.objects.get(pk=self.user.pk)
+        self.other_worker.invalidate(self.user.pk)
+        self.worker.store(stale, stamp)
+        self.assertIsNone(self.worker.lookup(self.user.pk)[1])
+
+    def test_disabled_without_shared_cache(self):
+        user_cache = UserCache(UserModel)
+        user_cache.store(self.user, None)
+        self.assertEqual(user_cache.lookup(self.user.pk), (None, None))
+
+
+class CachedJWTAuthenticationUserTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_user()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+        worker = UserCache(UserModel, shared_cache='default')
+        other_worker = UserCache(UserModel, shared_cache='default')
+        for target, user_cache in (('accounts.authentication', worker), ('accounts.signals', other_worker)):
+            patcher = mock.patch(f'{target}.get_user_cache', return_value=user_cache)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_deactivated_user_is_rejected_at_once(self):
+        self.assertEqual(self.client.get(reverse('profile')).status_code, 200)
+        self.assertEqual(self.client.get(reverse('profile')).status_code, 200)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(reverse('profile')).status_code, 401)
+
+
+class SharedUserCacheCheckTests(TestCase):
+
+    def test_process_local_user_cache_is_refused(self):
+        with override_settings(USER_CACHE={'SHARED_CACHE': 'default'}):
+            self.assertEqual([error.id for error in check_shared_caches(None)], ['accounts.E003'])
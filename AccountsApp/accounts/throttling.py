@@ -0,0 +1,250 @@
+# accounts/throttling.py
+import hashlib
+import re
+import threading
+import time
+from collections.abc import Mapping
+from datetime import timedelta
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils.module_loading import import_string
+from django.utils.timezone import now
+from rest_framework.throttling import SimpleRateThrottle
+
+from .cache import LRUCache, is_process_local
+from .models import RateLimitCounter
+
+
+class MemoryBackend:
+    """
+    Compteurs en mémoire du processus : chaque processus applique sa propre
+    limite. Réservé aux tests et aux déploiements à un seul processus
+    (refusé par ``accounts.checks``).
+    """
+    process_local = True
+
+    def __init__(self, max_keys=100000):
+        self._counters = LRUCache(max_size=max_keys)
+        self._lock = threading.Lock()
+
+    def get(self, key, window):
+        """Renvoie le compteur de ``window`` (0 si absent)."""
+        with self._lock:
+            return self._counters.get((key, window), 0)
+
+    def incr(self, key, window, ttl):
+        """Incrémente le compteur de ``window`` et renvoie sa nouvelle valeur."""
+        with self._lock:
+            count = self._counters.get((key, window), 0) + 1
+            self._counters.set((key, window), count, ttl=ttl)
+            return count
+
+
+class CacheBackend:
+    """
+    Compteurs dans un cache Django (une clé par fenêtre de temps),
+    incrémentés de façon atomique par le cache (Redis, Memcached). Le cache
+    doit être partagé entre processus (vérifié par ``accounts.checks``).
+    """
+    key_prefix = 'accounts:ratelimit:'
+
+    def __init__(self, cache='default'):
+        self.cache_alias = cache
+        self.cache = caches[cache]
+
+    @property
+    def process_local(self):
+        return is_process_local(self.cache_alias)
+
+    def _key(self, key, window):
+        return f'{self.key_prefix}{key}:{window}'
+
+    def get(self, key, window):
+        return self.cache.get(self._key(key, window), 0)
+
+    def incr(self, key, window, ttl):
+        current_key = self._key(key, window)
+        self.cache.add(current_key, 0, ttl)
+        try:
+            return self.cache.incr(current_key)
+        except ValueError:
+            # Clé expirée entre add() et incr()
+            self.cache.add(current_key, 1, ttl)
+            return 1
+
+
+class DatabaseBackend:
+    """
+    Compteurs en base (``RateLimitCounter``), partagés par tous les
+    processus sans service supplémentaire : une ligne par clé et par
+    fenêtre, incrémentée par un UPDATE atomique. Les lignes expirées sont
+    supprimées à la création d'une nouvelle ligne.
+    """
+    process_local = False
+
+    @staticmethod
+    def _digest(key):
+        # Longueur fixe, et aucun email en clair dans la table
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def get(self, key, window):
+        return RateLimitCounter.objects.filter(
+            key=self._digest(key), window=window
+        ).values_list('count', flat=True).first() or 0
+
+    def incr(self, key, window, ttl):
+        counters = RateLimitCounter.objects.filter(key=self._digest(key), window=window)
+        if not counters.update(count=F('count') + 1):
+            try:
+                with transaction.atomic():
+                    RateLimitCounter.objects.create(key=self._digest(key), window=window, count=1,
+                                                    expires_at=now() + timedelta(seconds=ttl))
+            except IntegrityError:
+                # Ligne créée entre-temps par une requête concurrente
+                counters.update(count=F('count') + 1)
+            else:
+                RateLimitCounter.objects.filter(expires_at__lt=now()).delete()
+                return 1
+        # Lue après l'incrément : au moins la valeur qu'il a produite
+        return counters.values_list('count', flat=True).first() or 1
+
+
+class SlidingWindowRateLimiter:
+    """
+    Limiteur à fenêtre glissante approchée, en O(1) par requête.
+
+    Seuls deux compteurs sont conservés par clé (fenêtre courante et
+    précédente) ; le compteur précédent est pondéré par la part de la
+    fenêtre glissante qui le recouvre encore.
+
+    Le compteur courant est incrémenté avant la comparaison (``incr``
+    atomique du backend) : deux requêtes concurrentes ne peuvent pas passer
+    toutes les deux sous la limite. Les requêtes refusées sont comptées.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def hit(self, key, limit, period):
+        """
+        Enregistre une requête et indique si elle respecte la limite.
+
+        Renvoie ``(autorisée, attente_en_secondes)``.
+        """
+        current = time.time()
+        window = int(current // period)
+        elapsed = (current - window * period) / period
+        previous_count = self.backend.get(key, window - 1)
+        current_count = self.backend.incr(key, window, ttl=2 * period)
+
+        estimated = previous_count * (1 - elapsed) + current_count
+        if estimated > limit:
+            return False, self._wait(limit, period, elapsed, previous_count, current_count)
+        return True, 0
+
+    def _wait(self, limit, period, elapsed, previous_count, current_count):
+        if current_count >= limit:
+            # Il faut attendre la fin de la fenêtre courante
+            return (1 - elapsed) * period
+        # Instant où la part restante de la fenêtre précédente passe sous la limite
+        needed = 1 - (limit - current_count) / previous_count
+        return max(needed - elapsed, 0) * period
+
+
+@lru_cache(maxsize=None)
+def get_rate_limiter():
+    """
+    Renvoie le limiteur configuré par ``settings.RATE_LIMIT``.
+    """
+    config = getattr(settings, 'RATE_LIMIT', {})
+    backend_class = import_string(config.get('BACKEND', 'accounts.throttling.DatabaseBackend'))
+    return SlidingWindowRateLimiter(backend_class(**config.get('OPTIONS', {})))
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """
+    Throttle DRF adossé à ``SlidingWindowRateLimiter``.
+
+    Les débits sont lus dans ``REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']``
+    et acceptent une durée multiple : ``'3/5m'`` = 3 requêtes par 5 minutes.
+    Au-delà, DRF répond 429 avec l'en-tête ``Retry-After``.
+    """
+    rate_pattern = re.compile(r'^(\d+)/(\d*)([smhd])')
+    units = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+    def parse_rate(self, rate):
+        if rate is None:
+            return (None, None)
+        match = self.rate_pattern.match(rate)
+        if match is None:
+            return super().parse_rate(rate)
+        num, multiplier, unit = match.groups()
+        return (int(num), int(multiplier or 1) * self.units[unit])
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        allowed, self._wait = get_rate_limiter().hit(self.key, self.num_requests, self.duration)
+        return allowed
+
+    def wait(self):
+        return self._wait
+
+
+def request_field(request, name, default=None):
+    """
+    Champ ``name`` du corps de la requête, ou ``default`` si le corps n'est
+    pas un objet JSON / un formulaire (le serializer renvoie alors le 400).
+    """
+    if isinstance(request.data, Mapping):
+        return request.data.get(name, default)
+    return default
+
+
+class LoginRateThrottle(SlidingWindowThrottle):
+    """Limite les tentatives de connexion par adresse IP et identifiant."""
+    scope = 'login'
+
+    def get_cache_key(self, request, view):
+        username = request_field(request, 'username')
+        ident = self.get_ident(request)
+        if username is not None:
+            ident = f'{ident}:{str(username).lower()}'
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+
+class RegisterRateThrottle(SlidingWindowThrottle):
+    """Limite les inscriptions par adresse IP."""
+    scope = 'register'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class OTPRequestRateThrottle(SlidingWindowThrottle):
+    """Limite les demandes de code OTP par email et par objet."""
+    scope = 'otp_request'
+
+    def get_cache_key(self, request, view):
+        email = request_field(request, 'email')
+        if not email:
+            return None
+        purpose = request_field(request, 'purpose', '')
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': f'{str(email).lower()}:{purpose}',
+        }
+
+
+class CheckOTPRateThrottle(OTPRequestRateThrottle):
+    """Limite les tentatives de vérification d'un code OTP par email et par objet."""
+    scope = 'check_otp'
@@ -0,0 +1,148 @@
+# accounts/uploads.py
+import os
+import re
+import tempfile
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from PIL import Image
+from rest_framework import serializers
+
+from .images import get_rendition_pipeline, strip_metadata
+from .models import ProfilePictureUpload, UserProfile
+
+READ_SIZE = 64 * 1024
+
+# Signatures des formats acceptés : (type MIME, extension, test sur les premiers octets)
+IMAGE_SIGNATURES = [
+    ('image/jpeg', 'jpg', lambda head: head.startswith(b'\xff\xd8\xff')),
+    ('image/png', 'png', lambda head: head.startswith(b'\x89PNG\r\n\x1a\n')),
+    ('image/gif', 'gif', lambda head: head[:6] in (b'GIF87a', b'GIF89a')),
+    ('image/webp', 'webp', lambda head: head[:4] == b'RIFF' and head[8:12] == b'WEBP'),
+]
+SIGNATURE_LENGTH = 12
+
+CONTENT_RANGE = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+CONTENT_LENGTH = re.compile(r'[0-9]+')
+
+
+def upload_settings():
+    config = getattr(settings, 'PROFILE_PICTURE_UPLOAD', {})
+    return {
+        'MAX_SIZE': config.get('MAX_SIZE', 20 * 1024 * 1024),
+        'MAX_CHUNK': config.get('MAX_CHUNK', 5 * 1024 * 1024),
+        'TEMP_DIR': config.get('TEMP_DIR') or os.path.join(
+            settings.FILE_UPLOAD_TEMP_DIR or tempfile.gettempdir(), 'accounts-uploads'
+        ),
+    }
+
+
+def part_path(upload):
+    """Fichier temporaire (hors de MEDIA_ROOT) recevant les morceaux d'un envoi."""
+    return os.path.join(upload_settings()['TEMP_DIR'], f'{upload.pk}.part')
+
+
+def content_type_extension(content_type):
+    for mime, extension, matches in IMAGE_SIGNATURES:
+        if mime == content_type:
+            return extension
+    return None
+
+
+def parse_content_range(value):
+    """Renvoie ``(début, fin, total)`` d'un en-tête ``Content-Range: bytes a-b/n``."""
+    match = CONTENT_RANGE.match(value or '')
+    if match is None:
+        raise serializers.ValidationError({'Content-Range': ["En-tête attendu : bytes <début>-<fin>/<taille>."]})
+    start, end, total = (int(group) for group in match.groups())
+    if end < start:
+        raise serializers.ValidationError({'Content-Range': ["Intervalle invalide."]})
+    return start, end, total
+
+
+def parse_content_length(value):
+    """Renvoie la longueur du corps annoncée par ``Content-Length`` (0 si absent)."""
+    if not value:
+        return 0
+    if CONTENT_LENGTH.fullmatch(value) is None:
+        raise serializers.ValidationError({'Content-Length': ["En-tête invalide."]})
+    return int(value)
+
+
+def write_chunk(upload, stream, start, length):
+    """
+    Écrit un morceau lu dans ``stream`` à la position ``start`` du fichier
+    temporaire, par blocs de ``READ_SIZE`` octets : la mémoire utilisée ne
+    dépend pas de la taille de l'envoi. Le type réel est vérifié dès les
+    premiers octets du fichier.
+
+    Écrire à une position donnée (et non en fin de fichier) rend le renvoi
+    d'un morceau sans effet de bord. Renvoie le nombre d'octets reçus.
+    """
+    path = part_path(upload)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    head = b'' if start == 0 else None
+    received = 0
+    with open(path, 'r+b' if os.path.exists(path) else 'wb') as part:
+        part.seek(start)
+        while received < length:
+            data = stream.read(min(READ_SIZE, length - received))
+            if not data:
+                break
+            if head is not None:
+                head += data[:SIGNATURE_LENGTH - len(head)]
+                if len(head) >= SIGNATURE_LENGTH or received + len(data) >= length:
+                    check_signature(upload, head)
+                    head = None
+            part.write(data)
+            received += len(data)
+    return received
+
+
+def check_signature(upload, head):
+    for mime, extension, matches in IMAGE_SIGNATURES:
+        if matches(head):
+            if mime != upload.content_type:
+                raise serializers.ValidationError(
+                    {'content_type': [f"Le fichier envoyé est de type {mime}, et non {upload.content_type}."]}
+                )
+            return
+    raise serializers.ValidationError({'content_type': ["Le fichier envoyé n'est pas une image acceptée."]})
+
+
+def complete(upload):
+    """
+    Vérifie l'image reçue et l'attache au profil de l'utilisateur.
+
+    L'image est enregistrée sans ses métadonnées (EXIF, dont la position
+    GPS : voir ``accounts.images.strip_metadata``). La photo du profil est
+    remplacée dans une transaction (ligne du profil verrouillée) ; les
+    déclinaisons sont ensuite générées en arrière-plan.
+    """
+    path = part_path(upload)
+    try:
+        with Image.open(path) as image:
+            image.verify()
+        content = strip_metadata(path)
+    except Exception:
+        abort(upload)
+        raise serializers.ValidationError({'detail': "Le fichier reçu n'est pas une image valide."})
+
+    name = f'{upload.pk}.{content_type_extension(upload.content_type)}'
+    with transaction.atomic():
+        profile = UserProfile.objects.select_for_update().get(user_id=upload.user_id)
+        profile.profile_picture.save(name, ContentFile(content), save=False)
+        profile.save(update_fields=['profile_picture'])
+        upload.delete()
+        get_rendition_pipeline().schedule(profile)
+    os.remove(path)
+    return profile
+
+
+def abort(upload):
+    """Abandonne un envoi et supprime le fichier temporaire."""
+    path = part_path(upload)
+    if os.path.exists(path):
+        os.remove(path)
+    upload.delete()
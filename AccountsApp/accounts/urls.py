@@ -1,7 +1,10 @@
 from django.urls import path
 from .views import (RegisterView, LogoutView, UserUpdateView, ChangePasswordView,
                       MyTokenObtainPairView, OTPRequestView,
-                     PasswordResetConfirmView, CheckOTPView) 
+                     PasswordResetConfirmView, CheckOTPView,
+                     ProfilePictureUploadView, ProfilePictureUploadChunkView,
+                     BulkUserActionView, BulkUserActionStatusView, UserListView,
+                     HashingPoolStatsView, AuthenticationCacheStatsView, BatchView) 
 from rest_framework_simplejwt.views import TokenRefreshView
 
 
@@ -10,12 +13,26 @@ urlpatterns = [
     
     path('login/', MyTokenObtainPairView.as_view(), name='login'),
 
+    path('token/refresh/', TokenRefreshView.as_view(), name='token-refresh'),
+
     path('logout/', LogoutView.as_view(), name='logout'),
     path('profile/', UserUpdateView.as_view(), name='profile'),
+    path('profile/picture-uploads/', ProfilePictureUploadView.as_view(), name='profile-picture-upload'),
+    path('profile/picture-uploads/<uuid:upload_id>/', ProfilePictureUploadChunkView.as_view(),
+         name='profile-picture-upload-chunk'),
 
     path('OTP-request/', OTPRequestView.as_view(), name='otp-request'),
     path('checkOTP/', CheckOTPView.as_view(), name='check-otp'),
 
+    # Personnel
+    path('users/', UserListView.as_view(), name='user-list'),
+    path('users/bulk/', BulkUserActionView.as_view(), name='bulk-user-action'),
+    path('users/bulk/<slug:job_id>/', BulkUserActionStatusView.as_view(), name='bulk-user-action-status'),
+    path('stats/hashing-pool/', HashingPoolStatsView.as_view(), name='hashing-pool-stats'),
+    path('stats/auth-cache/', AuthenticationCacheStatsView.as_view(), name='auth-cache-stats'),
+
     path('password-reset/confirm/', PasswordResetConfirmView.as_view(), name='password-reset-confirm'),
     path('change-password/', ChangePasswordView.as_view(), name='change-password'), # In user profile section
+
+    path('batch/', BatchView.as_view(), name='batch'),
 ]
@@ -22,6 +22,15 @@ def get_tokens_for_user(user):
 
 
 
+# Codes HTTP propres à certains messages d'authentification
+STATUS_BY_DETAIL = {
+    "Identifiants invalides.": 401,  # Unauthorized
+    "Votre compte n’est pas encore vérifié.": 403,  # Forbidden
+    # Locked (code HTTP un peu moins courant mais parfait pour "compte désactivé")
+    "Votre compte a été desactivé, veuillez contacter les administrateurs du site.": 423,
+}
+
+
 class CustomResponse:
     """
     Création d'une classe générique pour gérer toutes les réponses
@@ -46,18 +55,16 @@ class CustomResponse:
         error_message = {"detail": str(exception)}
 
         # Si l'exception a un attribut "detail" (comme ValidationError)
-        if hasattr(exception, 'detail'):
-            error_message = exception.detail if isinstance(exception.detail, dict) else {"detail": str(exception.detail)}
-
+        detail = getattr(exception, 'detail', None)
+        if isinstance(detail, dict):
+            # Renvoyé tel quel, sans copie ni conversion en chaîne
+            error_message = detail
+        elif isinstance(detail, str):
+            error_message = {"detail": detail}
             # Vérifie le message exact et adapte le status_code
-            detail_text = str(exception.detail)  # Transforme en string pour matcher
-
-            if detail_text == "Identifiants invalides.":
-                status_code = 401  # Unauthorized
-            elif detail_text == "Votre compte n’est pas encore vérifié.":
-                status_code = 403  # Forbidden
-            elif detail_text == "Votre compte a été desactivé, veuillez contacter les administrateurs du site.":
-                status_code = 423  # Locked (code HTTP un peu moins courant mais parfait pour "compte désactivé")
+            status_code = STATUS_BY_DETAIL.get(detail, status_code)
+        elif detail is not None:
+            error_message = {"detail": str(detail)}
 
         return Response({
             "status_code": status_code,
@@ -1,24 +1,42 @@
-from .models import UserProfile
+import os
+
+from .models import UserProfile, ProfilePictureUpload, UserModel
 from django.contrib.auth import (get_user_model, 
                                  update_session_auth_hash, logout
                                  )
-from rest_framework import generics, status, permissions
+from rest_framework import generics, status, permissions, serializers
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from .utils import get_tokens_for_user
 
 from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_api_settings
 from .serializers import ( UserRegistrationSerializer, UserUpdateSerializer, 
                            ChangePasswordSerializer, MyTokenObtainPairSerializer, 
                            UserSerializer, OTPRequestSerializer, 
-                           PasswordResetConfirmSerializer, CheckOTPSerializer
+                           PasswordResetConfirmSerializer, CheckOTPSerializer,
+                           ProfilePictureUploadSerializer, BulkUserActionSerializer,
+                           BatchRequestSerializer
                             )
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
 from drf_spectacular.utils import extend_schema
 from django.conf import settings
+from django.utils.http import parse_etags
 from .utils import CustomResponse
+from .mixins import AsyncAPIViewMixin
+from .filters import UserFilter
+from .pagination import UserKeysetPagination
+from . import batch, bulk, hashing, uploads
+from django.urls import reverse
+from django.shortcuts import get_object_or_404
+from .revocation import get_revocation_store
+from .otp import get_otp_backend
+from .cache import get_profile_cache, get_token_cache, get_user_cache
+from .throttling import LoginRateThrottle, RegisterRateThrottle, OTPRequestRateThrottle, CheckOTPRateThrottle
 
 from rest_framework.exceptions import APIException
+from asgiref.sync import sync_to_async
 
 
 User = get_user_model()
@@ -26,17 +44,22 @@ token_generator = PasswordResetTokenGenerator()
 
 # Inscription
 @extend_schema(tags=["Accounts - Register"])
-class RegisterView(generics.CreateAPIView):
+class RegisterView(AsyncAPIViewMixin, generics.CreateAPIView):
     """
     Vue pour l'inscription des utilisateurs.
     
     Permet de créer un nouvel utilisateur avec les informations de base.
     Un code OTP est généré pour la vérification de l'email.
+    Le hachage du mot de passe est confié au pool de hachage.
     """
     serializer_class = UserRegistrationSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [RegisterRateThrottle]
 
-    def create(self, request, *args, **kwargs):
+    async def post(self, request, *args, **kwargs):
+        return await self.create(request, *args, **kwargs)
+
+    async def create(self, request, *args, **kwargs):
         """
         Crée un nouvel utilisateur et renvoie une réponse personnalisée.
         
@@ -44,24 +67,27 @@ class RegisterView(generics.CreateAPIView):
         """
         try:
             serializer = self.get_serializer(data=request.data)
-            serializer.is_valid(raise_exception=True)
-            serializer.save()  # Ajoutez cette ligne pour créer l'utilisateur
+            await sync_to_async(serializer.is_valid)(raise_exception=True)
+            password_hash = await hashing.amake_password(serializer.validated_data['password'])
+            await sync_to_async(serializer.save)(password_hash=password_hash)
             return CustomResponse.response(serializer.data, status_code=status.HTTP_201_CREATED)
         except APIException as e:
             return CustomResponse.error(e)
 
 
 @extend_schema(tags=["Accounts - Login"])
-class MyTokenObtainPairView(TokenObtainPairView):
+class MyTokenObtainPairView(AsyncAPIViewMixin, TokenObtainPairView):
     """
     Vue personnalisée pour l'obtention de tokens JWT.
     
     Utilise un serializer personnalisé qui effectue des vérifications
     supplémentaires et inclut des informations sur l'expiration des tokens.
+    La vérification du mot de passe est confiée au pool de hachage.
     """
+    throttle_classes = [LoginRateThrottle]
     serializer_class = MyTokenObtainPairSerializer
 
-    def post(self, request, *args, **kwargs):
+    async def post(self, request, *args, **kwargs):
         """
         Valide les identifiants et génère les tokens JWT.
         
@@ -70,8 +96,12 @@ class MyTokenObtainPairView(TokenObtainPairView):
         serializer = self.get_serializer(data=request.data)
 
         try:
-            serializer.is_valid(raise_exception=True)
-            return CustomResponse.response(serializer.validated_data, status_code=status.HTTP_200_OK)
+            attrs = serializer.to_internal_value(request.data)
+            user = await sync_to_async(serializer.get_user)(attrs)
+            password_ok = await hashing.acheck_password(user, attrs.get('password'))
+            serializer.check_user(user, password_ok)
+            data = await sync_to_async(serializer.get_token_data)(user)
+            return CustomResponse.response(data, status_code=status.HTTP_200_OK)
 
         except APIException as e:
             return CustomResponse.error(e)
@@ -87,12 +117,27 @@ class LogoutView(APIView):
     """
     Vue pour la déconnexion des utilisateurs.
     
-    Nécessite une authentification et invalide la session courante.
+    Nécessite une authentification. Révoque le token d'accès utilisé (et le
+    token de rafraîchissement s'il est fourni) puis invalide la session courante.
     """
     permission_classes = [permissions.IsAuthenticated]
     
     def post(self, request, format=None):
-        """Déconnecte l'utilisateur en invalidant sa session."""
+        """Déconnecte l'utilisateur en révoquant ses tokens JWT et en invalidant sa session."""
+        store = get_revocation_store()
+        if request.auth is not None:
+            store.revoke(request.auth)
+
+        refresh = request.data.get('refresh')
+        if refresh:
+            try:
+                refresh_token = RefreshToken(refresh)
+            except TokenError:
+                refresh_token = None
+            # On ne révoque que les tokens appartenant à l'utilisateur connecté
+            if refresh_token is not None and str(refresh_token.get(jwt_api_settings.USER_ID_CLAIM)) == str(request.user.pk):
+                store.revoke(refresh_token)
+
         logout(request)
         return Response({"message": "Vous etes déconnecté"}, status=status.HTTP_200_OK)
 
@@ -117,11 +162,39 @@ class UserUpdateView(generics.RetrieveUpdateAPIView):
         Récupère les informations de l'utilisateur (GET).
         
         Renvoie une réponse personnalisée avec les données du profil.
+        Le profil sérialisé est mis en cache avec sa version (``ETag``) :
+        un client qui renvoie cette version dans ``If-None-Match`` reçoit
+        un 304 sans requête SQL ni sérialisation.
         """
         try:
-            instance = self.get_object()
-            serializer = self.get_serializer(instance)
-            return CustomResponse.response(serializer.data, status_code=status.HTTP_200_OK)
+            cache = get_profile_cache()
+            if not cache.enabled:
+                payload = self.get_serializer(self.get_object()).data
+                return CustomResponse.response(payload, status_code=status.HTTP_200_OK)
+
+            version, payload = cache.lookup(request.user.pk)
+            etag = cache.etag(version)
+            headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+
+            if_none_match = request.headers.get('If-None-Match')
+            if if_none_match:
+                etags = {tag.removeprefix('W/') for tag in parse_etags(if_none_match)}
+                if etag in etags or '*' in etags:
+                    cache.record('not_modified')
+                    return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+            if payload is None:
+                cache.record('miss')
+                instance = self.get_object()
+                payload = self.get_serializer(instance).data
+                cache.store(request.user.pk, version, payload)
+            else:
+                cache.record('hit')
+
+            response = CustomResponse.response(payload, status_code=status.HTTP_200_OK)
+            for name, value in headers.items():
+                response[name] = value
+            return response
         except APIException as e:
             return CustomResponse.error(e)
 
@@ -143,9 +216,234 @@ class UserUpdateView(generics.RetrieveUpdateAPIView):
             return CustomResponse.error(str(e), status_code=status.HTTP_400_BAD_REQUEST)
 
 
+# Envoi fractionné de la photo de profil
+@extend_schema(tags=["Accounts - Profile Picture Upload"])
+class ProfilePictureUploadView(generics.CreateAPIView):
+    """
+    Vue pour l'ouverture d'un envoi fractionné de la photo de profil.
+
+    Le client annonce la taille et le type de l'image, puis envoie le
+    fichier par morceaux sur l'URL de l'envoi (``ProfilePictureUploadChunkView``).
+    """
+    serializer_class = ProfilePictureUploadSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def create(self, request, *args, **kwargs):
+        try:
+            serializer = self.get_serializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            serializer.save(user=request.user)
+            data = dict(serializer.data, chunk_size=uploads.upload_settings()['MAX_CHUNK'])
+            return CustomResponse.response(data, status_code=status.HTTP_201_CREATED)
+        except APIException as e:
+            return CustomResponse.error(e)
+
+
+@extend_schema(tags=["Accounts - Profile Picture Upload"])
+class ProfilePictureUploadChunkView(APIView):
+    """
+    Vue pour l'envoi des morceaux d'une photo de profil.
+
+    - GET : position atteinte (reprise après une interruption) ;
+    - PUT : morceau suivant, avec ``Content-Range: bytes <début>-<fin>/<taille>``.
+      Le corps est copié par blocs dans un fichier temporaire sans être
+      chargé en mémoire. Le dernier morceau attache l'image au profil et
+      renvoie le profil mis à jour ;
+    - DELETE : abandon de l'envoi.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_object(self):
+        return get_object_or_404(ProfilePictureUpload, pk=self.kwargs['upload_id'], user=self.request.user)
+
+    def get(self, request, *args, **kwargs):
+        upload = self.get_object()
+        return CustomResponse.response(ProfilePictureUploadSerializer(upload).data, status_code=status.HTTP_200_OK)
+
+    def put(self, request, *args, **kwargs):
+        upload = self.get_object()
+        try:
+            start, end, total = uploads.parse_content_range(request.headers.get('Content-Range'))
+            if total != upload.size or start != upload.offset or end >= upload.size:
+                # Morceau déjà reçu, manquant ou hors du fichier : le client reprend à ``offset``
+                return CustomResponse.response(
+                    {'detail': "Le morceau ne correspond pas à la position de l'envoi.", 'offset': upload.offset},
+                    status_code=status.HTTP_409_CONFLICT,
+                )
+            length = end - start + 1
+            if length > uploads.upload_settings()['MAX_CHUNK']:
+                return CustomResponse.response(
+                    {'detail': "Morceau trop volumineux.", 'chunk_size': uploads.upload_settings()['MAX_CHUNK']},
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                )
+            if uploads.parse_content_length(request.META.get('CONTENT_LENGTH')) != length:
+                raise serializers.ValidationError({'Content-Range': ["La longueur du corps ne correspond pas à l'intervalle."]})
+
+            try:
+                received = uploads.write_chunk(upload, request.stream, start, length)
+            except serializers.ValidationError:
+                uploads.abort(upload)
+                raise
+            if received != length:
+                raise serializers.ValidationError({'detail': "Morceau incomplet, renvoyez-le."})
+
+            # Deux envois concurrents du même morceau : un seul fait avancer la position
+            if not ProfilePictureUpload.objects.filter(pk=upload.pk, offset=start).update(offset=end + 1):
+                upload.refresh_from_db(fields=['offset'])
+                return CustomResponse.response(
+                    {'detail': "Le morceau ne correspond pas à la position de l'envoi.", 'offset': upload.offset},
+                    status_code=status.HTTP_409_CONFLICT,
+                )
+            upload.offset = end + 1
+
+            if upload.offset < upload.size:
+                return CustomResponse.response(
+                    ProfilePictureUploadSerializer(upload).data, status_code=status.HTTP_200_OK
+                )
+            profile = uploads.complete(upload)
+            profile = UserProfile.objects.select_related('user', 'address').get(pk=profile.pk)
+            data = UserUpdateSerializer(profile, context={'request': request}).data
+            return CustomResponse.response(data, status_code=status.HTTP_200_OK)
+        except APIException as e:
+            return CustomResponse.error(e)
+
+    def delete(self, request, *args, **kwargs):
+        uploads.abort(self.get_object())
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+# Annuaire des utilisateurs (personnel)
+@extend_schema(tags=["Accounts - Staff"])
+class UserListView(generics.ListAPIView):
+    """
+    Vue pour la liste des utilisateurs (personnel uniquement).
+
+    Paginée par curseur sur ``(user_registered_at, id)``, du plus récent au
+    plus ancien : le coût d'une page ne dépend pas de sa position. Filtres :
+    ``is_active``, ``is_verify``, ``registered_after``, ``registered_before``
+    et ``email`` (début de l'email).
+    """
+    serializer_class = UserSerializer
+    permission_classes = [permissions.IsAdminUser]
+    pagination_class = UserKeysetPagination
+    filterset_class = UserFilter
+    queryset = UserModel.objects.only(*UserSerializer.Meta.fields, 'user_registered_at')
+
+
+# Actions en masse du personnel
+@extend_schema(tags=["Accounts - Staff"])
+class BulkUserActionView(APIView):
+    """
+    Vue pour les actions en masse sur des comptes (personnel uniquement).
+
+    Active, désactive, vérifie ou renvoie un code de vérification aux
+    comptes indiqués par lots d'UPDATE ensemblistes. Au-delà de
+    ``BULK_ACTIONS['BACKGROUND_ABOVE']`` comptes, l'action est exécutée en
+    arrière-plan : la réponse 202 renvoie la tâche, dont l'avancement est
+    consultable sur l'URL de l'en-tête ``Location``.
+    """
+    permission_classes = [permissions.IsAdminUser]
+    serializer_class = BulkUserActionSerializer
+
+    def post(self, request, *args, **kwargs):
+        try:
+            serializer = self.serializer_class(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            job, background = bulk.apply_action(
+                serializer.validated_data['action'],
+                serializer.validated_data['user_ids'],
+                requested_by=request.user.pk,
+            )
+            if not background:
+                return CustomResponse.response(job, status_code=status.HTTP_200_OK)
+            response = CustomResponse.response(job, status_code=status.HTTP_202_ACCEPTED)
+            response['Location'] = reverse('bulk-user-action-status', args=[job['job_id']])
+            return response
+        except APIException as e:
+            return CustomResponse.error(e)
+
+
+@extend_schema(tags=["Accounts - Staff"])
+class BulkUserActionStatusView(APIView):
+    """Vue pour l'avancement d'une action en masse exécutée en arrière-plan."""
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, job_id, *args, **kwargs):
+        job = bulk.get_bulk_runner().status(job_id)
+        if job is None:
+            return CustomResponse.response({'detail': "Tâche introuvable ou expirée."},
+                                           status_code=status.HTTP_404_NOT_FOUND)
+        return CustomResponse.response(job, status_code=status.HTTP_200_OK)
+
+
+@extend_schema(tags=["Accounts - Staff"])
+class HashingPoolStatsView(APIView):
+    """
+    Vue pour les métriques du pool de hachage des mots de passe (personnel
+    uniquement) : saturation, rejets et temps d'attente dans la file.
+
+    Les métriques sont propres au processus qui répond, identifié par ``pid``.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        stats = dict(hashing.get_hashing_pool().stats(), pid=os.getpid())
+        return CustomResponse.response(stats, status_code=status.HTTP_200_OK)
+
+
+@extend_schema(tags=["Accounts - Staff"])
+class AuthenticationCacheStatsView(APIView):
+    """
+    Vue pour les métriques des caches de l'authentification JWT (personnel
+    uniquement) : tokens déjà vérifiés et utilisateurs authentifiés.
+
+    Les métriques sont propres au processus qui répond, identifié par ``pid``.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        stats = {
+            'tokens': get_token_cache().stats(),
+            'users': get_user_cache().stats(),
+            'pid': os.getpid(),
+        }
+        return CustomResponse.response(stats, status_code=status.HTTP_200_OK)
+
+
+# Requêtes groupées
+@extend_schema(tags=["Accounts - Batch"])
+class BatchView(APIView):
+    """
+    Vue pour l'exécution de plusieurs requêtes en un seul aller-retour.
+
+    Reçoit une liste ordonnée de sous-requêtes vers les routes de
+    ``api/accounts/`` et renvoie, dans le même ordre, le code, les en-têtes
+    utiles et le corps de chacune. Chaque sous-requête est authentifiée avec
+    l'en-tête ``Authorization`` de l'appel (voir
+    ``accounts.batch.BatchDispatcher``). Le rafraîchissement du token
+    (``token/refresh/``) peut y figurer tant que le token d'accès de l'appel
+    est encore valide.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = BatchRequestSerializer
+
+    def post(self, request, *args, **kwargs):
+        try:
+            serializer = self.serializer_class(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            responses = batch.get_batch_dispatcher().dispatch(
+                request,
+                serializer.validated_data['requests'],
+                parallel=serializer.validated_data['parallel'],
+            )
+            return CustomResponse.response({'responses': responses}, status_code=status.HTTP_200_OK)
+        except APIException as e:
+            return CustomResponse.error(e)
+
+
 # Changement de mot de passe
 @extend_schema(tags=["Accounts - Change Password"])
-class ChangePasswordView(generics.UpdateAPIView):
+class ChangePasswordView(AsyncAPIViewMixin, generics.UpdateAPIView):
     """
     Vue pour le changement de mot de passe.
     
@@ -158,8 +456,14 @@ class ChangePasswordView(generics.UpdateAPIView):
     def get_object(self):
         """Récupère l'utilisateur authentifié."""
         return self.request.user
-    
-    def update(self, request, *args, **kwargs):
+
+    async def put(self, request, *args, **kwargs):
+        return await self.update(request, *args, **kwargs)
+
+    async def patch(self, request, *args, **kwargs):
+        return await self.update(request, *args, **kwargs)
+
+    async def update(self, request, *args, **kwargs):
         """
         Met à jour le mot de passe de l'utilisateur.
         
@@ -168,15 +472,24 @@ class ChangePasswordView(generics.UpdateAPIView):
         user = self.get_object()
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
-            if not user.check_password(serializer.validated_data.get("old_password")):
-                return Response({"old_password": ["Mot de passe actuel incorrect."]}, status=status.HTTP_400_BAD_REQUEST)
-            user.set_password(serializer.validated_data.get("new_password"))
-            user.save()
-            # Pour éviter que l'utilisateur soit déconnecté après le changement de mot de passe
-            update_session_auth_hash(request, user)
+            try:
+                if not await hashing.acheck_password(user, serializer.validated_data.get("old_password")):
+                    return Response({"old_password": ["Mot de passe actuel incorrect."]}, status=status.HTTP_400_BAD_REQUEST)
+                new_password = serializer.validated_data.get("new_password")
+                hashing.set_password(user, new_password, await hashing.amake_password(new_password))
+            except APIException as e:
+                return CustomResponse.error(e)
+            await sync_to_async(self.save_password)(request, user)
             return Response({"message": "Mot de passe modifié avec succès"}, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    def save_password(self, request, user):
+        """Enregistre le nouveau hash et conserve la session courante."""
+        # L'instance peut venir du cache d'authentification : on n'écrit que le mot de passe
+        user.save(update_fields=['password'])
+        # Pour éviter que l'utilisateur soit déconnecté après le changement de mot de passe
+        update_session_auth_hash(request, user)
+
 
 @extend_schema(tags=["Accounts - OTP Request"])
 class OTPRequestView(APIView):
@@ -187,6 +500,7 @@ class OTPRequestView(APIView):
     la réinitialisation de mot de passe.
     """
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [OTPRequestRateThrottle]
     serializer_class = OTPRequestSerializer
 
     def post(self, request, *args, **kwargs):
@@ -212,6 +526,7 @@ class CheckOTPView(APIView):
     """
     permission_classes = [permissions.AllowAny]
     serializer_class = CheckOTPSerializer
+    throttle_classes = [CheckOTPRateThrottle]
 
     def post(self, request, *args, **kwargs):
         """
@@ -223,23 +538,13 @@ class CheckOTPView(APIView):
         """
         serializer = CheckOTPSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        user = serializer.user
-        otp_request = serializer.otp_request
-
-        otp_request.used = True
-
-        if otp_request.purpose == 'register':
-            user.is_verify = True  # Valide le compte utilisateur
-            otp_request.otp_code = None
-            user.save()
-
-        otp_request.save()
+        serializer.save()  # Consommation de l'OTP (et validation du compte)
 
         return Response({"message": "OTP vérifié avec succès."}, status=status.HTTP_200_OK)
 
 
 @extend_schema(tags=["Accounts - Reset Password"])
-class PasswordResetConfirmView(APIView):
+class PasswordResetConfirmView(AsyncAPIViewMixin, APIView):
     """
     Vue pour la confirmation de réinitialisation de mot de passe.
     
@@ -248,24 +553,27 @@ class PasswordResetConfirmView(APIView):
     permission_classes = [permissions.AllowAny]
     serializer_class = PasswordResetConfirmSerializer
 
-    def post(self, request, *args, **kwargs):
+    async def post(self, request, *args, **kwargs):
         """
         Réinitialise le mot de passe de l'utilisateur.
         
         Vérifie que l'OTP a bien été validé et que les nouveaux mots de passe correspondent.
         """
         serializer = PasswordResetConfirmSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
 
         user = serializer.user
-        otp_request = serializer.otp_request
 
-        # Réinitialiser le mot de passe
-        user.set_password(serializer.validated_data['new_password'])
+        # Réinitialiser le mot de passe (hachage dans le pool dédié)
+        new_password = serializer.validated_data['new_password']
+        hashing.set_password(user, new_password, await hashing.amake_password(new_password))
+        await sync_to_async(self.save_reset)(user)
+
+        return Response({"message": "Mot de passe réinitialisé avec succès."}, status=200)
+
+    def save_reset(self, user):
+        """Enregistre le nouveau mot de passe et marque l'OTP comme utilisé."""
         user.save()
 
         # Marquer l'OTP comme utilisé
-        otp_request.otp_code = None
-        otp_request.save()
-
-        return Response({"message": "Mot de passe réinitialisé avec succès."}, status=200)
+        get_otp_backend().redeem(user, 'reset_password')
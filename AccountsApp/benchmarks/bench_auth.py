@@ -0,0 +1,57 @@
+"""
+Coût de l'authentification JWT par requête : ``UserCache`` désactivé (une
+requête SQL par requête HTTP) contre cache partagé avec jeton de version
+(un cache en mémoire dimensionné pour tous les utilisateurs tient lieu de
+Redis ici).
+
+    python benchmarks/bench_auth.py [nombre d'utilisateurs]
+"""
+import sys
+from unittest import mock
+
+from common import create_users, measure, report, test_database
+
+
+def run(count):
+    from django.test import override_settings
+    from django.urls import reverse
+    from rest_framework.test import APIClient, APIRequestFactory
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from accounts.authentication import CachedJWTAuthentication
+    from accounts.cache import UserCache
+    from accounts.models import UserModel
+    from accounts.revocation import get_revocation_store
+
+    users = create_users(count)
+    tokens = {user.pk: f'Bearer {AccessToken.for_user(user)}' for user in users}
+    # Filtre de révocation construit : seul le coût de l'utilisateur varie
+    get_revocation_store().rebuild()
+    factory = APIRequestFactory()
+    client = APIClient()
+    shared = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'bench-auth',
+        'OPTIONS': {'MAX_ENTRIES': 4 * count},
+    }
+    rows = {}
+    with override_settings(CACHES={'default': shared}):
+        for name, shared_cache in (('sans cache', None), ('cache partagé', 'default')):
+            user_cache = UserCache(UserModel, shared_cache=shared_cache)
+            with mock.patch('accounts.authentication.get_user_cache', return_value=user_cache):
+                authenticate = CachedJWTAuthentication().authenticate
+                # Premier passage : tokens décodés, utilisateurs mis en cache
+                for user in users:
+                    authenticate(factory.get('/', HTTP_AUTHORIZATION=tokens[user.pk]))
+                rows[f'authenticate ({name})'] = measure(
+                    lambda user: authenticate(factory.get('/', HTTP_AUTHORIZATION=tokens[user.pk])), users
+                )
+                rows[f'GET profile/ ({name})'] = measure(
+                    lambda user: client.get(reverse('profile'), HTTP_AUTHORIZATION=tokens[user.pk]), users
+                )
+    report(f'Authentification JWT, {count} utilisateurs', rows)
+
+
+if __name__ == '__main__':
+    with test_database():
+        run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,46 @@
+"""
+Recherche d'un compte par email (OTP, réinitialisation du mot de passe,
+connexion par email) : ``email__iexact``, lu par un parcours complet de la
+table, contre ``get_by_email`` (``Lower(email)``, index unique
+``user_email_lower_uniq``).
+
+    python benchmarks/bench_email_lookup.py [nombre de comptes] [recherches]
+"""
+import random
+import sys
+
+from common import measure, report, test_database
+
+
+def seed(count):
+    """Crée ``count`` comptes par lots, sans profil (seul l'email compte ici)."""
+    from accounts.models import UserModel
+
+    for start in range(0, count, 10000):
+        UserModel.objects.bulk_create([
+            UserModel(username=f'user{index}', email=f'User{index}@Example.com', first_name='Jean',
+                      last_name='Dupont', telephone_number='', password='!')
+            for index in range(start, min(start + 10000, count))
+        ])
+
+
+def run(count, lookups):
+    from accounts.models import UserModel
+
+    seed(count)
+    emails = [f'user{random.randrange(count)}@example.com' for _ in range(lookups)]
+    rows = {
+        'email__iexact (avant)': measure(lambda email: UserModel.objects.get(email__iexact=email), emails),
+        'get_by_email (après)': measure(UserModel.objects.get_by_email, emails),
+    }
+    report(f'Recherche par email, {count} comptes, {lookups} recherches', rows)
+    for label, queryset in (('avant', UserModel.objects.filter(email__iexact=emails[0])),
+                            ('après', UserModel.objects.filter_by_emails(emails[:1]))):
+        print(f'{label:<8}{queryset.explain()}')
+
+
+if __name__ == '__main__':
+    arguments = [int(value) for value in sys.argv[1:3]]
+    count, lookups = arguments + [100000, 200][len(arguments):]
+    with test_database():
+        run(count, lookups)
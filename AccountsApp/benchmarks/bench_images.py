@@ -0,0 +1,62 @@
+"""
+Photos de profil : coût de la réception (retrait des métadonnées) et de la
+génération des déclinaisons, et octets servis par affichage d'un profil
+(original contre déclinaisons).
+
+    python benchmarks/bench_images.py [nombre de photos] [largeur] [hauteur]
+"""
+import io
+import os
+import sys
+
+from common import measure, report, test_database
+
+
+def photo(width, height):
+    """JPEG proche d'une photo de téléphone : dégradé bruité et EXIF (GPS)."""
+    from PIL import Image
+
+    noise = Image.frombytes('L', (width, height), os.urandom(width * height))
+    image = Image.merge('RGB', (
+        Image.linear_gradient('L').resize((width, height)),
+        Image.linear_gradient('L').rotate(90).resize((width, height)),
+        Image.blend(noise, Image.new('L', (width, height), 128), 0.8),
+    ))
+    exif = Image.Exif()
+    exif[0x010F] = 'Appareil'
+    exif.get_ifd(0x8825)[2] = (48.0, 51.0, 24.0)
+    buffer = io.BytesIO()
+    image.save(buffer, 'JPEG', quality=92, exif=exif)
+    return buffer.getvalue()
+
+
+def run(count, width, height):
+    from django.conf import settings
+
+    from accounts.images import render, strip_metadata
+
+    config = settings.PROFILE_PICTURE_RENDITIONS
+    sizes, image_format, quality = config['SIZES'], config['FORMAT'], config['QUALITY']
+    photos = [photo(width, height) for _ in range(count)]
+    rows = {
+        'réception : retrait métadonnées': measure(lambda data: strip_metadata(io.BytesIO(data)), photos),
+        f'déclinaisons {"/".join(map(str, sizes))}': measure(
+            lambda data: render(io.BytesIO(data), sizes, image_format, quality), photos),
+    }
+    report(f'Photos de profil, {count} photos {width}x{height}', rows)
+
+    original = photos[0]
+    stripped = strip_metadata(io.BytesIO(original))
+    renditions = render(io.BytesIO(stripped), sizes, image_format, quality)
+    print(f"\n{'fichier servi':<34}{'octets':>12}{'EXIF':>8}")
+    print(f"{'original envoyé':<34}{len(original):>12}{'oui':>8}")
+    print(f"{'original enregistré':<34}{len(stripped):>12}{'non':>8}")
+    for size, content in renditions.items():
+        print(f"{f'déclinaison {size} px ({image_format})':<34}{len(content):>12}{'non':>8}")
+
+
+if __name__ == '__main__':
+    arguments = [int(value) for value in sys.argv[1:4]]
+    count, width, height = arguments + [10, 3000, 2000][len(arguments):]
+    with test_database():
+        run(count, width, height)
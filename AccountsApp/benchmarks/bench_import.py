@@ -0,0 +1,94 @@
+"""
+Import en masse (``manage.py import_users``) contre la création compte par
+compte (``save()`` : INSERT de l'utilisateur, puis du profil et de
+l'email de bienvenue par le signal ``post_save``).
+
+Deux mesures : l'écriture en base seule, avec des hashs déjà calculés
+(colonne ``password_hash``), puis le hachage PBKDF2 des mots de passe en
+clair, sans pool et avec le pool de processus de la commande.
+
+    python benchmarks/bench_import.py [comptes écrits] [mots de passe hachés]
+"""
+import csv
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from common import test_database
+
+
+def write_csv(directory, name, count, **columns):
+    path = os.path.join(directory, f'{name}.csv')
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, ['email', 'first_name', 'last_name', 'password', 'password_hash'])
+        writer.writeheader()
+        writer.writerows({'email': f'{name}{index}@example.com', 'first_name': 'Jean', 'last_name': 'Dupont',
+                          **columns} for index in range(count))
+    return path
+
+
+def timed(fn):
+    """Renvoie ``(durée en s, requêtes SQL)`` d'un appel de ``fn``."""
+    from django.db import connection
+
+    queries = []
+
+    def count(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count):
+        started = time.perf_counter()
+        fn()
+        return time.perf_counter() - started, len(queries)
+
+
+def run(count, hashed):
+    from django.contrib.auth.hashers import make_password
+
+    directory = tempfile.mkdtemp(prefix='bench-import-')
+    try:
+        compare(directory, count, hashed, make_password('Secr3t!pass'))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def compare(directory, count, hashed, password_hash):
+    from django.core.management import call_command
+
+    from accounts.models import UserModel
+
+    def create_one_by_one():
+        for index in range(count):
+            UserModel.objects.create(username=f'one{index}@example.com', email=f'one{index}@example.com',
+                                     first_name='Jean', last_name='Dupont', telephone_number='',
+                                     password=password_hash, is_active=True)
+
+    def import_users(path, *args):
+        return lambda: call_command('import_users', path, *args, '--welcome-email',
+                                    stdout=io.StringIO(), stderr=io.StringIO())
+
+    rows = {
+        'save(), compte par compte': (count, create_one_by_one),
+        'import_users, hashs fournis': (
+            count, import_users(write_csv(directory, 'hash', count, password_hash=password_hash), '--processes', '0')),
+        'import_users, hachage sans pool': (
+            hashed, import_users(write_csv(directory, 'plain', hashed, password='Secr3t!pass'), '--processes', '0')),
+        f'import_users, pool ({os.cpu_count()} CPU)': (
+            hashed, import_users(write_csv(directory, 'pool', hashed, password='Secr3t!pass'))),
+    }
+    print(f"\nImport de comptes ({count} écrits, {hashed} hachés)")
+    print(f"{'':<38}{'comptes/s':>12}{'requêtes/compte':>18}")
+    for label, (total, fn) in rows.items():
+        duration, queries = timed(fn)
+        print(f"{label:<38}{total / duration:>12.0f}{queries / total:>18.2f}")
+
+
+if __name__ == '__main__':
+    arguments = [int(value) for value in sys.argv[1:3]]
+    count, hashed = arguments + [2000, 8][len(arguments):]
+    with test_database():
+        run(count, hashed)
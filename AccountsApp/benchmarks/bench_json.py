@@ -0,0 +1,59 @@
+"""
+Rendu et lecture du JSON des réponses : ``JSONRenderer``/``JSONParser`` de
+DRF (module ``json`` standard) contre ``FastJSONRenderer``/``FastJSONParser``
+(orjson), sur des réponses de connexion, de profil et de liste
+d'utilisateurs.
+
+    python benchmarks/bench_json.py [répétitions]
+"""
+import io
+import sys
+
+from common import create_users, measure, report, test_database
+
+
+def payloads():
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from accounts.models import UserModel, UserProfile
+    from accounts.serializers import UserSerializer, UserUpdateSerializer
+
+    users = create_users(100)
+    profile = UserProfile.objects.select_related('user', 'address').get(user=users[0])
+    refresh = RefreshToken.for_user(profile.user)
+    return {
+        'connexion': {'success': True, 'status': 200, 'message': 'Connexion réussie.',
+                      'body': {'refresh': str(refresh), 'access': str(refresh.access_token)}},
+        'profil': {'success': True, 'status': 200, 'message': '',
+                   'body': UserUpdateSerializer(profile).data},
+        'utilisateurs (100)': {'count': len(users), 'next': None, 'previous': None,
+                               'results': UserSerializer(users, many=True).data},
+    }
+
+
+def run(repeat):
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from accounts.parsers import FastJSONParser
+    from accounts.renderers import FastJSONRenderer
+
+    rows = {}
+    sizes = {}
+    for name, data in payloads().items():
+        body = JSONRenderer().render(data)
+        assert FastJSONRenderer().render(data) == body
+        sizes[name] = len(body)
+        for label, renderer, parser in (('DRF', JSONRenderer(), JSONParser()),
+                                        ('orjson', FastJSONRenderer(), FastJSONParser())):
+            rows[f'rendu {name} ({label})'] = measure(lambda _: renderer.render(data), range(repeat))
+            rows[f'lecture {name} ({label})'] = measure(
+                lambda _: parser.parse(io.BytesIO(body), 'application/json', {}), range(repeat))
+    report(f'JSON, {repeat} répétitions', rows)
+    for name, size in sizes.items():
+        print(f'{name:<20}{size:>8} octets (identiques)')
+
+
+if __name__ == '__main__':
+    with test_database():
+        run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,55 @@
+"""
+Coût d'une connexion (``login/``) : requêtes SQL, hachages PBKDF2 et paires
+de tokens par connexion, avant (copie de l'ancienne validation, qui
+authentifiait une seconde fois via ``super().validate()``) et après.
+
+    python benchmarks/bench_login.py [nombre de connexions]
+"""
+import sys
+from unittest import mock
+
+from common import create_users, measure, report, test_database
+
+
+def run(count):
+    from django.contrib.auth.hashers import PBKDF2PasswordHasher
+    from rest_framework.exceptions import AuthenticationFailed
+    from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from accounts.models import UserModel
+    from accounts.serializers import MyTokenObtainPairSerializer
+
+    class BaselineSerializer(MyTokenObtainPairSerializer):
+        def validate(self, attrs):
+            try:
+                user = UserModel.objects.get(**{self.username_field: attrs.get(self.username_field)})
+                if not user.check_password(attrs.get('password')):
+                    raise AuthenticationFailed("Identifiants invalides.")
+            except UserModel.DoesNotExist:
+                raise AuthenticationFailed("Identifiants invalides.")
+            data = TokenObtainPairSerializer.validate(self, attrs)
+            self.get_token(self.user)
+            return data
+
+    users = create_users(count)
+    rows = {}
+    counts = {}
+    for name, serializer_class in (('avant', BaselineSerializer), ('après', MyTokenObtainPairSerializer)):
+        def login(user):
+            serializer = serializer_class(data={'username': user.username, 'password': 'Secr3t!pass'})
+            assert serializer.is_valid(), serializer.errors
+
+        with mock.patch.object(PBKDF2PasswordHasher, 'encode', autospec=True,
+                               side_effect=PBKDF2PasswordHasher.encode) as hashes, \
+                mock.patch.object(RefreshToken, 'for_user', wraps=RefreshToken.for_user) as pairs:
+            rows[f'login ({name})'] = measure(login, users)
+        counts[name] = (hashes.call_count / count, pairs.call_count / count)
+    report(f'Connexion, {count} connexions', rows)
+    for name, (hashes, pairs) in counts.items():
+        print(f'{name:<8}hachages/connexion : {hashes:.1f}   paires de tokens/connexion : {pairs:.1f}')
+
+
+if __name__ == '__main__':
+    with test_database():
+        run(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,88 @@
+"""
+Débit d'envoi des emails : une connexion SMTP par message (``send_mail``)
+contre ``MailConnectionPool`` (connexions persistantes, lots de
+``batch_size``), sur un serveur SMTP local minimal. ``--handshake`` simule
+en millisecondes le coût de l'établissement d'une connexion (TLS, AUTH)
+d'un vrai relais.
+
+    python benchmarks/bench_mail.py [nombre d'emails] [--handshake MS]
+"""
+import argparse
+import socketserver
+import threading
+import time
+
+import common  # noqa: F401  (configuration de Django)
+
+
+class SMTPStubHandler(socketserver.StreamRequestHandler):
+    """Serveur SMTP réduit au dialogue nécessaire ; les messages sont ignorés."""
+    handshake = 0.0
+
+    def reply(self, *lines):
+        # Une seule écriture par réponse (pas d'attente de Nagle côté client)
+        self.wfile.write(b''.join(line.encode() + b'\r\n' for line in lines))
+
+    def handle(self):
+        time.sleep(self.handshake)
+        self.reply('220 stub ESMTP')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors='replace').strip().upper()
+            if command.startswith('EHLO'):
+                self.reply('250-stub', '250 8BITMIME')
+            elif command.startswith('DATA'):
+                self.reply('354 fin par <CRLF>.<CRLF>')
+                while self.rfile.readline() not in (b'.\r\n', b''):
+                    pass
+                self.reply('250 OK')
+            elif command.startswith('QUIT'):
+                self.reply('221 au revoir')
+                return
+            else:
+                self.reply('250 OK')
+
+
+def run(count, handshake):
+    from django.core.mail import EmailMessage, get_connection
+
+    from accounts.mail import MailConnectionPool
+
+    SMTPStubHandler.handshake = handshake / 1000
+    server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), SMTPStubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    options = {'backend': 'django.core.mail.backends.smtp.EmailBackend',
+               'host': '127.0.0.1', 'port': server.server_address[1]}
+
+    messages = [EmailMessage(f'Sujet {index}', 'Corps', 'webmaster@localhost', [f'user{index}@example.com'])
+                for index in range(count)]
+    results = {}
+
+    started = time.perf_counter()
+    for message in messages:
+        get_connection(options['backend'], host=options['host'], port=options['port']).send_messages([message])
+    results['une connexion par message'] = (time.perf_counter() - started, count)
+
+    pool = MailConnectionPool(size=1, batch_size=20, **options)
+    started = time.perf_counter()
+    errors = pool.send(messages)
+    results['MailConnectionPool (1 connexion)'] = (time.perf_counter() - started, pool.stats()['batches'])
+    assert errors == [None] * count, errors
+    pool.close()
+    server.shutdown()
+
+    print(f'\nEnvoi de {count} emails, établissement de connexion : {handshake} ms')
+    print(f"{'':<36}{'emails/s':>10}{'total (s)':>12}{'lots':>8}")
+    for label, (elapsed, batches) in results.items():
+        print(f'{label:<36}{count / elapsed:>10.0f}{elapsed:>12.2f}{batches:>8}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('count', nargs='?', type=int, default=1000)
+    parser.add_argument('--handshake', type=float, default=20.0)
+    arguments = parser.parse_args()
+    run(arguments.count, arguments.handshake)
@@ -0,0 +1,36 @@
+"""
+Débit d'émission et de vérification des codes OTP : ``DatabaseOTPBackend``
+(une ligne ``OTPRequest`` par code) contre ``HMACOTPBackend`` (aucune
+écriture à l'émission, un compteur à la vérification).
+
+    python benchmarks/bench_otp.py [nombre d'utilisateurs]
+"""
+import sys
+
+from common import create_users, measure, report, test_database
+
+
+def run(count):
+    from accounts.otp import DatabaseOTPBackend, HMACOTPBackend
+
+    users = create_users(count)
+    rows = {}
+    for name, backend in (('DatabaseOTPBackend', DatabaseOTPBackend()), ('HMACOTPBackend', HMACOTPBackend())):
+        codes = {}
+
+        def issue(user):
+            codes[user.pk] = backend.issue(user, 'reset_password').otp_code
+
+        rows[f'{name}.issue'] = measure(issue, users)
+        rows[f'{name}.consume'] = measure(
+            lambda user: backend.consume(user, 'reset_password', codes[user.pk]), users
+        )
+        rows[f'{name}.issue_many ({count})'] = measure(
+            lambda batch: backend.issue_many(batch, 'register'), [users]
+        )
+    report(f'OTP, {count} utilisateurs', rows)
+
+
+if __name__ == '__main__':
+    with test_database():
+        run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,89 @@
+"""
+Annuaire du personnel (``GET users/``) : pagination par curseur
+(``UserKeysetPagination``) contre ``LimitOffsetPagination`` de DRF (OFFSET
+et ``COUNT(*)``), en première page, au milieu et en fin de liste, puis
+filtre par début d'email (intervalle sur ``Lower(email)``) contre
+``email__istartswith``.
+
+Les dates d'inscription sont partagées par groupes de 50 comptes, pour que
+la clé ``(user_registered_at, id)`` soit réellement composée.
+
+    python benchmarks/bench_users_list.py [nombre de comptes] [répétitions]
+"""
+import sys
+from datetime import timedelta
+from urllib.parse import parse_qs, urlsplit
+
+from common import measure, report, test_database
+
+
+def seed(count):
+    from django.utils.timezone import now
+
+    from accounts.models import UserModel
+
+    for start in range(0, count, 10000):
+        UserModel.objects.bulk_create([
+            UserModel(username=f'user{index}', email=f'User{index}@Example.com', first_name='Jean',
+                      last_name='Dupont', telephone_number='', password='!', is_active=index % 10 != 0)
+            for index in range(start, min(start + 10000, count))
+        ])
+    ids = list(UserModel.objects.order_by('pk').values_list('pk', flat=True))
+    started = now() - timedelta(days=365)
+    for group, first in enumerate(range(0, len(ids), 50)):
+        UserModel.objects.filter(pk__in=ids[first:first + 50]).update(
+            user_registered_at=started + timedelta(minutes=group))
+    return UserModel.objects.create_superuser(username='admin', password='Secr3t!pass')
+
+
+def run(count, repeat):
+    from rest_framework.pagination import LimitOffsetPagination
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    from accounts.models import UserModel
+    from accounts.views import UserListView
+
+    class OffsetUserListView(UserListView):
+        pagination_class = LimitOffsetPagination
+
+    admin = seed(count)
+    factory = APIRequestFactory()
+    keyset_view, offset_view = UserListView.as_view(), OffsetUserListView.as_view()
+
+    def get(view, query):
+        request = factory.get('/users/', query)
+        force_authenticate(request, admin)
+        response = view(request)
+        assert response.status_code == 200, response.data
+        return response
+
+    # Parcours complet : chaque compte une seule fois, curseurs des pages visées
+    cursors, seen, query = [{}], 0, {}
+    while True:
+        body = get(keyset_view, dict(query, page_size=100)).data['body']
+        seen += len(body['results'])
+        if body['next'] is None:
+            break
+        query = {'cursor': parse_qs(urlsplit(body['next']).query)['cursor'][0]}
+        cursors.append(query)
+    assert seen == count + 1, seen
+
+    pages = len(cursors)
+    rows = {}
+    for label, page in (('première', 0), ('milieu', pages // 2), ('dernière', pages - 1)):
+        rows[f'curseur, page {label}'] = measure(
+            lambda _: get(keyset_view, dict(cursors[page], page_size=100)), range(repeat))
+        rows[f'offset, page {label}'] = measure(
+            lambda _: get(offset_view, {'limit': 100, 'offset': page * 100}), range(repeat))
+    rows['email=user12, intervalle'] = measure(lambda _: get(keyset_view, {'email': 'user12'}), range(repeat))
+    rows['email__istartswith (avant)'] = measure(
+        lambda _: list(UserModel.objects.filter(email__istartswith='user12').order_by('-user_registered_at', '-id')[:101]),
+        range(repeat))
+    report(f'Annuaire, {count} comptes, {pages} pages de 100', rows)
+
+
+if __name__ == '__main__':
+    arguments = [int(value) for value in sys.argv[1:3]]
+    count, repeat = arguments + [100000, 20][len(arguments):]
+    with test_database():
+        run(count, repeat)
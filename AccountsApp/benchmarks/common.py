@@ -0,0 +1,88 @@
+"""
+Outils communs des benchmarks ``benchmarks/bench_*.py``.
+
+Chaque script se lance depuis ``AccountsApp/`` (``python benchmarks/bench_otp.py``)
+et travaille sur la base de test de Django, créée puis détruite à chaque
+exécution : la base du projet n'est jamais modifiée.
+"""
+import os
+import statistics
+import sys
+import time
+import warnings
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'AccountsApp.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+# get_otp_code (accounts.utils) produit des dates naïves : bruit sans intérêt ici
+warnings.filterwarnings('ignore', message='DateTimeField .* received a naive datetime')
+
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases  # noqa: E402
+
+
+@contextmanager
+def test_database():
+    """Base de test migrée, détruite en sortie."""
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=0)
+
+
+def create_users(count, prefix='bench', **values):
+    """Crée ``count`` utilisateurs vérifiés (hash unique, calculé une fois)."""
+    from django.contrib.auth.hashers import make_password
+
+    from accounts.models import UserModel, UserProfile
+
+    password = make_password('Secr3t!pass')
+    users = UserModel.objects.bulk_create([
+        UserModel(username=f'{prefix}{index}@example.com', email=f'{prefix}{index}@example.com',
+                  first_name='Jean', last_name='Dupont', telephone_number='', password=password,
+                  is_active=True, is_verify=True, **values)
+        for index in range(count)
+    ])
+    UserProfile.objects.bulk_create([UserProfile(user=user) for user in users])
+    return list(UserModel.objects.filter(username__startswith=prefix).order_by('pk'))
+
+
+def measure(fn, items):
+    """
+    Appelle ``fn`` sur chaque élément ; renvoie le nombre d'appels par
+    seconde, la latence médiane (ms) et le nombre moyen de requêtes SQL.
+    """
+    durations = []
+    queries = []
+
+    def count(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count):
+        for item in items:
+            started = time.perf_counter()
+            fn(item)
+            durations.append(time.perf_counter() - started)
+    total = sum(durations)
+    return {
+        'ops_per_s': len(items) / total if total else float('inf'),
+        'median_ms': statistics.median(durations) * 1000,
+        'queries': len(queries) / len(items),
+    }
+
+
+def report(title, rows):
+    """Affiche ``rows`` (``{libellé: mesure}``) sous forme de tableau."""
+    print(f'\n{title}')
+    print(f"{'':<34}{'ops/s':>12}{'médiane (ms)':>15}{'requêtes':>10}")
+    for label, result in rows.items():
+        print(f"{label:<34}{result['ops_per_s']:>12.0f}{result['median_ms']:>15.3f}{result['queries']:>10.1f}")